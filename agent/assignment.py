@@ -0,0 +1,66 @@
+def hungarian(costs: list[list[float]]) -> list[int]:
+    """Solves the assignment problem with the Hungarian algorithm,
+    by giving each row a different column, so that the sum of their costs is minimal.
+
+    :param costs: The cost matrix, that needs at least as many columns as rows.
+    :return: The column that was assigned to each row.
+    """
+    n = len(costs)
+    m = len(costs[0]) if n else 0
+    infinity = float('inf')
+
+    # potentials of the rows and columns, the row of each column and the previous column on the augmenting path,
+    # column 0 is a helper column for the row that is added next
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    row_of = [0] * (m + 1)
+    way = [0] * (m + 1)
+
+    for i in range(1, n + 1):
+        row_of[0] = i
+        j0 = 0
+        min_v = [infinity] * (m + 1)
+        used = [False] * (m + 1)
+
+        # searches the shortest augmenting path for the new row
+        while True:
+            used[j0] = True
+            i0 = row_of[j0]
+            row = costs[i0 - 1]
+            u_i0 = u[i0]
+            delta = infinity
+            j1 = 0
+
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                cur = row[j - 1] - u_i0 - v[j]
+                if cur < min_v[j]:
+                    min_v[j] = cur
+                    way[j] = j0
+                if min_v[j] < delta:
+                    delta = min_v[j]
+                    j1 = j
+
+            for j in range(m + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+
+        # flips the assignments along the augmenting path
+        while j0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+
+    assignment = [-1] * n
+    for j in range(1, m + 1):
+        if row_of[j]:
+            assignment[row_of[j] - 1] = j - 1
+    return assignment
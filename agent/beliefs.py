@@ -0,0 +1,263 @@
+from util.config import GRID_SIZE
+
+from collections.abc import Iterator, MutableMapping
+
+# flags of the beliefs on a cell, each cell is stored as one byte
+BREEZE = 1
+STENCH = 2
+POTENTIAL_PIT = 4
+POTENTIAL_WUMPUS = 8
+PIT = 16
+WUMPUS = 32
+DEAD_WUMPUS = 64
+VISITED = 128
+
+# combinations of flags that are often queried together
+DANGER = PIT | WUMPUS
+POTENTIAL_DANGER = POTENTIAL_PIT | POTENTIAL_WUMPUS
+KNOWN_DANGER = PIT | WUMPUS | DEAD_WUMPUS
+
+BELIEF_NAMES: dict[str, int] = {
+    "breeze": BREEZE,
+    "stench": STENCH,
+    "potential_pit": POTENTIAL_PIT,
+    "potential_wumpus": POTENTIAL_WUMPUS,
+    "pit": PIT,
+    "wumpus": WUMPUS,
+    "dead_wumpus": DEAD_WUMPUS,
+    "visited": VISITED,
+}
+
+
+class BeliefStore:
+    """Contains the information the agents have gathered on the cells, as one byte of flags per cell.
+    The byte of a cell is at the index `x * grid_size + y`.
+
+    Besides the typed methods, it can be used like the former `dict[tuple[int, int], dict[str, bool]]`,
+    where a cell is contained if any of its flags is set.
+
+    Every change of a cell is logged, so that the version of the store can be used to ask for the cells
+    that changed since then.
+
+    :ivar grid_size (int): The amount of cells on the x- and y-axis.
+    :ivar bounds (tuple[int, int, int, int]): The part of the board the agents plan in, as the lowest x and y
+        and the exclusive highest x and y. It is the whole board, unless the board is only loaded in parts.
+    :ivar flags (bytearray): The flags of all the cells, to be read directly in hot loops.
+        Writing to it directly bypasses the log of changes.
+    :ivar _changes (list[int]): The indices of the cells that changed since the last reset, in order.
+    :ivar _first_version (int): The version of the store right after the last reset.
+    """
+    def __init__(self, grid_size: int = GRID_SIZE):
+        self.grid_size: int = grid_size
+        self.bounds: tuple[int, int, int, int] = (0, 0, grid_size, grid_size)
+        self.flags: bytearray = bytearray(grid_size * grid_size)
+        self._changes: list[int] = []
+        self._first_version: int = 0
+
+    @property
+    def version(self) -> int:
+        """The version of the store, which increases with every change of a cell."""
+        return self._first_version + len(self._changes)
+
+    def reset(self) -> None:
+        """Resets all the beliefs back to their initial state."""
+        self.flags[:] = bytes(len(self.flags))
+        # versions from before the reset can not be compared to the ones after it
+        self._first_version = self.version + 1
+        self._changes = []
+
+    def changes_since(self, version: int) -> list[int] | None:
+        """Gets the indices of the cells that changed since a version of the store.
+
+        :param version: The version of the store, since which the changes are requested.
+        :return: The indices of the changed cells, possibly with duplicates,
+            or None if the store was reset since then.
+        """
+        if version < self._first_version:
+            return None
+        return self._changes[version - self._first_version:]
+
+    def set_bounds(self, bounds: tuple[int, int, int, int]) -> None:
+        """Sets the part of the board the agents plan in.
+        If the part only grows, the cells that are added are logged as changes, so that the users of the log
+        pick them up. Otherwise, the log starts over, as after a reset.
+
+        :param bounds: The lowest x and y and the exclusive highest x and y.
+        """
+        if bounds == self.bounds:
+            return
+
+        x_min, y_min, x_max, y_max = self.bounds
+        new_x_min, new_y_min, new_x_max, new_y_max = bounds
+
+        if new_x_min <= x_min and new_y_min <= y_min and new_x_max >= x_max and new_y_max >= y_max:
+            size = self.grid_size
+            self._changes.extend(
+                x * size + y
+                for x in range(new_x_min, new_x_max) for y in range(new_y_min, new_y_max)
+                if not (x_min <= x < x_max and y_min <= y < y_max)
+            )
+        else:
+            self._first_version = self.version + 1
+            self._changes = []
+
+        self.bounds = bounds
+
+    def in_bounds(self, pos: tuple[int, int]) -> bool:
+        """Checks whether a position is in the part of the board the agents plan in.
+
+        :param pos: The position that needs to be checked.
+        :return: Whether the position is in the bounds.
+        """
+        x_min, y_min, x_max, y_max = self.bounds
+        return x_min <= pos[0] < x_max and y_min <= pos[1] < y_max
+
+    def get_flags(self, pos: tuple[int, int]) -> int:
+        """Gets all the flags of a cell.
+
+        :param pos: The position of the cell.
+        :return: The flags of the cell.
+        """
+        return self.flags[pos[0] * self.grid_size + pos[1]]
+
+    def has(self, pos: tuple[int, int], flags: int) -> bool:
+        """Checks whether a cell has any of the given flags.
+
+        :param pos: The position of the cell.
+        :param flags: The flags that should be checked.
+        :return: Whether any of the flags is set.
+        """
+        return bool(self.flags[pos[0] * self.grid_size + pos[1]] & flags)
+
+    def set(self, pos: tuple[int, int], flags: int, value: bool = True) -> None:
+        """Sets or clears flags of a cell.
+
+        :param pos: The position of the cell.
+        :param flags: The flags that should be changed.
+        :param value: Whether the flags should be set or cleared.
+        """
+        index = pos[0] * self.grid_size + pos[1]
+        if value:
+            self._write(index, self.flags[index] | flags)
+        else:
+            self._write(index, self.flags[index] & ~flags & 0xFF)
+
+    def update(self, pos: tuple[int, int], **beliefs: bool) -> None:
+        """Sets the beliefs of a cell by their names, for example `update(pos, pit=True, potential_pit=False)`.
+
+        :param pos: The position of the cell.
+        :param beliefs: The names of the beliefs and whether they are true.
+        """
+        set_flags = 0
+        clear_flags = 0
+        for name, value in beliefs.items():
+            if value:
+                set_flags |= BELIEF_NAMES[name]
+            else:
+                clear_flags |= BELIEF_NAMES[name]
+
+        index = pos[0] * self.grid_size + pos[1]
+        self._write(index, (self.flags[index] & ~clear_flags & 0xFF) | set_flags)
+
+    def _write(self, index: int, value: int) -> None:
+        """Helper method to write the flags of a cell and log the change.
+
+        :param index: The index of the cell.
+        :param value: The new flags of the cell.
+        """
+        if self.flags[index] != value:
+            self.flags[index] = value
+            self._changes.append(index)
+
+    def positions_with(self, flags: int) -> list[tuple[int, int]]:
+        """Gathers the positions of all the cells that have any of the given flags.
+
+        :param flags: The flags that should be checked.
+        :return: The positions of the cells.
+        """
+        return [divmod(index, self.grid_size) for index, value in enumerate(self.flags) if value & flags]
+
+    def _in_bounds(self, pos: tuple[int, int]) -> bool:
+        """Helper method to determine if a position is in the store.
+
+        :param pos: The position that needs to be checked.
+        :return: Whether the position is in the store.
+        """
+        return 0 <= pos[0] < self.grid_size and 0 <= pos[1] < self.grid_size
+
+    # dict-compatible view for callers that still use the beliefs as a dict
+
+    def get(self, pos: tuple[int, int], default=None):
+        """Gets a dict-like view on the beliefs of a cell, if the cell has any belief.
+
+        :param pos: The position of the cell.
+        :param default: What is returned, if the cell has no beliefs.
+        :return: The view on the beliefs of the cell or the default.
+        """
+        if not self._in_bounds(pos) or not self.get_flags(pos):
+            return default
+        return CellBeliefs(self, pos)
+
+    def setdefault(self, pos: tuple[int, int], default=None) -> "CellBeliefs":
+        """Gets a dict-like view on the beliefs of a cell, the default is ignored as every cell has a view.
+
+        :param pos: The position of the cell.
+        :param default: Ignored, only there for compatibility with dict.setdefault.
+        :return: The view on the beliefs of the cell.
+        """
+        return CellBeliefs(self, pos)
+
+    def __getitem__(self, pos: tuple[int, int]) -> "CellBeliefs":
+        if not self._in_bounds(pos):
+            raise KeyError(pos)
+        return CellBeliefs(self, pos)
+
+    def __contains__(self, pos) -> bool:
+        return self._in_bounds(pos) and bool(self.get_flags(pos))
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.flags) - self.flags.count(0)
+
+    def keys(self) -> list[tuple[int, int]]:
+        """Gathers the positions of all the cells that have any belief.
+
+        :return: The positions of the cells.
+        """
+        return self.positions_with(0xFF)
+
+
+class CellBeliefs(MutableMapping):
+    """A dict-like view on the beliefs of one cell, that reads and writes the flags in the BeliefStore.
+
+    :ivar _store (BeliefStore): The store that contains the flags.
+    :ivar _pos (tuple[int, int]): The position of the cell.
+    """
+    def __init__(self, store: BeliefStore, pos: tuple[int, int]):
+        self._store: BeliefStore = store
+        self._pos: tuple[int, int] = pos
+
+    def __getitem__(self, name: str) -> bool:
+        return self._store.has(self._pos, BELIEF_NAMES[name])
+
+    def __setitem__(self, name: str, value: bool) -> None:
+        self._store.set(self._pos, BELIEF_NAMES[name], value)
+
+    def __delitem__(self, name: str) -> None:
+        self._store.set(self._pos, BELIEF_NAMES[name], False)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(BELIEF_NAMES)
+
+    def __len__(self) -> int:
+        return len(BELIEF_NAMES)
+
+    def update(self, other=(), **beliefs: bool) -> None:
+        """Sets several beliefs of the cell at once.
+
+        :param other: A dict with the names of the beliefs and whether they are true.
+        :param beliefs: The names of the beliefs and whether they are true.
+        """
+        self._store.update(self._pos, **dict(other), **beliefs)
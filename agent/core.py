@@ -1,9 +1,11 @@
+from agent.beliefs import BeliefStore, DANGER, POTENTIAL_DANGER
+from agent.pathfinding import PATHFINDERS, AlignedCellIndex, IncrementalSearch, PathCache
+from agent.spread import SpreadDistances
 from agent.task import Task, TaskType
 from util.helperFunc import get_neighbours
-from util.config import *
+from util.config import Config
 
 from collections import deque
-import heapq
 
 
 class Agent:
@@ -14,8 +16,11 @@ class Agent:
     :ivar y (int): The y coordinate of the agent.
     :ivar has_arrow (bool): Whether the agent has an arrow.
     :ivar dead (bool): Whether the agent is dead.
+    :ivar _config (Config): The configuration of the simulation.
+    :ivar expansions (int): The amount of cells that were expanded in the last search of the Network of Paths.
+    :ivar _search (IncrementalSearch): The search that is kept between game steps, for the "incremental" pathfinder.
     """
-    def __init__(self, agent_id: int):
+    def __init__(self, agent_id: int, config: Config | None = None):
         self.agent_id: int = agent_id
 
         self.x: int | None = None
@@ -25,6 +30,11 @@ class Agent:
 
         self.dead = False
 
+        self.expansions: int = 0
+
+        self._config: Config = config or Config()
+        self._search: IncrementalSearch = IncrementalSearch()
+
     def reset(self) -> None:
         """Resets the agent back to its initial state."""
         self.x = None
@@ -38,59 +48,71 @@ class Agent:
                      task: Task,
                      came_from: dict[tuple[int, int], tuple[int, int]],
                      cost_so_far: dict[tuple[int, int], int] | None,
-                     agent_pos: list[tuple[int, int]]) -> tuple[float, list[tuple[int, int]] | None]:
-        """Creates a bid value for a task and the path towards completing it.
+                     spread: SpreadDistances | None,
+                     aligned_index: AlignedCellIndex | None = None) -> tuple[float, tuple[int, int] | None]:
+        """Creates a bid value for a task and the cell that needs to be reached to complete it.
+        The path to that cell is only reconstructed, if the task is awarded.
 
         :param task: The task on which needs to be bid.
         :param came_from: The network of paths from its current position to any other.
         :param cost_so_far: A dict with the positions and the cost of getting to it.
-        :param agent_pos: The positions of all the other agents.
-        :return: The bid value for the task and the path for it.
+        :param spread: The distance of each cell to the nearest other agent,
+            or None if there is no bonus for moving away from the other agents.
+        :param aligned_index: The index of the cheapest cells per row and column of the cost_so_far,
+            which is created from it if it is not given.
+        :return: The bid value for the task and the cell that needs to be reached for it.
         """
         bid = -float('inf')
-        path = None
+        goal = None
         cost = float('inf')
         manhattan_bonus = 0
 
         if self.dead:
-            return bid, path
+            return bid, goal
 
         if task.task_type == TaskType.MOVE:
-            # recreates the path from the Network of paths and the goal
-            path = self._reconstruct_path(came_from, task.target)
-            if path is None:
-                return bid, path
-            tx, ty = task.target
-            # bonus for giving an edge to targets that are further away from other agents
-            if MANHATTEN_BONUS:
-                manhattan_bonus = min([abs(ax - tx) + abs(ay - ty) for (ax, ay) in agent_pos], default=0) / 100
-            # cost for getting to the target
-            cost = cost_so_far.get(task.target, float('inf'))
+            # the target can only be reached, if the Network of paths contains it
+            if task.target not in cost_so_far:
+                return bid, goal
+            goal = task.target
 
         elif task.task_type == TaskType.SHOOT and self.has_arrow:
-            # recreates the path to the nearest aligned cell from the Network of paths and the goal
-            path = self._nearest_aligned_cell_path(came_from, task.target)
-            if path is None:
-                return bid, path
-            tx, ty = path[len(path) - 1]
-            # bonus for giving an edge to targets that are further away from other agents
-            if MANHATTEN_BONUS:
-                manhattan_bonus = min([abs(ax - tx) + abs(ay - ty) for (ax, ay) in agent_pos], default=0) / 100
-            # cost for getting to the nearest aligned cell
-            cost = cost_so_far.get((tx, ty), float('inf'))
+            # looks up the cheapest cell in the same row or column as the target
+            if aligned_index is None:
+                aligned_index = AlignedCellIndex(cost_so_far)
+            goal = aligned_index.nearest(task.target)
+            if goal is None:
+                return bid, goal
+
+        else:
+            return bid, goal
+
+        tx, ty = goal
+        # bonus for giving an edge to targets that are further away from other agents
+        if spread is not None:
+            x, y = tx - spread.origin[0], ty - spread.origin[1]
+            if spread.nearest_ids[x][y] == self.agent_id:
+                manhattan_bonus = spread.second_nearest[x][y] / 100
+            else:
+                manhattan_bonus = spread.nearest[x][y] / 100
+        # cost for getting to the goal
+        cost = cost_so_far[goal]
 
         # creates bid with the reward, the travel cost and the manhatten-bonus
         bid = task.reward - cost + manhattan_bonus
 
-        return bid, path
+        return bid, goal
 
-    def create_bfs_paths(self, beliefs: dict[tuple[int, int], dict[str, bool]]) \
-            -> dict[tuple[int, int], tuple[int, int]]:
-        """Creates a Network of Paths from its current position to any other on the board.
+    def create_bfs_paths(self, beliefs: BeliefStore) -> dict[tuple[int, int], tuple[int, int]]:
+        """Creates a Network of Paths from its current position to any other in the bounds of the beliefs.
 
         :param beliefs: The current beliefs the agents have on the board.
         :return: The Network of Paths.
         """
+        flags = beliefs.flags
+        size = beliefs.grid_size
+        x_min, y_min, x_max, y_max = beliefs.bounds
+
         queue = deque([(self.x, self.y)])
         came_from: dict[tuple[int, int], tuple[int, int]] = {(self.x, self.y): None}
 
@@ -98,14 +120,12 @@ class Agent:
             current = queue.popleft()
             x, y = current
 
-            neighbours = get_neighbours(x, y)
+            neighbours = get_neighbours(x, y, beliefs.grid_size)
             for nx, ny in neighbours:
-                if (nx, ny) in came_from:
+                if (nx, ny) in came_from or not (x_min <= nx < x_max and y_min <= ny < y_max):
                     continue
 
-                cell_info = beliefs.get((nx, ny), {})
-                if (cell_info.get("potential_pit") or cell_info.get("potential_wumpus") or
-                        cell_info.get("pit") or cell_info.get("wumpus")):
+                if flags[nx * size + ny] & (DANGER | POTENTIAL_DANGER):
                     continue
 
                 came_from[(nx, ny)] = current
@@ -113,50 +133,41 @@ class Agent:
 
         return came_from
 
-    def create_dijkstra_paths(self, beliefs: dict[tuple[int, int], dict[str, bool]], risky=False) \
+    def create_dijkstra_paths(self, beliefs: BeliefStore, risky=False, pathfinder: str | None = None,
+                              risk_costs: dict[int, int] | None = None, path_cache: PathCache | None = None) \
             -> tuple[dict[tuple[int, int], tuple[int, int]], dict[tuple[int, int], int]]:
         """Creates a Network of Paths from its current position to any other on the board.
 
         :param beliefs: The current beliefs the agents have on the board.
         :param risky: Whether an agent can run onto potential danger.
+        :param pathfinder: The implementation of the search, either "heap", "buckets" or "incremental",
+            defaults to the one of the configuration.
+        :param risk_costs: The cost of stepping onto each potential danger by the index of its cell,
+            instead of the flat risky step cost.
+        :param path_cache: The cache the search is taken from, if it is still valid, unless the search is
+            "incremental", which already keeps its search.
         :return: The Network of Paths and the cost to travel to each cell.
         """
-
-        start = (self.x, self.y)
-        frontier = [(0, start)]
-
-        came_from: dict[tuple[int, int], tuple[int, int]] = {start: None}
-        cost_so_far: dict[tuple[int, int], int] = {start: 0}
-
-        while frontier:
-            current_cost, (x, y) = heapq.heappop(frontier)
-
-            neighbours = get_neighbours(x, y)
-            for nx, ny in neighbours:
-                cell_info = beliefs.get((nx, ny), {})
-
-                if cell_info.get("pit") or cell_info.get("wumpus"):
-                    continue
-
-                if cell_info.get("potential_pit") or cell_info.get("potential_wumpus"):
-                    if risky:
-                        step_cost = 1000
-                    else:
-                        continue
-                else:
-                    step_cost = 1
-
-                new_cost = current_cost + step_cost
-
-                if (nx, ny) not in cost_so_far or new_cost < cost_so_far.get((nx, ny)):
-                    cost_so_far[(nx, ny)] = new_cost
-                    came_from[(nx, ny)] = (x, y)
-                    heapq.heappush(frontier, (new_cost, (nx, ny)))
-
+        pathfinder = pathfinder or self._config.pathfinder
+        if pathfinder == "incremental":
+            paths = self._search.search((self.x, self.y), beliefs, risky, risk_costs)
+            self.expansions = self._search.expansions
+            return paths
+
+        if path_cache is not None:
+            came_from, cost_so_far, hit = path_cache.search(
+                (self.x, self.y), beliefs, risky, risk_costs, PATHFINDERS[pathfinder]
+            )
+            self.expansions = 0 if hit else len(cost_so_far)
+            return came_from, cost_so_far
+
+        came_from, cost_so_far = PATHFINDERS[pathfinder]((self.x, self.y), beliefs, risky, risk_costs)
+        # every reached cell is expanded once
+        self.expansions = len(cost_so_far)
         return came_from, cost_so_far
 
     @staticmethod
-    def _reconstruct_path(came_from: dict[tuple[int, int], tuple[int, int]], goal: tuple[int, int]) \
+    def reconstruct_path(came_from: dict[tuple[int, int], tuple[int, int]], goal: tuple[int, int]) \
             -> list[tuple[int, int]] | None:
         """Reconstructs the shortest path from its current position to the goal.
 
@@ -175,30 +186,3 @@ class Agent:
 
         path.reverse()
         return path
-
-    def _nearest_aligned_cell_path(self, came_from: dict[tuple[int, int], tuple[int, int]], goal: tuple[int, int]) \
-            -> list[tuple[int, int]] | None:
-        """Gives the path to the nearest cell that is in the same row or column as the goal.
-
-        :param came_from: The Network of Paths from its current position to any other.
-        :param goal: The position of which the agent wants to be in the same row or column.
-        :return: The shortest path to reach a cell aligned to the goal.
-        """
-        tx, ty = goal
-        aligned_positions = []
-
-        for (x, y) in came_from.keys():
-            if x == tx or y == ty:
-                aligned_positions.append((x, y))
-
-        shortest_path: list[tuple[int, int]] | None = None
-        for pos in aligned_positions:
-            path = self._reconstruct_path(came_from, pos)
-
-            if path is None:
-                continue
-
-            if shortest_path is None or len(path) < len(shortest_path):
-                shortest_path = path
-
-        return shortest_path
@@ -0,0 +1,225 @@
+from agent.beliefs import (
+    BeliefStore, BREEZE, STENCH, POTENTIAL_PIT, POTENTIAL_WUMPUS, PIT, WUMPUS, DEAD_WUMPUS, VISITED
+)
+from agent.task import TaskResult
+from util.helperFunc import get_neighbours
+
+# the kinds of danger, each with the perception that points to it, the flag of a potential danger
+# and the flags of a confirmed danger
+PIT_KIND = 0
+WUMPUS_KIND = 1
+KINDS = (PIT_KIND, WUMPUS_KIND)
+PERCEPTIONS = {PIT_KIND: BREEZE, WUMPUS_KIND: STENCH}
+POTENTIAL_FLAGS = {PIT_KIND: POTENTIAL_PIT, WUMPUS_KIND: POTENTIAL_WUMPUS}
+CONFIRMED_FLAGS = {PIT_KIND: PIT, WUMPUS_KIND: WUMPUS | DEAD_WUMPUS}
+
+
+class DangerInference:
+    """Deduces the pits and wumpus from the perceptions of the visited cells, on top of the shared beliefs.
+
+    Every breeze and stench creates a group of the cells next to it, that can still contain a pit or wumpus,
+    of which at least one is dangerous. The groups of pits and wumpus are kept separately, as sets, together with
+    an index of the groups each cell is in, so ruling out a cell only touches the groups it is in.
+    The groups that changed are put on a worklist, which is worked off until nothing can be deduced anymore:
+
+    - A group with a single cell left confirms the danger of that cell.
+    - A confirmed danger satisfies the groups of its kind that contain it, which can not tell anything else,
+      and rules out the other kind on its cell, as a cell never contains both.
+    - Once as many dangers of a kind are known as there are on the board, no other cell can contain one.
+
+    :ivar _beliefs (BeliefStore): The shared beliefs, whose potential and confirmed dangers are kept up to date.
+    :ivar _totals (dict[int, int | None]): The amount of each kind of danger on the board, if it is known.
+    :ivar _groups (dict[int, set[tuple[int, int]]]): The cells of each open group by its id.
+    :ivar _kinds (dict[int, int]): The kind of danger of each open group by its id.
+    :ivar _index (dict[tuple[int, int], set[int]]): The ids of the open groups each cell is in.
+    :ivar _worklist (list[int]): The ids of the groups that changed since they were last checked.
+    :ivar _next_id (int): The id of the next group.
+    :ivar _candidates (dict[int, set[tuple[int, int]]]): The cells marked as potential danger of each kind.
+    :ivar _found (dict[int, set[tuple[int, int]]]): The cells with a confirmed danger of each kind.
+    """
+    def __init__(self, beliefs: BeliefStore, num_pits: int | None = None, num_wumpus: int | None = None):
+        self._beliefs: BeliefStore = beliefs
+        self._totals: dict[int, int | None] = {PIT_KIND: num_pits, WUMPUS_KIND: num_wumpus}
+        self._groups: dict[int, set[tuple[int, int]]] = {}
+        self._kinds: dict[int, int] = {}
+        self._index: dict[tuple[int, int], set[int]] = {}
+        self._worklist: list[int] = []
+        self._next_id: int = 0
+        self._candidates: dict[int, set[tuple[int, int]]] = {kind: set() for kind in KINDS}
+        self._found: dict[int, set[tuple[int, int]]] = {kind: set() for kind in KINDS}
+
+    def reset(self) -> None:
+        """Resets the inference back to its initial state."""
+        self._groups = {}
+        self._kinds = {}
+        self._index = {}
+        self._worklist = []
+        self._candidates = {kind: set() for kind in KINDS}
+        self._found = {kind: set() for kind in KINDS}
+
+    def get_groups(self) -> list[tuple[int, set[tuple[int, int]]]]:
+        """Gets the open groups.
+
+        :return: The kind and the cells of each open group.
+        """
+        return [(self._kinds[group_id], cells) for group_id, cells in self._groups.items()]
+
+    def get_candidates(self, kind: int) -> set[tuple[int, int]]:
+        """Gets the cells that are marked as potential danger of a kind.
+
+        :param kind: The kind of danger.
+        :return: The positions of the cells.
+        """
+        return self._candidates[kind]
+
+    def get_remaining(self, kind: int) -> int | None:
+        """Gets the amount of dangers of a kind, that are not confirmed yet.
+
+        :param kind: The kind of danger.
+        :return: The amount, or None if the amount on the board is not known.
+        """
+        total = self._totals[kind]
+        return None if total is None else max(total - len(self._found[kind]), 0)
+
+    def observe(self, pos: tuple[int, int], result: TaskResult) -> None:
+        """Adds what an agent perceived on a cell, after the beliefs of that cell were updated,
+        and deduces everything that follows from it.
+
+        :param pos: The position of the agent.
+        :param result: The result of the task of the agent.
+        """
+        flags = self._beliefs.get_flags(pos)
+
+        # the visited cell is either the danger that killed the agent or no danger at all
+        for kind in KINDS:
+            if flags & CONFIRMED_FLAGS[kind]:
+                self._confirm(pos, kind)
+            else:
+                self._rule_out(pos, kind)
+
+        if result.wumpus_died:
+            self._confirm(result.wumpus_died, WUMPUS_KIND)
+
+        for kind in KINDS:
+            if flags & PERCEPTIONS[kind]:
+                self._add_group(pos, kind)
+            else:
+                for neighbour in get_neighbours(pos[0], pos[1], self._beliefs.grid_size):
+                    self._rule_out(neighbour, kind)
+
+        self._propagate()
+
+    def _add_group(self, source: tuple[int, int], kind: int) -> None:
+        """Helper method to mark the cells next to a perception, that can still be the danger, as potential danger.
+        They only form a new group, if none of the cells is a confirmed danger of that kind already.
+
+        :param source: The position of the visited cell with the perception.
+        :param kind: The kind of danger the perception points to.
+        """
+        cells = set()
+        satisfied = False
+        for neighbour in get_neighbours(source[0], source[1], self._beliefs.grid_size):
+            flags = self._beliefs.get_flags(neighbour)
+            if flags & CONFIRMED_FLAGS[kind]:
+                satisfied = True
+            elif not flags & VISITED and not self._is_ruled_out(neighbour, kind):
+                cells.add(neighbour)
+
+        for cell in cells:
+            self._candidates[kind].add(cell)
+            self._beliefs.set(cell, POTENTIAL_FLAGS[kind])
+
+        if satisfied or not cells:
+            return
+
+        group_id = self._next_id
+        self._next_id += 1
+        self._groups[group_id] = cells
+        self._kinds[group_id] = kind
+        for cell in cells:
+            self._index.setdefault(cell, set()).add(group_id)
+        self._worklist.append(group_id)
+
+    def _is_ruled_out(self, pos: tuple[int, int], kind: int) -> bool:
+        """Helper method to check whether a cell can not contain a danger of a kind, because it contains
+        the other kind, all of them are found or it is next to a visited cell without the perception of the kind.
+
+        :param pos: The position of the cell.
+        :param kind: The kind of danger.
+        :return: Whether the cell is ruled out.
+        """
+        if self._beliefs.has(pos, CONFIRMED_FLAGS[1 - kind]) or self._all_found(kind):
+            return True
+        return any(
+            self._beliefs.get_flags(neighbour) & (VISITED | PERCEPTIONS[kind]) == VISITED
+            for neighbour in get_neighbours(pos[0], pos[1], self._beliefs.grid_size)
+        )
+
+    def _all_found(self, kind: int) -> bool:
+        """Helper method to check whether as many dangers of a kind are confirmed as there are on the board.
+
+        :param kind: The kind of danger.
+        :return: Whether all of them are found.
+        """
+        total = self._totals[kind]
+        return total is not None and len(self._found[kind]) >= total
+
+    def _rule_out(self, pos: tuple[int, int], kind: int) -> None:
+        """Helper method to remove a cell from the open groups of a kind, as it can not contain that danger.
+
+        :param pos: The position of the cell.
+        :param kind: The kind of danger.
+        """
+        for group_id in self._index.pop(pos, ()):
+            if self._kinds[group_id] == kind:
+                self._groups[group_id].discard(pos)
+                self._worklist.append(group_id)
+            else:
+                self._index.setdefault(pos, set()).add(group_id)
+
+        if pos in self._candidates[kind]:
+            self._candidates[kind].discard(pos)
+            self._beliefs.set(pos, POTENTIAL_FLAGS[kind], False)
+
+    def _confirm(self, pos: tuple[int, int], kind: int) -> None:
+        """Helper method to confirm the danger of a cell, which satisfies the open groups of that kind it is in.
+
+        :param pos: The position of the cell.
+        :param kind: The kind of danger.
+        """
+        if not self._beliefs.has(pos, CONFIRMED_FLAGS[kind]):
+            self._beliefs.set(pos, CONFIRMED_FLAGS[kind] & (PIT | WUMPUS))
+        self._candidates[kind].discard(pos)
+        self._beliefs.set(pos, POTENTIAL_FLAGS[kind], False)
+        self._found[kind].add(pos)
+
+        for group_id in [group_id for group_id in self._index.get(pos, ()) if self._kinds[group_id] == kind]:
+            self._remove_group(group_id)
+        self._rule_out(pos, 1 - kind)
+
+        if self._all_found(kind):
+            for cell in list(self._candidates[kind]):
+                self._rule_out(cell, kind)
+
+    def _remove_group(self, group_id: int) -> None:
+        """Helper method to remove a group from the open groups and from the index.
+
+        :param group_id: The id of the group.
+        """
+        del self._kinds[group_id]
+        for cell in self._groups.pop(group_id):
+            self._index[cell].discard(group_id)
+
+    def _propagate(self) -> None:
+        """Helper method to work off the changed groups, until no more dangers can be confirmed."""
+        while self._worklist:
+            group_id = self._worklist.pop()
+            cells = self._groups.get(group_id)
+            if cells is None:
+                continue
+
+            if len(cells) == 1:
+                self._confirm(next(iter(cells)), self._kinds[group_id])
+            elif not cells:
+                # the perceptions contradict each other, so the group can not tell anything
+                self._remove_group(group_id)
@@ -1,203 +1,317 @@
-from agent.task import Task, MoveTask, ShootTask, TaskResult
+from agent.assignment import hungarian
+from agent.task import Task, MoveTask, ShootTask, TaskPool, TaskResult, TaskType
+from agent.beliefs import BeliefStore, WUMPUS, VISITED, DANGER
 from agent.core import Agent
+from agent.inference import DangerInference
+from agent.pathfinding import AlignedCellIndex, PathCache
+from agent.risk import RiskMap
+from agent.spread import SpreadDistances
+from game.agent_index import AgentIndex
 from game.board import Board
-from util.helperFunc import get_neighbours
-from util.config import SHOOT, RISKY
+from statistic.profiler import StepProfiler
+from util.config import Config
+
+import heapq
+
+# a bid contains: the negated bid, the order in which it was made, agent_id, task and the cell to reach for the task
+Bid = tuple[float, int, int, Task, tuple[int, int]]
+
+# the cost of leaving an agent without a task in the optimal assignment, higher than any negated bid
+UNASSIGNED_COST = 1e12
 
 
 class AgentManager:
     """Handles the shared vision of the Agents and Creates and awards Tasks to the Agents.
 
     :ivar _agents (list[Agent]): The agents that are being managed.
+    :ivar _config (Config): The configuration of the simulation.
     :ivar shared_visited (set[tuple[int, int]]): The Coordinates the agents have already visited.
-    :ivar shared_beliefs (dict[tuple[int, int], dict[str, bool]]): Contains the information the agents have gathered
-        on the cells.
-    :ivar _potential_danger_groups (list[list[tuple[int, int]]]): A list of Groups of cells, of which exactly one
-        is dangerous.
+    :ivar shared_beliefs (BeliefStore): Contains the information the agents have gathered on the cells.
+    :ivar _inference (DangerInference): Deduces the potential and confirmed dangers from the perceptions.
+    :ivar _risk_map (RiskMap): Estimates the probability of the potential dangers, for the costs of risky steps.
+    :ivar _path_cache (PathCache | None): The searches of the agents, that are kept between the game steps.
+    :ivar _came_from (dict[int, dict[tuple[int, int], tuple[int, int]]]): The Network of Paths of each agent
+        from the last bidding.
+    :ivar _bidding_agents (int): The amount of agents that made a bid in the last bidding.
+    :ivar _task_pool (TaskPool): The tasks of the board, so the same cell always gets the same task.
+    :ivar awarded_paths (dict[int, list[tuple[int, int]]]): The path of the task of each agent
+        from the last awarding.
+    :ivar _move_tasks (dict[tuple[int, int], MoveTask]): The open move tasks per cell.
+    :ivar _shoot_tasks (dict[tuple[int, int], ShootTask]): The open shoot tasks per cell.
+    :ivar _tasks_version (int): The version of the shared beliefs, the open tasks were last updated to.
+    :ivar _profiler (StepProfiler): Measures the searches and the bidding.
+    :ivar _agent_index (AgentIndex | None): The positions of the living agents on the board of the last created tasks.
     """
-    def __init__(self, agents: list[Agent]):
+    def __init__(self, agents: list[Agent], config: Config | None = None, profiler: StepProfiler | None = None):
         self._agents: list[Agent] = agents
+        self._config: Config = config or Config()
+        self._profiler: StepProfiler = profiler or StepProfiler(self._config)
         self.shared_visited: set[tuple[int, int]] = set()
-        self.shared_beliefs: dict[tuple[int, int], dict[str, bool]] = {}
-        self._potential_danger_groups: list[list[tuple[int, int]]] = []
+        self.shared_beliefs: BeliefStore = BeliefStore(self._config.grid_size)
+        # the chunked board only has as many pits and wumpus per cell as configured, so their amount is unknown
+        counted = self._config.board_backend != "chunked"
+        self._inference: DangerInference = DangerInference(
+            self.shared_beliefs,
+            self._config.num_pits if counted else None,
+            self._config.num_wumpus if counted else None,
+        )
+        self._risk_map: RiskMap = RiskMap(self.shared_beliefs, self._inference, self._config)
+        self._path_cache: PathCache | None = None
+        if self._config.path_cache_cells is not None:
+            self._path_cache = PathCache(self._config.path_cache_cells)
+        self._came_from: dict[int, dict[tuple[int, int], tuple[int, int]]] = {}
+        self._bidding_agents: int = 0
+        self._task_pool: TaskPool = TaskPool()
+        self.awarded_paths: dict[int, list[tuple[int, int]]] = {}
+        self._move_tasks: dict[tuple[int, int], MoveTask] = {}
+        self._shoot_tasks: dict[tuple[int, int], ShootTask] = {}
+        self._tasks_version: int = -1
+        self._agent_index: AgentIndex | None = None
 
     def reset(self) -> None:
         """Resets the Agent-Manager back to its initial state."""
         self.shared_visited.clear()
-        self.shared_beliefs = {}
-        self._potential_danger_groups = []
+        self.shared_beliefs.reset()
+        self._inference.reset()
+        self._risk_map.reset()
+        if self._path_cache:
+            self._path_cache.clear()
 
     def update_beliefs(self, agent: Agent, result: TaskResult) -> None:
         """Updates the shared_visited and shared_beliefs state.
-        Also marks potential dangers and converts potential dangers to confirmed dangers.
+        The potential and confirmed dangers, that follow from it, are deduced by the danger inference.
 
         :param agent: The agent that did the task.
         :param result: The result of the task.
         """
+        beliefs = self.shared_beliefs
+
         self.shared_visited.add((agent.x, agent.y))
-        self.shared_beliefs.setdefault((agent.x, agent.y), {}).update({
-            "breeze": result.breeze,
-            "stench": result.stench,
-            "potential_pit": False,
-            "potential_wumpus": False,
-            "pit": result.pit,
-            "wumpus": result.wumpus,
-        })
+        beliefs.update(
+            (agent.x, agent.y),
+            breeze=result.breeze,
+            stench=result.stench,
+            potential_pit=False,
+            potential_wumpus=False,
+            pit=result.pit,
+            wumpus=result.wumpus,
+            visited=True,
+        )
 
         if result.wumpus_died:
-            self.shared_beliefs.setdefault(result.wumpus_died, {}).update({
-                "wumpus": False,
-                "dead_wumpus": True,
-            })
-
-        neighbors = get_neighbours(agent.x, agent.y)
-
-        if result.stench or result.breeze:
-            # determine where the danger is
-            potential_danger_group = []
-            for nx, ny in neighbors:
-                # count wumpus and pits, but no need to mark them as potential dangerous
-                if (self.shared_beliefs.get((nx, ny), {}).get("wumpus") or
-                        self.shared_beliefs.get((nx, ny), {}).get("dead_wumpus") or
-                        self.shared_beliefs.get((nx, ny), {}).get("pit")):
-                    potential_danger_group.append((nx, ny))
-                    continue
-
-                if (nx, ny) in self.shared_visited:
-                    continue
+            beliefs.update(result.wumpus_died, wumpus=False, dead_wumpus=True)
 
-                # if potential danger next to a non breeze / stench cell, then that cant be a potential danger
-                potential_danger_neighbors = get_neighbours(nx, ny)
-                if any(
-                        pdn_pos in self.shared_visited and not
-                        (
-                            (self.shared_beliefs.get(pdn_pos, {}).get("breeze") and result.breeze) or
-                            (self.shared_beliefs.get(pdn_pos, {}).get("stench") and result.stench)
-                        )
-                        for pdn_pos in potential_danger_neighbors
-                ):
-                    continue
-
-                self.shared_beliefs.setdefault((nx, ny), {}).update({
-                    "potential_pit": result.breeze,
-                    "potential_wumpus": result.stench,
-                })
-                potential_danger_group.append((nx, ny))
-
-            # if there are only real dangers and no potential dangers in the group, then that group is completed
-            if all(self.shared_beliefs.get((pdx, pdy), {}).get("wumpus") or
-                   self.shared_beliefs.get((pdx, pdy), {}).get("dead_wumpus") or
-                   self.shared_beliefs.get((pdx, pdy), {}).get("pit") for (pdx, pdy) in potential_danger_group):
-                return
-
-            # if there is only one potential danger, then that must be the danger the current cell is referring to
-            if len(potential_danger_group) == 1:
-                potential_pit = self.shared_beliefs.get(potential_danger_group[0], {}).get("potential_pit")
-                potential_wumpus = self.shared_beliefs.get(potential_danger_group[0], {}).get("potential_wumpus")
-                self.shared_beliefs[potential_danger_group[0]].update({
-                    "potential_pit": False,
-                    "potential_wumpus": False,
-                    "pit": potential_pit,
-                    "wumpus": potential_wumpus,
-                })
-            elif len(potential_danger_group):
-                self._potential_danger_groups.append(potential_danger_group)
-        else:
-            # update potential danger groups
-            for nx, ny in neighbors:
-                potential_pit = self.shared_beliefs.get((nx, ny), {}).get("potential_pit")
-                potential_wumpus = self.shared_beliefs.get((nx, ny), {}).get("potential_wumpus")
-
-                if not (potential_pit or potential_wumpus):
-                    continue
-
-                self.shared_beliefs[(nx, ny)].update({
-                    "potential_pit": False,
-                    "potential_wumpus": False,
-                })
-
-                for group in self._potential_danger_groups.copy():
-                    if (nx, ny) not in group:
-                        continue
-
-                    group.remove((nx, ny))
-
-                    # if there is only one potential danger, then that must be the danger of the group
-                    if len(group) == 1:
-                        if not (self.shared_beliefs.get(group[0], {}).get("wumpus") or
-                                self.shared_beliefs.get(group[0], {}).get("dead_wumpus") or
-                                self.shared_beliefs.get(group[0], {}).get("pit")):
-                            self.shared_beliefs[group[0]].update({
-                                "potential_pit": False,
-                                "potential_wumpus": False,
-                                "pit": potential_pit,
-                                "wumpus": potential_wumpus,
-                            })
-                        self._potential_danger_groups.remove(group)
+        self._inference.observe((agent.x, agent.y), result)
 
     def create_tasks(self, board: Board) -> list[Task]:
         """Creates Tasks for the agents to complete.
+        The open tasks are kept between the game steps and only the cells whose beliefs changed since the last
+        call are checked again, so the same task object is returned for a cell, as long as it is open.
 
         :param board: The Board of the Game.
         :return: The list of created tasks.
         """
-        tasks = []
-
-        move_tasks = [
-            MoveTask((cell.x, cell.y)) for cell in board.cells
-            if not (cell.x, cell.y) in self.shared_visited
-            and not self.shared_beliefs.get((cell.x, cell.y), {}).get("wumpus")
-            and not self.shared_beliefs.get((cell.x, cell.y), {}).get("pit")
-        ]
-        tasks.extend(move_tasks)
-
-        if SHOOT:
-            shoot_tasks = [
-                ShootTask((bx, by)) for (bx, by) in self.shared_beliefs.keys()
-                if self.shared_beliefs.get((bx, by), {}).get("wumpus")
-            ]
-            tasks.extend(shoot_tasks)
+        self.shared_beliefs.set_bounds(board.get_bounds())
+        self._agent_index = board.agent_index
+        changes = self.shared_beliefs.changes_since(self._tasks_version)
+
+        if changes is None:
+            # the beliefs were reset, so all the cells of the board are checked
+            self._move_tasks = {}
+            self._shoot_tasks = {}
+            for pos in board.get_positions():
+                self._update_tasks(pos)
+        else:
+            size = self.shared_beliefs.grid_size
+            reopened = False
+            for index in dict.fromkeys(changes):
+                reopened |= self._update_tasks(divmod(index, size))
+
+            # a cell that was closed and is open again, like a cell of a killed wumpus, keeps its place in the order
+            if reopened:
+                self._move_tasks = dict(sorted(self._move_tasks.items()))
 
+        self._tasks_version = self.shared_beliefs.version
+
+        tasks: list[Task] = list(self._move_tasks.values())
+        if self._config.shoot:
+            tasks.extend(task for _, task in sorted(self._shoot_tasks.items()))
         return tasks
 
-    def create_bids(self, tasks: list[Task]) -> list[tuple[float, int, Task, list[tuple[int, int]]]]:
+    def _update_tasks(self, pos: tuple[int, int]) -> bool:
+        """Opens or closes the tasks of a cell, according to its beliefs.
+
+        :param pos: The position of the cell.
+        :return: Whether a move task was opened.
+        """
+        flags = self.shared_beliefs.get_flags(pos)
+        opened = False
+
+        # cells outside the loaded part of the board can not be planned with
+        if not self.shared_beliefs.in_bounds(pos):
+            self._move_tasks.pop(pos, None)
+            self._shoot_tasks.pop(pos, None)
+            return opened
+
+        if flags & (VISITED | DANGER):
+            self._move_tasks.pop(pos, None)
+        elif pos not in self._move_tasks:
+            self._move_tasks[pos] = self._task_pool.get(TaskType.MOVE, pos)
+            opened = True
+
+        if not flags & WUMPUS:
+            self._shoot_tasks.pop(pos, None)
+        elif pos not in self._shoot_tasks:
+            self._shoot_tasks[pos] = self._task_pool.get(TaskType.SHOOT, pos)
+
+        return opened
+
+    def get_risk_costs(self) -> dict[int, int] | None:
+        """Gets the cost of stepping onto each potential danger, if they are priced by the probability of a danger.
+
+        :return: The step costs by the index of the cell, or None if all risky steps cost the same.
+        """
+        if self._config.risky and self._config.risk_model == "probability":
+            return self._risk_map.get_step_costs(len(self.shared_visited))
+        return None
+
+    def create_bids(self, tasks: list[Task]) -> list[Bid]:
         """Lets each agent bid for each task.
+        Only the bids that can be fulfilled are kept and the Network of paths of each agent is kept,
+        to reconstruct the paths of the awarded tasks.
 
         :param tasks: The tasks that where created for this game state.
-        :return: A list of bids that each contain: bid, agent_id, task, path.
+        :return: A list of bids that each contain: negated bid, order, agent_id, task, goal.
         """
-        bids: list[tuple[float, int, Task, list[tuple[int, int]]]] = []
-        for agent in self._agents:
-            if agent.dead:
-                continue
+        bids: list[Bid] = []
+        self._came_from = {}
+        self._bidding_agents = 0
+        has_shoot_tasks = any(task.task_type == TaskType.SHOOT for task in tasks)
+
+        profiler = self._profiler
+        start = profiler.clock()
+
+        # the distance of each cell to the nearest other agent, for the bonus of moving away from the other agents
+        living_agents = [agent for agent in self._agents if not agent.dead]
+        spread = None
+        if self._config.manhatten_bonus:
+            spread = SpreadDistances(
+                self._agent_index.get_positions(), self.shared_beliefs, self._config.spread_metric
+            )
+        start = profiler.lap("spread", start)
+
+        risk_costs = self.get_risk_costs()
+        if risk_costs is not None:
+            start = profiler.lap("risk", start)
+
+        cache = self._path_cache
+        hits, misses = (cache.hits, cache.misses) if cache else (0, 0)
+
+        for agent in living_agents:
 
             # creates the Network of path for each cell to the agents cell and their travel cost
-            came_from, cost_so_far = agent.create_dijkstra_paths(self.shared_beliefs, risky=RISKY)
+            came_from, cost_so_far = agent.create_dijkstra_paths(
+                self.shared_beliefs, risky=self._config.risky, risk_costs=risk_costs, path_cache=self._path_cache
+            )
+            start = profiler.lap("dijkstra", start)
+            profiler.count("node_expansions", agent.expansions)
+            self._came_from[agent.agent_id] = came_from
+            amount_of_bids = len(bids)
+
+            # the index for shoot tasks is created once per agent, if there are any shoot tasks
+            aligned_index = AlignedCellIndex(cost_so_far) if has_shoot_tasks and agent.has_arrow else None
 
             for task in tasks:
                 # agent creates a bid
-                bid, path = agent.bid_for_task(
-                    task, came_from, cost_so_far, [(a.x, a.y) for a in self._agents if a is not agent and not a.dead])
-                # bid, the id of the agent, the task and the path to the task are appended to the bids
-                bids.append((bid, agent.agent_id, task, path))
+                bid, goal = agent.bid_for_task(task, came_from, cost_so_far, spread, aligned_index)
+                if goal is None:
+                    continue
+                # the bid is negated, so that the highest bids are at the top of a heap
+                bids.append((-bid, len(bids), agent.agent_id, task, goal))
 
-        # bids are sorted, highest bits are at the top of the list
-        bids.sort(reverse=True, key=lambda x: x[0])
+            if len(bids) > amount_of_bids:
+                self._bidding_agents += 1
+            start = profiler.lap("bidding", start)
+
+        if cache:
+            profiler.count("path_cache_hits", cache.hits - hits)
+            profiler.count("path_cache_misses", cache.misses - misses)
         return bids
 
-    @staticmethod
-    def award_tasks(bids: list[tuple[float, int, Task, list[tuple[int, int]]]]) -> dict[int, Task]:
+    def award_tasks(self, bids: list[Bid]) -> dict[int, Task]:
+        """Gives out one task to each agent, either greedy or as an optimal assignment, depending on the configuration.
+        The path of each awarded task is kept in awarded_paths.
+
+        :param bids: The bids the agents have made for each task.
+        :return: A dict with the agent_id and the task that was given to that agent.
+        """
+        if self._config.awarding == "optimal":
+            return self._award_tasks_optimal(bids)
+        return self._award_tasks_greedy(bids)
+
+    def _award_tasks_greedy(self, bids: list[Bid]) -> dict[int, Task]:
         """Gives out one task to each agent.
         The Task that have the highest bid will be given out first,
         where the agent with the highest bid will get the task.
+        The bids are only ordered as far as needed, until each bidding agent got a task.
 
         :param bids: The bids the agents have made for each task.
         :return: A dict with the agent_id and the task that was given to that agent.
         """
+        heapq.heapify(bids)
+
+        self.awarded_paths = {}
+        awarded_tasks: dict[int, Task] = {}
+        taken_tasks: set[Task] = set()
+        while bids and len(awarded_tasks) < self._bidding_agents:
+            _, _, agent_id, task, goal = heapq.heappop(bids)
+            if agent_id in awarded_tasks or task in taken_tasks:
+                continue
+            taken_tasks.add(task)
+            # only the paths of the awarded tasks are reconstructed
+            self.awarded_paths[agent_id] = Agent.reconstruct_path(self._came_from[agent_id], goal)
+            awarded_tasks[agent_id] = task
+        return awarded_tasks
+
+    def _award_tasks_optimal(self, bids: list[Bid]) -> dict[int, Task]:
+        """Gives out one task to each agent, so that the sum of the awarded bids is the highest possible.
+        An agent never needs a task outside of its best bids, one per bidding agent, as at least one of them
+        is not taken by the other agents, so only those are assigned with the Hungarian algorithm.
+
+        :param bids: The bids the agents have made for each task.
+        :return: A dict with the agent_id and the task that was given to that agent.
+        """
+        bids_per_agent: dict[int, list[Bid]] = {}
+        for bid in bids:
+            bids_per_agent.setdefault(bid[2], []).append(bid)
+
+        best_bids = {
+            agent_id: heapq.nsmallest(self._bidding_agents, agent_bids)
+            for agent_id, agent_bids in bids_per_agent.items()
+        }
+
+        agent_ids = list(best_bids)
+        columns: dict[Task, int] = {}
+        bids_per_column: list[dict[int, Bid]] = []
+        for agent_id in agent_ids:
+            row_bids = {}
+            for bid in best_bids[agent_id]:
+                task = bid[3]
+                row_bids[columns.setdefault(task, len(columns))] = bid
+            bids_per_column.append(row_bids)
+
+        # one extra column per agent, for agents that end up without a task
+        costs = [[UNASSIGNED_COST] * (len(columns) + len(agent_ids)) for _ in agent_ids]
+        for row, row_bids in enumerate(bids_per_column):
+            for column, bid in row_bids.items():
+                costs[row][column] = bid[0]
+
+        self.awarded_paths = {}
         awarded_tasks: dict[int, Task] = {}
-        for bid, agent_id, task, path in bids:
-            if path is None or agent_id in awarded_tasks or task in awarded_tasks.values():
+        for row, column in enumerate(hungarian(costs)):
+            if column not in bids_per_column[row]:
                 continue
-            task.path = path
+            _, _, agent_id, task, goal = bids_per_column[row][column]
+            self.awarded_paths[agent_id] = Agent.reconstruct_path(self._came_from[agent_id], goal)
             awarded_tasks[agent_id] = task
         return awarded_tasks
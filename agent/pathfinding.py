@@ -0,0 +1,536 @@
+from agent.beliefs import BeliefStore, DANGER, POTENTIAL_DANGER
+
+from collections import OrderedDict
+from collections.abc import Callable
+import heapq
+
+# the cost of stepping onto a safe cell and onto a potentially dangerous cell
+SAFE_STEP_COST = 1
+RISKY_STEP_COST = 1000
+
+INFINITY = float('inf')
+
+
+def heap_dijkstra(start: tuple[int, int], beliefs: BeliefStore, risky=False,
+                  risk_costs: dict[int, int] | None = None) \
+        -> tuple[dict[tuple[int, int], tuple[int, int]], dict[tuple[int, int], int]]:
+    """Creates a Network of Paths from the start to any other cell, using a binary heap as priority queue.
+
+    :param start: The position the paths start at.
+    :param beliefs: The current beliefs the agents have on the board.
+    :param risky: Whether an agent can run onto potential danger.
+    :param risk_costs: The cost of stepping onto each potential danger by the index of its cell,
+        instead of the flat risky step cost.
+    :return: The Network of Paths and the cost to travel to each cell.
+    """
+    flags = beliefs.flags
+    size = beliefs.grid_size
+    x_min, y_min, x_max, y_max = beliefs.bounds
+
+    frontier = [(0, start)]
+
+    came_from: dict[tuple[int, int], tuple[int, int]] = {start: None}
+    cost_so_far: dict[tuple[int, int], int] = {start: 0}
+
+    while frontier:
+        current_cost, (x, y) = heapq.heappop(frontier)
+
+        # skip entries of cells that were already reached cheaper
+        if current_cost > cost_so_far[(x, y)]:
+            continue
+
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if not (x_min <= nx < x_max and y_min <= ny < y_max):
+                continue
+
+            cell_flags = flags[nx * size + ny]
+
+            if cell_flags & DANGER:
+                continue
+
+            if cell_flags & POTENTIAL_DANGER:
+                if not risky:
+                    continue
+                step_cost = RISKY_STEP_COST if risk_costs is None else risk_costs.get(nx * size + ny, RISKY_STEP_COST)
+            else:
+                step_cost = SAFE_STEP_COST
+
+            new_cost = current_cost + step_cost
+
+            if (nx, ny) not in cost_so_far or new_cost < cost_so_far[(nx, ny)]:
+                cost_so_far[(nx, ny)] = new_cost
+                came_from[(nx, ny)] = (x, y)
+                heapq.heappush(frontier, (new_cost, (nx, ny)))
+
+    return came_from, cost_so_far
+
+
+def bucket_dijkstra(start: tuple[int, int], beliefs: BeliefStore, risky=False,
+                    risk_costs: dict[int, int] | None = None) \
+        -> tuple[dict[tuple[int, int], tuple[int, int]], dict[tuple[int, int], int]]:
+    """Creates a Network of Paths from the start to any other cell, using a bucket per cost as priority queue.
+    As all safe steps cost the same and only the few potential dangers cost more, there are only few distinct costs,
+    so the heap only orders the costs of the buckets and each cell is appended to its bucket in constant time.
+
+    Each bucket is sorted before it is expanded, so cells of the same cost are expanded in the same order as
+    with heap_dijkstra and both return the same Network of Paths.
+
+    :param start: The position the paths start at.
+    :param beliefs: The current beliefs the agents have on the board.
+    :param risky: Whether an agent can run onto potential danger.
+    :param risk_costs: The cost of stepping onto each potential danger by the index of its cell,
+        instead of the flat risky step cost.
+    :return: The Network of Paths and the cost to travel to each cell.
+    """
+    flags = beliefs.flags
+    size = beliefs.grid_size
+    x_min, y_min, x_max, y_max = beliefs.bounds
+
+    buckets: dict[int, list[tuple[int, int]]] = {0: [start]}
+    bucket_costs = [0]
+
+    came_from: dict[tuple[int, int], tuple[int, int]] = {start: None}
+    cost_so_far: dict[tuple[int, int], int] = {start: 0}
+
+    while bucket_costs:
+        current_cost = heapq.heappop(bucket_costs)
+        bucket = buckets.pop(current_cost)
+        bucket.sort()
+
+        for x, y in bucket:
+            # a cell is closed once it is expanded with its final cost, later entries of it are skipped
+            if cost_so_far[(x, y)] != current_cost:
+                continue
+
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                if not (x_min <= nx < x_max and y_min <= ny < y_max):
+                    continue
+
+                cell_flags = flags[nx * size + ny]
+
+                if cell_flags & DANGER:
+                    continue
+
+                if cell_flags & POTENTIAL_DANGER:
+                    if not risky:
+                        continue
+                    step_cost = RISKY_STEP_COST if risk_costs is None \
+                        else risk_costs.get(nx * size + ny, RISKY_STEP_COST)
+                else:
+                    step_cost = SAFE_STEP_COST
+
+                new_cost = current_cost + step_cost
+
+                if (nx, ny) not in cost_so_far or new_cost < cost_so_far[(nx, ny)]:
+                    cost_so_far[(nx, ny)] = new_cost
+                    came_from[(nx, ny)] = (x, y)
+
+                    next_bucket = buckets.get(new_cost)
+                    if next_bucket is None:
+                        buckets[new_cost] = [(nx, ny)]
+                        heapq.heappush(bucket_costs, new_cost)
+                    else:
+                        next_bucket.append((nx, ny))
+
+    return came_from, cost_so_far
+
+
+PATHFINDERS = {
+    "heap": heap_dijkstra,
+    "buckets": bucket_dijkstra,
+}
+
+
+class IncrementalSearch:
+    """A Lifelong Planning A* search without heuristic, that keeps the Network of Paths of one agent between
+    game steps and only repairs the cells whose cost changed since the last search, as well as the cells whose
+    shortest path runs through them.
+
+    The cost of a step is the cost of the cell that is stepped onto, so a changed belief on a cell only changes
+    the paths into that cell. When the agent moves to a cell it could reach, every cell can still be reached
+    by going back to the old position first, so the costs are all raised by the cost of that detour, which keeps
+    them consistent with each other. Only the cells that are cheaper from the new position are repaired afterwards,
+    so a step of the agent does not search the cells behind it again. Otherwise the Network of Paths is searched
+    again with bucket_dijkstra.
+    The parent of a cell is the neighbour with the lowest (cost, position), which is the same parent that the
+    Dijkstra searches choose, so all searches return the same Network of Paths.
+
+    :ivar _beliefs (BeliefStore | None): The beliefs the search was done on.
+    :ivar _version (int): The version of the beliefs the search was done on.
+    :ivar _risky (bool): Whether the search allows running onto potential danger.
+    :ivar _risk_costs (dict[int, int] | None): The cost of stepping onto each potential danger by the index of
+        its cell, or None for the flat risky step cost.
+    :ivar _start (tuple[int, int] | None): The position the paths start at.
+    :ivar _queue (list[tuple[float, tuple[int, int]]]): The cells whose cost is not settled yet.
+    :ivar _rhs (dict[tuple[int, int], int]): The cost of each cell, according to the costs of its neighbours.
+    :ivar cost_so_far (dict[tuple[int, int], int]): The settled cost of getting to each cell.
+    :ivar came_from (dict[tuple[int, int], tuple[int, int]]): The Network of Paths.
+    :ivar expansions (int): The amount of cells that were expanded in the last search.
+    """
+    def __init__(self):
+        self._beliefs: BeliefStore | None = None
+        self._version: int = -1
+        self._risky: bool = False
+        self._risk_costs: dict[int, int] | None = None
+        self._start: tuple[int, int] | None = None
+        self._queue: list[tuple[float, tuple[int, int]]] = []
+        self._rhs: dict[tuple[int, int], int] = {}
+        self.cost_so_far: dict[tuple[int, int], int] = {}
+        self.came_from: dict[tuple[int, int], tuple[int, int]] = {}
+        self.expansions: int = 0
+
+    def search(self, start: tuple[int, int], beliefs: BeliefStore, risky=False,
+               risk_costs: dict[int, int] | None = None) \
+            -> tuple[dict[tuple[int, int], tuple[int, int]], dict[tuple[int, int], int]]:
+        """Updates the Network of Paths to the current position and beliefs.
+        The returned dicts belong to the search and are only valid until the next search.
+
+        :param start: The position the paths start at.
+        :param beliefs: The current beliefs the agents have on the board.
+        :param risky: Whether an agent can run onto potential danger.
+        :param risk_costs: The cost of stepping onto each potential danger by the index of its cell,
+            instead of the flat risky step cost.
+        :return: The Network of Paths and the cost to travel to each cell.
+        """
+        changes = beliefs.changes_since(self._version) if beliefs is self._beliefs else None
+
+        if changes is None or risky != self._risky or (risk_costs is None) != (self._risk_costs is None) \
+                or not self._can_move(start):
+            self._beliefs = beliefs
+            self._risky = risky
+            self._risk_costs = risk_costs
+            self._start = start
+            self._queue = []
+            self.came_from, self.cost_so_far = bucket_dijkstra(start, beliefs, risky, risk_costs)
+            self._rhs = dict(self.cost_so_far)
+            self.expansions = len(self.cost_so_far)
+        else:
+            if start != self._start:
+                self._move_start(start)
+
+            changed = set(changes)
+            if risk_costs is not None and risk_costs is not self._risk_costs:
+                # the cells whose risk changed, without a change of their beliefs
+                old_costs = self._risk_costs
+                changed.update(index for index in risk_costs.keys() | old_costs.keys()
+                               if risk_costs.get(index) != old_costs.get(index))
+                self._risk_costs = risk_costs
+
+            size = beliefs.grid_size
+            for index in changed:
+                self._update_cell(divmod(index, size))
+            self._compute()
+
+        self._version = beliefs.version
+
+        return self.came_from, self.cost_so_far
+
+    def _can_move(self, start: tuple[int, int]) -> bool:
+        """Checks whether the start can be moved to a position, instead of searching again.
+
+        :param start: The new position the paths start at.
+        :return: Whether the position was reached and the agent could step back onto the old position.
+        """
+        if start == self._start:
+            return True
+        return start in self.cost_so_far and self._step_cost(start) is not None \
+            and self._step_cost(self._start) is not None
+
+    def _move_start(self, start: tuple[int, int]) -> None:
+        """Moves the start of the Network of Paths to a position it reached.
+        The costs are raised by the cost of going back from the new to the old position, after which only the
+        two positions are inconsistent.
+
+        :param start: The new position the paths start at.
+        """
+        old_start = self._start
+        detour = self.cost_so_far[start] - self._step_cost(start) + self._step_cost(old_start)
+        self.cost_so_far = {pos: cost + detour for pos, cost in self.cost_so_far.items()}
+        self._rhs = {pos: cost + detour for pos, cost in self._rhs.items()}
+
+        self._start = start
+        self._update_cell(old_start)
+        self._update_cell(start)
+
+    def _step_cost(self, pos: tuple[int, int]) -> int | None:
+        """Gets the cost of stepping onto a cell.
+
+        :param pos: The position of the cell.
+        :return: The cost, or None if the cell can not be stepped onto.
+        """
+        cell_flags = self._beliefs.flags[pos[0] * self._beliefs.grid_size + pos[1]]
+
+        if cell_flags & DANGER:
+            return None
+        if cell_flags & POTENTIAL_DANGER:
+            if not self._risky:
+                return None
+            if self._risk_costs is None:
+                return RISKY_STEP_COST
+            return self._risk_costs.get(pos[0] * self._beliefs.grid_size + pos[1], RISKY_STEP_COST)
+        return SAFE_STEP_COST
+
+    def _neighbours(self, x: int, y: int) -> list[tuple[int, int]]:
+        """Gets all the neighbours of a position, that are in the bounds of the beliefs.
+
+        :param x: The x position of which the neighbours should be got.
+        :param y: The y position of which the neighbours should be got.
+        :return: A list of the positions neighbours.
+        """
+        x_min, y_min, x_max, y_max = self._beliefs.bounds
+        return [
+            (nx, ny) for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+            if x_min <= nx < x_max and y_min <= ny < y_max
+        ]
+
+    def _update_cell(self, pos: tuple[int, int]) -> None:
+        """Recalculates the cost and parent of a cell from its neighbours and queues it, if it is not settled.
+
+        :param pos: The position of the cell.
+        """
+        if pos == self._start:
+            self._rhs[pos] = 0
+            self.came_from[pos] = None
+        else:
+            step_cost = self._step_cost(pos)
+            best: tuple[int, tuple[int, int]] | None = None
+
+            if step_cost is not None:
+                for neighbour in self._neighbours(*pos):
+                    cost = self.cost_so_far.get(neighbour)
+                    if cost is not None and (best is None or (cost, neighbour) < best):
+                        best = (cost, neighbour)
+
+            if best is None:
+                self._rhs.pop(pos, None)
+                self.came_from.pop(pos, None)
+            else:
+                self._rhs[pos] = best[0] + step_cost
+                self.came_from[pos] = best[1]
+
+        self._queue_cell(pos)
+
+    def _queue_cell(self, pos: tuple[int, int]) -> None:
+        """Queues a cell, if its settled cost differs from the cost according to its neighbours.
+
+        :param pos: The position of the cell.
+        """
+        cost = self.cost_so_far.get(pos, INFINITY)
+        rhs = self._rhs.get(pos, INFINITY)
+        if cost != rhs:
+            heapq.heappush(self._queue, (min(cost, rhs), pos))
+
+    def _compute(self) -> None:
+        """Settles the costs of all the queued cells, in the order of their costs."""
+        queue = self._queue
+        rhs_costs = self._rhs
+        cost_so_far = self.cost_so_far
+        came_from = self.came_from
+        start = self._start
+        flags = self._beliefs.flags
+        size = self._beliefs.grid_size
+        x_min, y_min, x_max, y_max = self._beliefs.bounds
+        risky = self._risky
+        risk_costs = self._risk_costs
+        expansions = 0
+
+        while queue:
+            key, pos = heapq.heappop(queue)
+            cost = cost_so_far.get(pos, INFINITY)
+            rhs = rhs_costs.get(pos, INFINITY)
+
+            # skip entries of cells that are settled or were queued again with another key
+            if cost == rhs or key != min(cost, rhs):
+                continue
+            expansions += 1
+
+            if cost > rhs:
+                # the cell got cheaper, which can only make its neighbours cheaper
+                # the step costs are inlined as in bucket_dijkstra, as most of the repair happens here
+                cost_so_far[pos] = rhs
+                x, y = pos
+                for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+                    nx, ny = neighbour
+                    if not (x_min <= nx < x_max and y_min <= ny < y_max) or neighbour == start:
+                        continue
+
+                    cell_flags = flags[nx * size + ny]
+                    if cell_flags & DANGER:
+                        continue
+                    if cell_flags & POTENTIAL_DANGER:
+                        if not risky:
+                            continue
+                        step_cost = RISKY_STEP_COST if risk_costs is None \
+                            else risk_costs.get(nx * size + ny, RISKY_STEP_COST)
+                    else:
+                        step_cost = SAFE_STEP_COST
+
+                    new_rhs = rhs + step_cost
+                    old_rhs = rhs_costs.get(neighbour)
+                    if old_rhs is None or new_rhs < old_rhs or (new_rhs == old_rhs and pos < came_from[neighbour]):
+                        rhs_costs[neighbour] = new_rhs
+                        came_from[neighbour] = pos
+                        if cost_so_far.get(neighbour) != new_rhs:
+                            heapq.heappush(queue, (min(cost_so_far.get(neighbour, INFINITY), new_rhs), neighbour))
+            else:
+                # the cell got more expensive, so it and the cells whose paths run through it are recalculated
+                del cost_so_far[pos]
+                self._update_cell(pos)
+                for neighbour in self._neighbours(*pos):
+                    if came_from.get(neighbour) == pos:
+                        self._update_cell(neighbour)
+
+        self.expansions = expansions
+
+
+class PathCache:
+    """A cache of the Networks of Paths of the Dijkstra searches, by their start and whether they are risky,
+    that is shared by all agents and kept between the game steps.
+
+    A cached search is valid for the version of the beliefs it was made on. When it is requested for a later
+    version, only the cells that changed since then are checked: a change only matters, if it changes the cost
+    of stepping onto a cell that was reached or onto one of its neighbours, as the other cells are behind cells
+    that can not be stepped onto. Otherwise the search is still valid and is moved to the current version.
+    The least recently used searches are dropped, once the cached searches contain more cells than the cap.
+
+    :ivar _max_cells (int): The largest amount of cells in all the cached searches together.
+    :ivar _cells (int): The amount of cells in all the cached searches together.
+    :ivar _entries (OrderedDict[tuple[tuple[int, int], bool], tuple]): The version of the beliefs, the bounds,
+        the risk costs and the Network of Paths and costs of each search, from the least to the most recently used.
+    :ivar hits (int): The amount of searches that were taken from the cache.
+    :ivar misses (int): The amount of searches that had to be made.
+    """
+    def __init__(self, max_cells: int):
+        self._max_cells: int = max_cells
+        self._cells: int = 0
+        self._entries: OrderedDict[tuple[tuple[int, int], bool], tuple] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def clear(self) -> None:
+        """Drops all the cached searches."""
+        self._entries.clear()
+        self._cells = 0
+
+    def search(self, start: tuple[int, int], beliefs: BeliefStore, risky: bool, risk_costs: dict[int, int] | None,
+               pathfinder: Callable) -> tuple[dict[tuple[int, int], tuple[int, int]], dict[tuple[int, int], int], bool]:
+        """Gets the Network of Paths from the start on the current beliefs, from the cache if it is still valid,
+        otherwise from the pathfinder. The returned dicts are shared and must not be changed.
+
+        :param start: The position the paths start at.
+        :param beliefs: The current beliefs the agents have on the board.
+        :param risky: Whether an agent can run onto potential danger.
+        :param risk_costs: The cost of stepping onto each potential danger by the index of its cell.
+        :param pathfinder: The search that is made, if the cache has no valid search.
+        :return: The Network of Paths, the cost to travel to each cell and whether it was taken from the cache.
+        """
+        key = (start, risky)
+        entry = self._entries.get(key)
+
+        if entry is not None and self._is_valid(entry, beliefs, risky, risk_costs):
+            self._entries[key] = (beliefs.version, beliefs.bounds, risk_costs, entry[3], entry[4])
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[3], entry[4], True
+
+        self.misses += 1
+        came_from, cost_so_far = pathfinder(start, beliefs, risky, risk_costs)
+
+        if entry is not None:
+            self._cells -= len(entry[4])
+        self._entries[key] = (beliefs.version, beliefs.bounds, risk_costs, came_from, cost_so_far)
+        self._entries.move_to_end(key)
+        self._cells += len(cost_so_far)
+
+        while self._cells > self._max_cells and len(self._entries) > 1:
+            _, dropped = self._entries.popitem(last=False)
+            self._cells -= len(dropped[4])
+
+        return came_from, cost_so_far, False
+
+    @staticmethod
+    def _is_valid(entry: tuple, beliefs: BeliefStore, risky: bool, risk_costs: dict[int, int] | None) -> bool:
+        """Helper method to check whether a cached search is still the same on the current beliefs.
+
+        :param entry: The cached search.
+        :param beliefs: The current beliefs the agents have on the board.
+        :param risky: Whether an agent can run onto potential danger.
+        :param risk_costs: The current cost of stepping onto each potential danger by the index of its cell.
+        :return: Whether the search is still valid.
+        """
+        version, bounds, old_risk_costs, came_from, cost_so_far = entry
+        if bounds != beliefs.bounds or (risk_costs is None) != (old_risk_costs is None):
+            return False
+
+        changes = beliefs.changes_since(version)
+        if changes is None:
+            return False
+        changed = set(changes)
+        if risk_costs is not old_risk_costs:
+            changed.update(index for index in risk_costs.keys() | old_risk_costs.keys()
+                           if risk_costs.get(index) != old_risk_costs.get(index))
+
+        flags = beliefs.flags
+        size = beliefs.grid_size
+        x_min, y_min, x_max, y_max = bounds
+        for index in changed:
+            x, y = divmod(index, size)
+            if not (x_min <= x < x_max and y_min <= y < y_max):
+                continue
+
+            # the cost of stepping onto the cell on the current beliefs
+            cell_flags = flags[index]
+            if cell_flags & DANGER or (cell_flags & POTENTIAL_DANGER and not risky):
+                step_cost = None
+            elif cell_flags & POTENTIAL_DANGER:
+                step_cost = RISKY_STEP_COST if risk_costs is None else risk_costs.get(index, RISKY_STEP_COST)
+            else:
+                step_cost = SAFE_STEP_COST
+
+            pos = (x, y)
+            parent = came_from.get(pos, pos)
+            if parent is None:
+                # the start is never stepped onto
+                continue
+            if parent != pos:
+                if step_cost != cost_so_far[pos] - cost_so_far[parent]:
+                    return False
+            elif step_cost is not None and any(
+                    neighbour in cost_so_far for neighbour in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+            ):
+                return False
+
+        return True
+
+
+class AlignedCellIndex:
+    """An index on the result of a search, that contains the cheapest reachable cell of each row and column,
+    so the cheapest cell in line with a target is found without scanning the Network of Paths.
+
+    :ivar _columns (dict[int, tuple[int, tuple[int, int]]]): The cost and position of the cheapest cell per x.
+    :ivar _rows (dict[int, tuple[int, tuple[int, int]]]): The cost and position of the cheapest cell per y.
+    """
+    def __init__(self, cost_so_far: dict[tuple[int, int], int]):
+        self._columns: dict[int, tuple[int, tuple[int, int]]] = {}
+        self._rows: dict[int, tuple[int, tuple[int, int]]] = {}
+
+        columns = self._columns
+        rows = self._rows
+        for pos, cost in cost_so_far.items():
+            x, y = pos
+            entry = (cost, pos)
+            if x not in columns or entry < columns[x]:
+                columns[x] = entry
+            if y not in rows or entry < rows[y]:
+                rows[y] = entry
+
+    def nearest(self, target: tuple[int, int]) -> tuple[int, int] | None:
+        """Gets the cheapest reachable cell that is in the same row or column as the target.
+
+        :param target: The position of which a cell in the same row or column is needed.
+        :return: The position of the cheapest aligned cell, or None if no aligned cell can be reached.
+        """
+        candidates = [entry for entry in (self._columns.get(target[0]), self._rows.get(target[1])) if entry]
+        if not candidates:
+            return None
+        return min(candidates)[1]
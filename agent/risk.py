@@ -0,0 +1,212 @@
+from agent.beliefs import BeliefStore, POTENTIAL_DANGER
+from agent.inference import DangerInference, KINDS, PIT_KIND
+from agent.pathfinding import RISKY_STEP_COST
+from util.config import Config
+
+# the additional cost of stepping onto a cell, that is certainly dangerous, on top of the risky step cost
+RISK_STEP_COST = 10000
+
+# components with more cells are not counted exactly, as their models grow exponentially
+MAX_COMPONENT_CELLS = 14
+
+# a component of groups, with its cells, the amount of models per amount of dangers
+# and the amount of models per amount of dangers, in which each cell is dangerous
+Model = tuple[list[tuple[int, int]], list[int], list[list[int]]]
+
+
+def count_models(groups: list[frozenset[tuple[int, int]]]) -> Model:
+    """Counts the assignments of dangers to the cells of a component, in which every group contains at least one
+    danger, per amount of dangers. The cells are assigned in order, and an assignment is abandoned as soon as
+    a group can not get a danger anymore.
+
+    :param groups: The groups of the component.
+    :return: The cells, the amount of models per amount of dangers and the same per cell, if the cell is dangerous.
+    """
+    cells = sorted(set().union(*groups))
+    index = {cell: i for i, cell in enumerate(cells)}
+    size = len(cells)
+
+    members = [[] for _ in range(size)]
+    closing = [[] for _ in range(size)]
+    for group_id, group in enumerate(groups):
+        positions = [index[cell] for cell in group]
+        for position in positions:
+            members[position].append(group_id)
+        closing[max(positions)].append(group_id)
+
+    totals = [0] * (size + 1)
+    cell_counts = [[0] * (size + 1) for _ in range(size)]
+    dangers = [0] * len(groups)
+    chosen: list[int] = []
+
+    def assign(position: int) -> None:
+        if position == size:
+            amount = len(chosen)
+            totals[amount] += 1
+            for cell in chosen:
+                cell_counts[cell][amount] += 1
+            return
+
+        # the cell is dangerous
+        for group_id in members[position]:
+            dangers[group_id] += 1
+        chosen.append(position)
+        assign(position + 1)
+        chosen.pop()
+        for group_id in members[position]:
+            dangers[group_id] -= 1
+
+        # the cell is safe, unless it is the last chance of a group to get a danger
+        if all(dangers[group_id] for group_id in closing[position]):
+            assign(position + 1)
+
+    assign(0)
+    return cells, totals, cell_counts
+
+
+class RiskMap:
+    """Estimates the probability of each potential danger to be a pit or wumpus, from the groups of the
+    danger inference and the amount of pits and wumpus that were not found yet, and turns it into step costs.
+
+    The open groups of each kind are split into components, that share no cells, as the cells of different
+    components are independent of each other, apart from the amount of dangers. The models of each component are
+    counted per amount of dangers and cached by its groups, so after a belief update only the components that
+    changed are counted again. The amount of dangers outside the components is approximated by the share
+    of the unvisited cells, that contain a danger, which weighs the models with more dangers.
+    Components that are too large to count are estimated from each group on its own.
+
+    :ivar _beliefs (BeliefStore): The shared beliefs.
+    :ivar _inference (DangerInference): The inference whose groups and potential dangers are estimated.
+    :ivar _config (Config): The configuration of the simulation.
+    :ivar _models (dict[frozenset[frozenset[tuple[int, int]]], Model]): The counted models of each component.
+    :ivar _key (tuple[int, int] | None): The version of the beliefs and the amount of visited cells,
+        the step costs were created for.
+    :ivar probabilities (dict[tuple[int, int], float]): The probability of each potential danger to be a danger.
+    :ivar step_costs (dict[int, int]): The cost of stepping onto each potential danger, by the index of its cell.
+    """
+    def __init__(self, beliefs: BeliefStore, inference: DangerInference, config: Config | None = None):
+        self._beliefs: BeliefStore = beliefs
+        self._inference: DangerInference = inference
+        self._config: Config = config or Config()
+        self._models: dict[frozenset[frozenset[tuple[int, int]]], Model] = {}
+        self._key: tuple[int, int] | None = None
+        self.probabilities: dict[tuple[int, int], float] = {}
+        self.step_costs: dict[int, int] = {}
+
+    def reset(self) -> None:
+        """Resets the risk map back to its initial state."""
+        self._models = {}
+        self._key = None
+        self.probabilities = {}
+        self.step_costs = {}
+
+    def get_step_costs(self, num_visited: int) -> dict[int, int]:
+        """Gets the cost of stepping onto each potential danger, which grows with the probability of a danger.
+        The step costs are only created again, if the beliefs changed.
+
+        :param num_visited: The amount of visited cells.
+        :return: The step costs by the index of the cell, valid until the beliefs change.
+        """
+        key = (self._beliefs.version, num_visited)
+        if key == self._key:
+            return self.step_costs
+        self._key = key
+
+        safe = {}
+        models = {}
+        for kind in KINDS:
+            prior = self._get_prior(kind, num_visited)
+            probabilities = self._estimate(kind, prior, models)
+            for cell, probability in probabilities.items():
+                safe[cell] = safe.get(cell, 1.0) * (1 - probability)
+        self._models = models
+
+        size = self._beliefs.grid_size
+        flags = self._beliefs.flags
+        self.probabilities = {cell: 1 - chance for cell, chance in safe.items()}
+        self.step_costs = {
+            cell[0] * size + cell[1]: RISKY_STEP_COST + round(RISK_STEP_COST * probability)
+            for cell, probability in self.probabilities.items()
+            if flags[cell[0] * size + cell[1]] & POTENTIAL_DANGER
+        }
+        return self.step_costs
+
+    def _get_prior(self, kind: int, num_visited: int) -> float:
+        """Helper method to get the probability of an unknown cell to contain a danger of a kind.
+
+        :param kind: The kind of danger.
+        :param num_visited: The amount of visited cells.
+        :return: The remaining dangers per unvisited cell, or the configured dangers per cell on the chunked board.
+        """
+        remaining = self._inference.get_remaining(kind)
+        if remaining is None:
+            total = self._config.num_pits if kind == PIT_KIND else self._config.num_wumpus
+            prior = total / (self._config.grid_size * self._config.grid_size)
+        else:
+            x_min, y_min, x_max, y_max = self._beliefs.bounds
+            prior = remaining / max((x_max - x_min) * (y_max - y_min) - num_visited, 1)
+        return min(max(prior, 1e-6), 0.999)
+
+    def _estimate(self, kind: int, prior: float, models: dict[frozenset[frozenset[tuple[int, int]]], Model]) \
+            -> dict[tuple[int, int], float]:
+        """Helper method to estimate the probability of each potential danger of a kind.
+
+        :param kind: The kind of danger.
+        :param prior: The probability of an unknown cell to contain a danger of the kind.
+        :param models: The counted models of the current components, which the components are added to.
+        :return: The probability of each potential danger of the kind.
+        """
+        probabilities = {cell: prior for cell in self._inference.get_candidates(kind)}
+
+        for component in self._split_components(kind):
+            cells = set().union(*component)
+            if len(cells) > MAX_COMPONENT_CELLS:
+                # each group on its own contains at least one danger
+                for group in component:
+                    chance = prior / (1 - (1 - prior) ** len(group))
+                    for cell in group:
+                        probabilities[cell] = max(probabilities.get(cell, prior), chance)
+                continue
+
+            model = self._models.get(component) or models.get(component) or count_models(list(component))
+            models[component] = model
+            ordered_cells, totals, cell_counts = model
+
+            odds = prior / (1 - prior)
+            weights = [odds ** amount for amount in range(len(totals))]
+            total = sum(count * weight for count, weight in zip(totals, weights))
+            if not total:
+                continue
+            for cell, counts in zip(ordered_cells, cell_counts):
+                probabilities[cell] = sum(count * weight for count, weight in zip(counts, weights)) / total
+
+        return probabilities
+
+    def _split_components(self, kind: int) -> list[frozenset[frozenset[tuple[int, int]]]]:
+        """Helper method to split the open groups of a kind into the components, that share no cells.
+
+        :param kind: The kind of danger.
+        :return: The groups of each component.
+        """
+        parents: dict[tuple[int, int], tuple[int, int]] = {}
+
+        def find(cell: tuple[int, int]) -> tuple[int, int]:
+            while parents[cell] != cell:
+                parents[cell] = parents[parents[cell]]
+                cell = parents[cell]
+            return cell
+
+        groups = [frozenset(cells) for group_kind, cells in self._inference.get_groups() if group_kind == kind]
+        for group in groups:
+            first = None
+            for cell in group:
+                parents.setdefault(cell, cell)
+                if first is None:
+                    first = find(cell)
+                else:
+                    parents[find(cell)] = first
+
+        components: dict[tuple[int, int], set[frozenset[tuple[int, int]]]] = {}
+        for group in groups:
+            components.setdefault(find(next(iter(group))), set()).add(group)
+        return [frozenset(component) for component in components.values()]
@@ -0,0 +1,120 @@
+from agent.beliefs import BeliefStore, DANGER
+
+import numpy as np
+
+# the largest amount of distances that are measured at once, which bounds the memory of the spread
+BLOCK_SIZE = 1 << 22
+
+
+def _distance_fields(positions: list[tuple[int, int]], beliefs: BeliefStore, metric: str) -> np.ndarray:
+    """Creates a field per position, that contains the distance of every cell in the bounds of the beliefs
+    to that position.
+
+    :param positions: The positions the distances are measured from, which are in the bounds.
+    :param beliefs: The current beliefs the agents have on the board.
+    :param metric: The distance, either "manhattan", "chebyshev" or "path".
+    :return: An array of the shape (positions, width, height) of the bounds with the distances.
+    """
+    size = beliefs.grid_size
+    x_min, y_min, x_max, y_max = beliefs.bounds
+    xs = np.array([x for x, _ in positions], dtype=np.int32)[:, None, None]
+    ys = np.array([y for _, y in positions], dtype=np.int32)[:, None, None]
+    dx = np.abs(np.arange(x_min, x_max, dtype=np.int32)[None, :, None] - xs)
+    dy = np.abs(np.arange(y_min, y_max, dtype=np.int32)[None, None, :] - ys)
+
+    if metric == "chebyshev":
+        return np.maximum(dx, dy)
+
+    manhattan = dx + dy
+    if metric == "manhattan":
+        return manhattan
+
+    # the amount of steps around the known pits and wumpus, found by spreading a wavefront from each position
+    flags = np.frombuffer(beliefs.flags, dtype=np.uint8).reshape(size, size)[x_min:x_max, y_min:y_max]
+    blocked = (flags & DANGER) != 0
+    unreached = size * size
+    distances = np.full((len(positions), x_max - x_min, y_max - y_min), unreached, dtype=np.int32)
+    distances[np.arange(len(positions)), xs[:, 0, 0] - x_min, ys[:, 0, 0] - y_min] = 0
+
+    while True:
+        spread = distances.copy()
+        np.minimum(spread[:, 1:, :], distances[:, :-1, :] + 1, out=spread[:, 1:, :])
+        np.minimum(spread[:, :-1, :], distances[:, 1:, :] + 1, out=spread[:, :-1, :])
+        np.minimum(spread[:, :, 1:], distances[:, :, :-1] + 1, out=spread[:, :, 1:])
+        np.minimum(spread[:, :, :-1], distances[:, :, 1:] + 1, out=spread[:, :, :-1])
+        spread[:, blocked] = unreached
+
+        if np.array_equal(spread, distances):
+            break
+        distances = spread
+
+    # cells that can not be reached fall back to their manhattan distance
+    return np.where(distances < unreached, distances, manhattan)
+
+
+def nearest_distances(positions: dict[int, tuple[int, int]], beliefs: BeliefStore, metric: str = "manhattan") \
+        -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Measures the nearest and second nearest of the positions for every cell in the bounds of the beliefs.
+    The cells are measured in blocks of rows, so that not all the distances are held at once.
+
+    :param positions: The position of each agent by its id, of which there are at least two.
+    :param beliefs: The current beliefs the agents have on the board.
+    :param metric: The distance, either "manhattan", "chebyshev" or "path".
+    :return: The id of the nearest agent, the distance to it and the distance to the second nearest agent,
+        each of the shape (width, height) of the bounds.
+    """
+    x_min, y_min, x_max, y_max = beliefs.bounds
+    width, height = x_max - x_min, y_max - y_min
+
+    ids = np.array(list(positions), dtype=np.int64)
+    nearest_ids = np.empty((width, height), dtype=np.int64)
+    nearest = np.empty((width, height), dtype=np.int32)
+    second_nearest = np.empty((width, height), dtype=np.int32)
+
+    xs = np.array([x for x, _ in positions.values()], dtype=np.int32)[:, None, None]
+    ys = np.array([y for _, y in positions.values()], dtype=np.int32)[:, None, None]
+    dy = np.abs(np.arange(y_min, y_max, dtype=np.int32)[None, None, :] - ys)
+    fields = _distance_fields(list(positions.values()), beliefs, metric) if metric == "path" else None
+
+    rows = max(1, BLOCK_SIZE // (len(positions) * max(height, 1)))
+    for start in range(0, width, rows):
+        stop = min(width, start + rows)
+        if fields is not None:
+            distances = fields[:, start:stop]
+        else:
+            dx = np.abs(np.arange(x_min + start, x_min + stop, dtype=np.int32)[None, :, None] - xs)
+            distances = np.maximum(dx, dy) if metric == "chebyshev" else dx + dy
+
+        nearest_ids[start:stop] = ids[distances.argmin(axis=0)]
+        nearest[start:stop], second_nearest[start:stop] = np.partition(distances, 1, axis=0)[:2]
+
+    return nearest_ids, nearest, second_nearest
+
+
+class SpreadDistances:
+    """The distance of each cell to the nearest other agent, for the bonus of moving away from the other agents.
+    Instead of a field per agent, only the nearest agent and the nearest and second nearest distance of each cell
+    are kept, as the nearest other agent is the second nearest, if the agent itself is the nearest.
+    So its size does not grow with the amount of agents.
+
+    :ivar origin (tuple[int, int]): The lowest x and y of the bounds of the beliefs, from which the fields are indexed.
+    :ivar nearest_ids (list[list[int]]): The id of the nearest agent of each cell, indexed with [x - x_min][y - y_min],
+        which is -1 if there are no other agents.
+    :ivar nearest (list[list[int]]): The distance of each cell to the nearest agent.
+    :ivar second_nearest (list[list[int]]): The distance of each cell to the second nearest agent.
+    """
+    def __init__(self, positions: dict[int, tuple[int, int]], beliefs: BeliefStore, metric: str = "manhattan"):
+        x_min, y_min, x_max, y_max = beliefs.bounds
+        width, height = x_max - x_min, y_max - y_min
+        self.origin: tuple[int, int] = (x_min, y_min)
+
+        if len(positions) < 2:
+            self.nearest_ids: list[list[int]] = [[-1] * height for _ in range(width)]
+            self.nearest: list[list[int]] = [[0] * height for _ in range(width)]
+            self.second_nearest: list[list[int]] = self.nearest
+            return
+
+        nearest_ids, nearest, second_nearest = nearest_distances(positions, beliefs, metric)
+        self.nearest_ids = nearest_ids.tolist()
+        self.nearest = nearest.tolist()
+        self.second_nearest = second_nearest.tolist()
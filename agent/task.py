@@ -8,31 +8,94 @@ class TaskType(Enum):
 
 
 class Task:
-    """The base task class.
+    """The base task class. A task is immutable and equal to every other task of the same type and target,
+    so it can be used as key of sets and dicts. The path to complete it is kept by the one that awarded it.
 
     :ivar task_type (TaskType): The type of task.
     :ivar target (tuple[int, int]): The target of the task.
-    :ivar path (list[tuple[int, int]]): The path to complete the task.
     :ivar reward (int): The reward for completing the task.
     """
+    __slots__ = ("task_type", "target", "reward")
+
     def __init__(self, task_type: TaskType, target: tuple[int, int], reward: int):
-        self.task_type = task_type
-        self.target: tuple[int, int] = target
-        self.path: list[tuple[int, int]] | None = None
-        self.reward: int = reward
+        object.__setattr__(self, "task_type", task_type)
+        object.__setattr__(self, "target", target)
+        object.__setattr__(self, "reward", reward)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Task):
+            return NotImplemented
+        return self.task_type is other.task_type and self.target == other.target
+
+    def __hash__(self) -> int:
+        return hash((self.task_type, self.target))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.target})"
+
+    def __reduce__(self):
+        # copies and pickles are created through the constructor, as the attributes can not be set
+        return Task, (self.task_type, self.target, self.reward)
 
 
 class MoveTask(Task):
     """A task to move to a certain target."""
+    __slots__ = ()
+
     def __init__(self, target: tuple[int, int]):
         super().__init__(TaskType.MOVE, target, 1)
 
+    def __reduce__(self):
+        return MoveTask, (self.target,)
+
 
 class ShootTask(Task):
     """A task to shoot a certain target."""
+    __slots__ = ()
+
     def __init__(self, target: tuple[int, int]):
         super().__init__(TaskType.SHOOT, target, 10)
 
+    def __reduce__(self):
+        return ShootTask, (self.target,)
+
+
+TASK_CLASSES: dict[TaskType, type[Task]] = {
+    TaskType.MOVE: MoveTask,
+    TaskType.SHOOT: ShootTask,
+}
+
+
+class TaskPool:
+    """Interns the tasks of a board, so that each type and target always maps to the same task,
+    which is only created the first time it is needed.
+
+    :ivar _tasks (dict[tuple[TaskType, tuple[int, int]], Task]): The created tasks by their type and target.
+    """
+    __slots__ = ("_tasks",)
+
+    def __init__(self):
+        self._tasks: dict[tuple[TaskType, tuple[int, int]], Task] = {}
+
+    def get(self, task_type: TaskType, target: tuple[int, int]) -> Task:
+        """Gets the task of a type and target.
+
+        :param task_type: The type of the task.
+        :param target: The target of the task.
+        :return: The interned task.
+        """
+        key = (task_type, target)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = TASK_CLASSES[task_type](target)
+        return task
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
 
 class TaskResult:
     """The result of a task.
@@ -44,6 +107,8 @@ class TaskResult:
     :ivar wumpus (bool): Whether the agent is on a wumpus after the task.
     :ivar wumpus_died (tuple[int, int] | None): The position of a wumpus that died as a result of the task.
     """
+    __slots__ = ("breeze", "stench", "gold", "pit", "wumpus", "wumpus_died")
+
     def __init__(self, breeze=False, stench=False, gold=False, pit=False, wumpus=False, wumpus_died=None):
         self.breeze: bool = breeze
         self.stench: bool = stench
@@ -0,0 +1,288 @@
+from agent.core import Agent
+from game.engine import Engine
+from util.config import Config
+
+from collections.abc import Callable
+from dataclasses import replace
+from datetime import datetime
+import copy
+import gc
+import json
+import math
+import platform
+import random
+import statistics
+import time
+
+GRID_SIZES = [20, 50, 100, 250, 500]
+AGENT_COUNTS = [1, 4, 16, 64]
+
+# the scaling run times how a game step grows with the amount of agents on a large board
+SCALING_GRID_SIZES = [100]
+SCALING_AGENT_COUNTS = [4, 16, 64, 256]
+SCALING_BENCHMARKS = ["create_bids", "game_step"]
+
+# the share of the cells that contain a pit or wumpus, as on the default 20 x 20 board
+PIT_DENSITY = 20 / 400
+WUMPUS_DENSITY = 3 / 400
+
+# fast calls are timed several times in a row, until the timing takes at least this long
+MIN_TIMING = 0.02
+MAX_NUMBER = 50
+
+
+def create_config(grid_size: int, base: Config | None = None) -> Config:
+    """Creates the configuration of a benchmark board, with as many elements per cell as on the default board.
+
+    :param grid_size: The amount of cells on the x- and y-axis.
+    :param base: The configuration the grid size is applied to.
+    :return: The configuration of the benchmark board.
+    """
+    return replace(
+        base or Config(),
+        grid_size=grid_size,
+        num_pits=round(grid_size * grid_size * PIT_DENSITY),
+        num_wumpus=max(1, round(grid_size * grid_size * WUMPUS_DENSITY)),
+        statistics_enabled=False,
+        record_episodes=False,
+    )
+
+
+def create_engine(config: Config, num_agents: int, seed: int, warmup: int) -> Engine:
+    """Creates an engine with a seeded board, that already played some game steps,
+    so that the agents have gathered some beliefs.
+
+    :param config: The configuration of the engine.
+    :param num_agents: The amount of agents.
+    :param seed: The seed of the board.
+    :param warmup: The amount of game steps that are played, unless the game cycle ends before.
+    :return: The engine, right after the last played game step.
+    """
+    engine = Engine(replace(config, num_agents=num_agents))
+
+    random.seed(seed)
+    engine._setup_game()
+    for _ in range(warmup):
+        if not engine._running:
+            break
+        engine._game_step()
+    return engine
+
+
+def _first_living_agent(engine: Engine) -> Agent:
+    """Helper function to get the first living agent, or the first agent if all of them died during the warmup."""
+    return next((agent for agent in engine._agents if not agent.dead), engine._agents[0])
+
+
+def _bench_setup_board(engine: Engine) -> Callable[[], object]:
+    """Sets up a new board."""
+    engine._board.reset()
+    for agent in engine._agents:
+        agent.reset()
+    return lambda: engine._board.setup_board(engine._agents)
+
+
+def _bench_create_dijkstra_paths(engine: Engine) -> Callable[[], object]:
+    """Searches the paths of the first living agent."""
+    agent = _first_living_agent(engine)
+    beliefs = engine._agent_manager.shared_beliefs
+    return lambda: agent.create_dijkstra_paths(beliefs, risky=engine._config.risky)
+
+
+def _bench_create_risk_costs(engine: Engine) -> Callable[[], object]:
+    """Estimates the probabilities of the potential dangers and their step costs, with an empty cache."""
+    manager = engine._agent_manager
+    manager._risk_map.reset()
+    return lambda: manager._risk_map.get_step_costs(len(manager.shared_visited))
+
+
+def _bench_create_bfs_paths(engine: Engine) -> Callable[[], object]:
+    """Searches the paths of the first living agent with a breadth first search."""
+    agent = _first_living_agent(engine)
+    return lambda: agent.create_bfs_paths(engine._agent_manager.shared_beliefs)
+
+
+def _bench_update_beliefs(engine: Engine) -> Callable[[], object]:
+    """Updates the beliefs with the results of the tasks of one game step."""
+    manager = engine._agent_manager
+    awarded_tasks = manager.award_tasks(manager.create_bids(manager.create_tasks(engine._board)))
+    results = [
+        (agent, engine._board.execute_task(
+            agent, awarded_tasks[agent.agent_id], manager.awarded_paths[agent.agent_id]
+        ))
+        for agent in engine._agents if agent.agent_id in awarded_tasks
+    ]
+
+    def update_beliefs() -> None:
+        for agent, result in results:
+            manager.update_beliefs(agent, result)
+
+    return update_beliefs
+
+
+def _bench_create_tasks(engine: Engine) -> Callable[[], object]:
+    """Creates the tasks, after the beliefs changed in the last game step."""
+    return lambda: engine._agent_manager.create_tasks(engine._board)
+
+
+def _bench_create_bids(engine: Engine) -> Callable[[], object]:
+    """Lets all living agents bid for the tasks."""
+    tasks = engine._agent_manager.create_tasks(engine._board)
+    return lambda: engine._agent_manager.create_bids(tasks)
+
+
+def _bench_award_tasks(engine: Engine) -> Callable[[], object]:
+    """Gives out the tasks for the bids of all living agents."""
+    manager = engine._agent_manager
+    bids = manager.create_bids(manager.create_tasks(engine._board))
+    return lambda: manager.award_tasks(bids)
+
+
+def _bench_game_step(engine: Engine) -> Callable[[], object]:
+    """Plays a whole game step."""
+    return engine._game_step
+
+
+# each benchmark prepares a copy of the engine, without being timed, and returns the call that is timed
+BENCHMARKS: dict[str, Callable[[Engine], Callable[[], object]]] = {
+    "setup_board": _bench_setup_board,
+    "create_dijkstra_paths": _bench_create_dijkstra_paths,
+    "create_bfs_paths": _bench_create_bfs_paths,
+    "create_risk_costs": _bench_create_risk_costs,
+    "update_beliefs": _bench_update_beliefs,
+    "create_tasks": _bench_create_tasks,
+    "create_bids": _bench_create_bids,
+    "award_tasks": _bench_award_tasks,
+    "game_step": _bench_game_step,
+}
+
+
+def _time_calls(engine: Engine, benchmark: Callable[[Engine], Callable[[], object]], seed: int, number: int) \
+        -> float:
+    """Helper function to time a benchmark, where each call has its own copy of the engine.
+
+    :param engine: The engine, that is copied before it is prepared.
+    :param benchmark: The benchmark.
+    :param seed: The seed of the random generator, before the timed calls.
+    :param number: The amount of calls that are timed in a row.
+    :return: The average time of a call in seconds.
+    """
+    calls = [benchmark(copy.deepcopy(engine)) for _ in range(number)]
+    random.seed(seed)
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for call in calls:
+            call()
+        return (time.perf_counter() - start) / number
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def run_benchmarks(grid_sizes: list[int] = GRID_SIZES, agent_counts: list[int] = AGENT_COUNTS,
+                   names: list[str] | None = None, repeat: int = 7, warmup: int = 10, seed: int = 0,
+                   base: Config | None = None) -> dict:
+    """Times the benchmarks for every combination of grid size and agent count, on seeded boards.
+
+    :param grid_sizes: The amounts of cells on the x- and y-axis.
+    :param agent_counts: The amounts of agents.
+    :param names: The names of the benchmarks, defaults to all of them.
+    :param repeat: How often each benchmark is timed.
+    :param warmup: The amount of game steps that are played, before the benchmarks are timed.
+    :param seed: The seed of the boards.
+    :param base: The configuration the benchmark boards are created from.
+    :return: The results, that can be saved as json.
+    """
+    base = base or Config()
+    names = names or list(BENCHMARKS)
+    results = []
+
+    for grid_size in grid_sizes:
+        config = create_config(grid_size, base)
+        for num_agents in agent_counts:
+            engine = create_engine(config, num_agents, seed, warmup)
+
+            for name in names:
+                first = _time_calls(engine, BENCHMARKS[name], seed, 1)
+                number = min(MAX_NUMBER, max(1, math.ceil(MIN_TIMING / max(first, 1e-9))))
+                times = [_time_calls(engine, BENCHMARKS[name], seed, number) for _ in range(repeat)]
+                results.append({
+                    "benchmark": name,
+                    "grid_size": grid_size,
+                    "agents": num_agents,
+                    "min": min(times),
+                    "median": statistics.median(times),
+                    "repeat": repeat,
+                    "number": number,
+                })
+                print(f'{name:<24}{grid_size:>6}{num_agents:>6}{statistics.median(times) * 1000:>12.3f} ms')
+
+    return {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "board_backend": base.board_backend,
+            "pathfinder": base.pathfinder,
+            "awarding": base.awarding,
+            "repeat": repeat,
+            "warmup": warmup,
+            "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def compare_results(baseline: dict, current: dict, threshold: float = 0.1) -> list[dict]:
+    """Compares the minimal times of two benchmark runs, that were made with the same benchmarks.
+    The minimum is compared, as it is the least disturbed by other processes.
+
+    :param baseline: The results the current results are compared to.
+    :param current: The current results.
+    :param threshold: The share, by which a benchmark can be slower than the baseline, before it is a regression.
+    :return: The comparison of each benchmark that is in both results, with the ratio of the current to the
+        baseline time and whether it is a regression.
+    """
+    def key(result: dict) -> tuple[str, int, int]:
+        return result["benchmark"], result["grid_size"], result["agents"]
+
+    baseline_results = {key(result): result for result in baseline["results"]}
+    comparison = []
+    for result in current["results"]:
+        if key(result) not in baseline_results:
+            continue
+
+        ratio = result["min"] / max(baseline_results[key(result)]["min"], 1e-12)
+        comparison.append({
+            "benchmark": result["benchmark"],
+            "grid_size": result["grid_size"],
+            "agents": result["agents"],
+            "baseline": baseline_results[key(result)]["min"],
+            "current": result["min"],
+            "ratio": ratio,
+            "regression": ratio > 1 + threshold,
+        })
+    return comparison
+
+
+def save_results(results: dict, path: str) -> None:
+    """Saves the results of a benchmark run as json.
+
+    :param results: The results of the benchmark run.
+    :param path: The path of the json file.
+    """
+    with open(path, 'w') as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> dict:
+    """Loads the results of a benchmark run from json.
+
+    :param path: The path of the json file.
+    :return: The results of the benchmark run.
+    """
+    with open(path) as f:
+        return json.load(f)
@@ -0,0 +1,93 @@
+from agent.core import Agent
+
+
+class AgentIndex:
+    """A spatial index of the living agents, as a grid from each occupied cell to the agents on it,
+    so that the agents on a cell are found without going through all the agents.
+    It is kept up to date by the board, whenever an agent is placed, moves or dies.
+
+    :ivar _cells (dict[tuple[int, int], list[int]]): The ids of the agents on each occupied cell, in the order
+        they entered it.
+    :ivar _positions (dict[int, tuple[int, int]]): The position of each living agent by its id, ordered by the id.
+    """
+    def __init__(self):
+        self._cells: dict[tuple[int, int], list[int]] = {}
+        self._positions: dict[int, tuple[int, int]] = {}
+
+    def clear(self) -> None:
+        """Removes all the agents."""
+        self._cells = {}
+        self._positions = {}
+
+    def rebuild(self, agents: list[Agent]) -> None:
+        """Replaces the index with the positions of the living agents.
+
+        :param agents: The agents.
+        """
+        self.clear()
+        for agent in sorted(agents, key=lambda agent: agent.agent_id):
+            if not agent.dead and agent.x is not None:
+                self._add(agent.agent_id, (agent.x, agent.y))
+
+    def update(self, agent: Agent) -> None:
+        """Moves an agent to its current position, or removes it, if it died.
+
+        :param agent: The agent that moved or died.
+        """
+        old_pos = self._positions.get(agent.agent_id)
+        new_pos = None if agent.dead or agent.x is None else (agent.x, agent.y)
+        if old_pos == new_pos:
+            return
+
+        if old_pos is not None:
+            ids = self._cells[old_pos]
+            ids.remove(agent.agent_id)
+            if not ids:
+                del self._cells[old_pos]
+
+        if new_pos is None:
+            self._positions.pop(agent.agent_id, None)
+        elif old_pos is None:
+            self._add(agent.agent_id, new_pos)
+            self._positions = dict(sorted(self._positions.items()))
+        else:
+            # the agent keeps its place in the positions, which stay ordered by the id
+            self._cells.setdefault(new_pos, []).append(agent.agent_id)
+            self._positions[agent.agent_id] = new_pos
+
+    def _add(self, agent_id: int, pos: tuple[int, int]) -> None:
+        """Helper method to add an agent on a cell.
+
+        :param agent_id: The id of the agent.
+        :param pos: The position of the cell.
+        """
+        self._cells.setdefault(pos, []).append(agent_id)
+        self._positions[agent_id] = pos
+
+    def get_agents_at(self, pos: tuple[int, int]) -> list[int]:
+        """Gets the agents on a cell.
+
+        :param pos: The position of the cell.
+        :return: The ids of the agents on the cell, in the order they entered it.
+        """
+        return self._cells.get(pos, [])
+
+    def get_cells(self) -> dict[tuple[int, int], int]:
+        """Gets the occupied cells, with the agent of the lowest id on each of them.
+
+        :return: The id of an agent on each occupied cell.
+        """
+        return {pos: min(ids) for pos, ids in self._cells.items()}
+
+    def get_positions(self) -> dict[int, tuple[int, int]]:
+        """Gets the positions of the living agents.
+
+        :return: The position of each living agent by its id, ordered by the id.
+        """
+        return self._positions
+
+    def __contains__(self, pos: tuple[int, int]) -> bool:
+        return pos in self._cells
+
+    def __len__(self) -> int:
+        return len(self._positions)
@@ -0,0 +1,208 @@
+from agent.core import Agent
+from agent.task import Task, TaskResult, TaskType
+from game.agent_index import AgentIndex
+from game.cell import Cell, PIT, WUMPUS, DEAD_WUMPUS, GOLD, BREEZE, STENCH
+from util.config import Config
+from util.helperFunc import is_in_bounds
+
+import numpy as np
+import random
+
+
+class ArrayBoard:
+    """The gameboard that stores the cells as bitfield planes in a NumPy array instead of Cell objects.
+    It is used like the Board and places the elements in the same way, so a seeded game cycle is the same on both.
+
+    :ivar _config (Config): The configuration of the simulation.
+    :ivar _planes (np.ndarray): A grid_size x grid_size array, that contains the bits of the elements
+        and perceptions of each cell, as they are defined in game.cell.
+    :ivar _positions (list[tuple[int, int]]): The positions of all the cells in the grid.
+    :ivar agent_index (AgentIndex): The positions of the living agents on the board.
+    """
+    def __init__(self, config: Config | None = None):
+        self._config: Config = config or Config()
+        self.agent_index: AgentIndex = AgentIndex()
+        size = self._config.grid_size
+        self._planes: np.ndarray = np.zeros((size, size), dtype=np.uint8)
+        self._positions: list[tuple[int, int]] = [(x, y) for x in range(size) for y in range(size)]
+
+    @property
+    def cells(self) -> list[Cell]:
+        """Creates Cell objects from the planes, for the code that draws the board.
+
+        :return: A list of all the cells in the grid.
+        """
+        cells = []
+        for (x, y), bits in zip(self._positions, self._planes.ravel().tolist()):
+            cell = Cell(x, y)
+            cell.set_bits(bits)
+            cells.append(cell)
+        return cells
+
+    def get_positions(self) -> list[tuple[int, int]]:
+        """Gets the positions of all the cells in the grid.
+
+        :return: The positions of the cells.
+        """
+        return self._positions
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """Gets the part of the board that is loaded, which is always the whole grid.
+
+        :return: The lowest x and y and the exclusive highest x and y.
+        """
+        return 0, 0, self._config.grid_size, self._config.grid_size
+
+    def get_planes(self) -> bytes:
+        """Gets the content of the board, as one byte per cell at the index `x * grid_size + y`.
+
+        :return: The bits of the elements and perceptions of each cell.
+        """
+        return self._planes.tobytes()
+
+    def get_region(self, bounds: tuple[int, int, int, int]) -> bytes:
+        """Gets the content of a part of the board, as one byte per cell at the index
+        `(x - x_min) * (y_max - y_min) + y - y_min`.
+
+        :param bounds: The lowest x and y and the exclusive highest x and y of the part.
+        :return: The bits of the elements and perceptions of each cell in the part.
+        """
+        x_min, y_min, x_max, y_max = bounds
+        return self._planes[x_min:x_max, y_min:y_max].tobytes()
+
+    def get_cell_bits(self, pos: tuple[int, int]) -> int:
+        """Gets the content of a cell as one byte.
+
+        :param pos: The position of the cell.
+        :return: The bits of the elements and perceptions in the cell.
+        """
+        return int(self._planes[pos])
+
+    def load_planes(self, planes: bytes) -> None:
+        """Sets the content of the board, from one byte per cell at the index `x * grid_size + y`.
+
+        :param planes: The bits of the elements and perceptions of each cell.
+        """
+        size = self._config.grid_size
+        self._planes = np.frombuffer(planes, dtype=np.uint8).reshape(size, size).copy()
+
+    def reset(self) -> None:
+        """Resets the board back to its initial state."""
+        self.agent_index.clear()
+        self._planes.fill(0)
+
+    def setup_board(self, agents: list[Agent]) -> None:
+        """Sets up the planes of the board.
+
+        :param agents: The agents that need to be placed on the board.
+        """
+        self._planes.fill(0)
+
+        self._populate_cells(agents)
+        self.agent_index.rebuild(agents)
+
+    def _populate_cells(self, agents: list[Agent]) -> None:
+        """Populates the planes with wumpus, pits, gold and the agents.
+
+        :param agents: The agents that need to be placed on the board.
+        """
+        self._place_element(self._config.num_wumpus, WUMPUS)
+        self._place_element(self._config.num_pits, PIT)
+        self._place_element(self._config.num_gold, GOLD)
+
+        self._planes |= self._perceive(PIT, BREEZE) | self._perceive(WUMPUS, STENCH)
+
+        agent_cells = random.sample(self._get_available_cells(), len(agents))
+        for index, cell in enumerate(agent_cells):
+            agents[index].x, agents[index].y = divmod(cell, self._config.grid_size)
+
+    def _place_element(self, num: int, bit: int) -> None:
+        """Places a certain number of elements on free spaces on the board.
+
+        :param num: The number of elements that should be placed.
+        :param bit: The bit of the element that should be placed.
+        """
+        cells = random.sample(self._get_available_cells(), num)
+        self._planes.ravel()[cells] |= bit
+
+    def _perceive(self, source_bit: int, perception_bit: int) -> np.ndarray:
+        """Creates the plane of a perception, by shifting the plane of its source to each neighbour.
+
+        :param source_bit: The bit of the element that causes the perception.
+        :param perception_bit: The bit of the perception.
+        :return: The plane that has the perception bit set, where a neighbour contains the element.
+        """
+        source = (self._planes & source_bit).astype(bool)
+        perception = np.zeros_like(source)
+        perception[1:, :] |= source[:-1, :]
+        perception[:-1, :] |= source[1:, :]
+        perception[:, 1:] |= source[:, :-1]
+        perception[:, :-1] |= source[:, 1:]
+        return perception.astype(np.uint8) * perception_bit
+
+    def _get_available_cells(self) -> list[int]:
+        """Gathers the free available cells of the board.
+
+        :return: The flat indices of the available cells.
+        """
+        return np.flatnonzero(self._planes.ravel() == 0).tolist()
+
+    def execute_task(self, agent: Agent, task: Task, path: list[tuple[int, int]]) -> TaskResult:
+        """Executes a task an agent was awarded with.
+
+        :param agent: The agent that was gives the task.
+        :param task: The task that needs to execute.
+        :param path: The path to complete the task, from the position of the agent.
+        :return: The result of the agent trying to complete that task.
+        """
+        if task.task_type == TaskType.MOVE or (task.task_type == TaskType.SHOOT and len(path) > 1):
+            next_target = path[1]
+
+            if not is_in_bounds(next_target, self._config.grid_size):
+                agent.dead = True
+                self.agent_index.update(agent)
+                return TaskResult()
+
+            agent.x, agent.y = next_target
+            bits = int(self._planes[agent.x, agent.y])
+
+            if bits & (PIT | WUMPUS):
+                agent.dead = True
+
+            self.agent_index.update(agent)
+            return TaskResult(
+                gold=bool(bits & GOLD),
+                breeze=bool(bits & BREEZE),
+                stench=bool(bits & STENCH),
+                pit=bool(bits & PIT),
+                wumpus=bool(bits & WUMPUS),
+            )
+
+        elif task.task_type == TaskType.SHOOT and len(path) == 1:
+            agent.has_arrow = False
+
+            tx, ty = task.target
+            dx, dy = (tx > agent.x) - (tx < agent.x), (ty > agent.y) - (ty < agent.y)
+
+            # the cells the arrow flies through, in the order they are passed
+            size = self._config.grid_size
+            if dx:
+                xs = np.arange(agent.x + dx, size if dx > 0 else -1, dx)
+                ys = np.full(len(xs), agent.y)
+            else:
+                ys = np.arange(agent.y + dy, size if dy > 0 else -1, dy)
+                xs = np.full(len(ys), agent.x)
+
+            wumpus_dead: tuple[int, int] | None = None
+
+            hits = np.flatnonzero(self._planes[xs, ys] & WUMPUS)
+            if len(hits):
+                wumpus_dead = (int(xs[hits[0]]), int(ys[hits[0]]))
+                self._planes[wumpus_dead] ^= WUMPUS | DEAD_WUMPUS
+
+            bits = int(self._planes[agent.x, agent.y])
+            return TaskResult(
+                breeze=bool(bits & BREEZE),
+                stench=bool(bits & STENCH),
+                wumpus_died=wumpus_dead,
+            )
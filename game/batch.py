@@ -0,0 +1,550 @@
+from agent.beliefs import WUMPUS, VISITED, DANGER, POTENTIAL_DANGER
+from agent.core import Agent
+from agent.manager import AgentManager
+from agent.pathfinding import SAFE_STEP_COST, RISKY_STEP_COST
+from agent.spread import BLOCK_SIZE, nearest_distances
+from agent.task import TaskResult
+from game import cell as bits
+from game.array_board import ArrayBoard
+from game.engine import STARTED
+from statistic.core import Statistics
+from statistic.stream import CycleStream
+from util.config import Config
+
+import numpy as np
+import os
+import random
+
+# the steps to the neighbours of a cell, in the same order as get_neighbours
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+# the cost of a cell that can not be reached, low enough that it can be shifted and added to without overflowing
+UNREACHED = 1 << 27
+# the rewards of a MoveTask and a ShootTask
+MOVE_REWARD = 1
+SHOOT_REWARD = 10
+
+
+def _slice(offset: int, size: int) -> slice:
+    """Helper function to get the part of an axis, that is still on the grid after moving it by an offset."""
+    return slice(max(offset, 0), size + min(offset, 0))
+
+
+def _sweep(packed: np.ndarray, step_costs: np.ndarray) -> None:
+    """Helper function to lower the costs of a stack of grids row by row along the x-axis, forwards and backwards.
+
+    :param packed: The costs of the cells, which are lowered in place.
+    :param step_costs: The cost of stepping onto each cell.
+    """
+    size = packed.shape[1]
+    for x in range(1, size):
+        np.minimum(packed[:, x], packed[:, x - 1] + step_costs[:, x], out=packed[:, x])
+    for x in range(size - 2, -1, -1):
+        np.minimum(packed[:, x], packed[:, x + 1] + step_costs[:, x], out=packed[:, x])
+
+
+def create_distance_fields(costs: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """Creates the cost of getting from the start to every cell for a stack of grids at once.
+    The grids are swept row by row in each of the four directions, lowering the cost of every cell to the cost
+    of the previous row plus its step cost, until a round of sweeps changes nothing. A sweep carries a path
+    along a whole line, so only about as many rounds as the paths have turns are needed.
+
+    :param costs: The cost of stepping onto each cell, UNREACHED if it can not be entered, of the shape (M, G, G).
+    :param starts: The x and y of the start of each grid, of the shape (M, 2).
+    :return: The cost of getting to each cell, UNREACHED if it can not be reached, of the shape (M, G, G).
+    """
+    step_costs = np.minimum(costs, UNREACHED).astype(np.int32)
+    distances = np.full(costs.shape, UNREACHED, dtype=np.int32)
+    distances[np.arange(len(starts)), starts[:, 0], starts[:, 1]] = 0
+
+    # the y-axis is swept on transposed copies, so that the rows stay contiguous
+    transposed_costs = step_costs.transpose(0, 2, 1).copy()
+    while True:
+        before = distances.copy()
+        _sweep(distances, step_costs)
+        transposed = distances.transpose(0, 2, 1).copy()
+        _sweep(transposed, transposed_costs)
+        distances = transposed.transpose(0, 2, 1).copy()
+        if np.array_equal(before, distances):
+            break
+
+    return np.minimum(distances, UNREACHED)
+
+
+def find_first_steps(distances: np.ndarray, starts: np.ndarray, goals: np.ndarray) -> np.ndarray:
+    """Follows the cheapest paths back from the goals to the starts, to find the first step of each of them.
+    The parent of a cell is its neighbour with the lowest cost and then the lowest position,
+    which is the parent that the Dijkstra searches choose, so the same paths are taken as in the Engine.
+
+    :param distances: The cost of getting to each cell of the grids, of the shape (M, G, G).
+    :param starts: The x and y of the start of each path, of the shape (N, 2).
+    :param goals: The index of the grid and the x and y of the goal of each path, which is not the start
+        and can be reached, of the shape (N, 3).
+    :return: The x and y of the first step of each path, of the shape (N, 2).
+    """
+    size = distances.shape[-1]
+    grids, x, y = goals.T.copy()
+    tracing = np.arange(len(goals))
+
+    while len(tracing):
+        parent_costs = np.full(len(tracing), UNREACHED + 1)
+        parent_x, parent_y = x[tracing].copy(), y[tracing].copy()
+        # the neighbours in the order of their position, so that the ties go to the lower one
+        for dx, dy in sorted(DIRECTIONS):
+            nx, ny = x[tracing] + dx, y[tracing] + dy
+            valid = (nx >= 0) & (nx < size) & (ny >= 0) & (ny < size)
+            cost = np.full(len(tracing), UNREACHED + 1)
+            cost[valid] = distances[grids[tracing[valid]], nx[valid], ny[valid]]
+            lower = cost < parent_costs
+            parent_costs[lower], parent_x[lower], parent_y[lower] = cost[lower], nx[lower], ny[lower]
+
+        # the paths whose parent is the start are at their first step
+        at_start = (parent_x == starts[tracing, 0]) & (parent_y == starts[tracing, 1])
+        moving = tracing[~at_start]
+        x[moving], y[moving] = parent_x[~at_start], parent_y[~at_start]
+        tracing = moving
+
+    return np.stack([x, y], axis=1)
+
+
+class BatchEngine:
+    """Plays many game cycles at once in lock-step, with the boards, beliefs and agents of all of them stacked
+    into arrays, so each game step is made for all game cycles with a few NumPy operations.
+    A finished game cycle is replaced by the next one in the same slot of the arrays.
+
+    The game cycles are set up in the same way as on the ArrayBoard, so a seed gives the same board and start
+    positions as in the Engine. The agents decide as in the Engine, so a seed is played the same in both:
+    The costs of the paths are found with a wavefront over all cells, and each path is followed back from its goal
+    with the same parents as in the Dijkstra searches. The tasks are awarded greedily, the ties going to the agent
+    with the lower id and then to the move task and the lower position, as in the AgentManager.
+
+    The beliefs of each game cycle are kept by its own AgentManager, so the dangers are deduced by the same
+    inference as in the Engine, and copied into the arrays after each game step.
+    The options the batch can not play, like another pathfinder or the optimal awarding, are rejected,
+    instead of playing the game cycles with another strategy.
+
+    :ivar _config (Config): The configuration of the simulation.
+    :ivar _batch_size (int): The amount of game cycles that are played at once.
+    :ivar _num_agents (int): The amount of agents per game cycle.
+    :ivar _setup_board (ArrayBoard): The board the game cycles are set up on, before they are copied into the arrays.
+    :ivar _setup_agents (list[Agent]): The agents that are placed on the setup board, which also pass the position
+        of an agent to the beliefs.
+    :ivar _managers (list[AgentManager]): The AgentManager of each game cycle, whose shared beliefs are updated
+        with the results of the tasks.
+    :ivar _statistic (Statistics): The statistics of the played game cycles.
+    :ivar _stream (CycleStream | None): The file the record of each game cycle is appended to, if they are saved.
+    :ivar _planes (np.ndarray): The bits of the cells of each board as in game.cell, of the shape (B, G, G).
+    :ivar _beliefs (np.ndarray): The flags of the beliefs of each game cycle as in agent.beliefs,
+        of the shape (B, G, G).
+    :ivar _positions (np.ndarray): The x and y of each agent, of the shape (B, A, 2).
+    :ivar _dead (np.ndarray): Whether each agent is dead, of the shape (B, A).
+    :ivar _arrows (np.ndarray): Whether each agent has an arrow, of the shape (B, A).
+    :ivar _steps (np.ndarray): The amount of game steps of each game cycle, of the shape (B,).
+    :ivar _seeds (np.ndarray): The seed of each game cycle, of the shape (B,).
+    :ivar _active (np.ndarray): Whether a game cycle is played in the slot, of the shape (B,).
+    """
+    def __init__(self, config: Config | None = None, batch_size: int | None = None):
+        self._config: Config = config or Config()
+        self._check_config()
+        self._batch_size: int = batch_size or self._config.batch_size or 1
+        self._setup_board: ArrayBoard = ArrayBoard(self._config)
+        self._num_agents: int = self._config.num_agents
+        self._setup_agents: list[Agent] = [
+            Agent(agent_id, self._config) for agent_id in range(1, self._num_agents + 1)
+        ]
+        self._statistic: Statistics = Statistics(self._config)
+        self._managers: list[AgentManager] = []
+
+        self._stream: CycleStream | None = None
+        if self._config.stream_format:
+            self._stream = CycleStream(
+                f'statistic/statistics/{STARTED}-{os.getpid()}-cycles.{self._config.stream_format}'
+            )
+
+        size = self._config.grid_size
+        batch = self._batch_size
+        self._planes: np.ndarray = np.zeros((batch, size, size), dtype=np.uint8)
+        self._beliefs: np.ndarray = np.zeros((batch, size, size), dtype=np.uint8)
+        self._positions: np.ndarray = np.zeros((batch, self._num_agents, 2), dtype=np.intp)
+        self._dead: np.ndarray = np.zeros((batch, self._num_agents), dtype=bool)
+        self._arrows: np.ndarray = np.ones((batch, self._num_agents), dtype=bool)
+        self._steps: np.ndarray = np.zeros(batch, dtype=np.int64)
+        self._seeds: np.ndarray = np.zeros(batch, dtype=np.int64)
+        self._active: np.ndarray = np.zeros(batch, dtype=bool)
+        self._managers = [AgentManager([], self._config) for _ in range(batch)]
+
+    def _check_config(self) -> None:
+        """Helper method to reject the options, that the game cycles can not be played with in lock-step.
+
+        :raises ValueError: If an option is not supported.
+        """
+        config = self._config
+        unsupported = []
+        if config.pathfinder != "buckets":
+            unsupported.append(f'pathfinder "{config.pathfinder}" (the paths are searched with a wavefront)')
+        if config.awarding != "greedy":
+            unsupported.append(f'awarding "{config.awarding}" (the tasks are awarded greedily)')
+        if config.board_backend not in ("cells", "numpy"):
+            unsupported.append(f'board backend "{config.board_backend}" (the whole board is stored)')
+        if config.record_episodes:
+            unsupported.append("record_episodes")
+        if config.profiling:
+            unsupported.append("profiling")
+        if config.capture_cycles:
+            unsupported.append("capture_cycles")
+
+        if unsupported:
+            raise ValueError(f'The batch engine does not support: {"; ".join(unsupported)}')
+
+    def play_cycles(self, seeds: list[int], stop_early: bool = False) -> Statistics:
+        """Plays one game cycle per seed, as many of them at once as fit into the batch.
+
+        :param seeds: The seeds of the game cycles that should be played.
+        :param stop_early: Whether the remaining seeds are skipped, once the statistics are precise enough.
+        :return: The statistics of the played game cycles.
+        """
+        pending = iter(seeds)
+        for slot, seed in zip(range(self._batch_size), pending):
+            self._setup_game(slot, seed)
+
+        while self._active.any():
+            finished, stuck, gold = self._game_step()
+
+            for slot in np.flatnonzero(finished).tolist():
+                self._update_statistic(slot, bool(stuck[slot]), bool(gold[slot]))
+                self._active[slot] = False
+
+                if stop_early and self._statistic.is_precise():
+                    continue
+                seed = next(pending, None)
+                if seed is not None:
+                    self._setup_game(slot, seed)
+
+        if self._stream:
+            self._stream.flush()
+        return self._statistic
+
+    def _setup_game(self, slot: int, seed: int) -> None:
+        """Sets up a game cycle in a slot of the arrays, by setting up the board and agents as in the Engine.
+
+        :param slot: The index of the game cycle in the arrays.
+        :param seed: The seed of the game cycle.
+        """
+        size = self._config.grid_size
+        random.seed(seed)
+        self._setup_board.setup_board(self._setup_agents)
+
+        self._planes[slot] = np.frombuffer(self._setup_board.get_planes(), dtype=np.uint8).reshape(size, size)
+        manager = self._managers[slot]
+        manager.reset()
+        for index, agent in enumerate(self._setup_agents):
+            self._positions[slot, index] = agent.x, agent.y
+            manager.update_beliefs(agent, TaskResult())
+        self._copy_beliefs(slot)
+        self._dead[slot] = False
+        self._arrows[slot] = True
+        self._steps[slot] = 0
+        self._seeds[slot] = seed
+        self._active[slot] = True
+
+    def _update_statistic(self, slot: int, stuck: bool, gold: bool) -> None:
+        """Adds the data of a finished game cycle to the statistics and appends its record to the file,
+        if the records are saved.
+
+        :param slot: The index of the game cycle in the arrays.
+        :param stuck: Whether the agents got stuck.
+        :param gold: Whether the gold was found.
+        """
+        if stuck:
+            self._statistic.increase_stuck_amount()
+        record = self._statistic.update(
+            int(self._steps[slot]),
+            int(self._dead[slot].sum()),
+            int(np.count_nonzero(self._beliefs[slot] & VISITED)),
+            gold
+        )
+
+        if self._stream:
+            self._stream.write({"seed": int(self._seeds[slot]), **record})
+
+    def _game_step(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """One game step of every game cycle that is played, following the same order as Engine._game_step.
+
+        :return: Whether each game cycle is finished, whether its agents got stuck and whether the gold was found.
+        """
+        size = self._config.grid_size
+        self._steps[self._active] += 1
+
+        # the searches and bids are only made for the living agents of the played game cycles
+        games, agents = np.nonzero(self._active[:, None] & ~self._dead)
+        searches = np.full((self._batch_size, self._num_agents), -1, dtype=np.intp)
+        searches[games, agents] = np.arange(len(games))
+
+        distances = create_distance_fields(self._create_costs()[games], self._positions[games, agents])
+        bids, goals = self._create_bids(games, agents, distances)
+        awarded = self._award_tasks(games, agents, bids)
+
+        stuck = self._active & (awarded < 0).all(axis=1)
+        gold = np.zeros(self._batch_size, dtype=bool)
+        playing = self._active & ~stuck
+
+        for agent in range(self._num_agents):
+            # an agent without a task is skipped, and no agent acts after the gold was found
+            slots = np.flatnonzero(playing & ~gold & (awarded[:, agent] >= 0))
+            if not len(slots):
+                continue
+
+            search = searches[slots, agent]
+            task = awarded[slots, agent]
+            shoot = task >= size * size
+            target_x, target_y = np.divmod(task % (size * size), size)
+            goal_x = np.where(shoot, goals[0][search, target_x, target_y], target_x)
+            goal_y = np.where(shoot, goals[1][search, target_x, target_y], target_y)
+
+            x, y = self._positions[slots, agent].T
+            fire = shoot & (goal_x == x) & (goal_y == y)
+
+            # the agents that do not shoot take the first step of the path to their goal
+            moving = ~fire
+            self._positions[slots[moving], agent] = find_first_steps(
+                distances, self._positions[slots[moving], agent],
+                np.stack([search[moving], goal_x[moving], goal_y[moving]], axis=1),
+            )
+
+            killed_x, killed_y = np.full(len(slots), -1), np.full(len(slots), -1)
+            if fire.any():
+                killed_x[fire], killed_y[fire] = self._shoot(slots[fire], agent, target_x[fire], target_y[fire])
+
+            x, y = self._positions[slots, agent].T
+            cell_bits = self._planes[slots, x, y]
+            pit = moving & (cell_bits & bits.PIT != 0)
+            wumpus = moving & (cell_bits & bits.WUMPUS != 0)
+            self._dead[slots, agent] |= pit | wumpus
+
+            # the game cycle ends before the beliefs are updated, when the gold was found
+            found = moving & (cell_bits & bits.GOLD != 0)
+            gold[slots[found]] = True
+            keep = ~found
+
+            self._update_beliefs(
+                slots[keep], agent, cell_bits[keep], pit[keep], wumpus[keep], killed_x[keep], killed_y[keep]
+            )
+
+        for slot in np.flatnonzero(playing).tolist():
+            self._copy_beliefs(slot)
+
+        return stuck | gold, stuck, gold
+
+    def _create_costs(self) -> np.ndarray:
+        """Creates the cost of stepping onto each cell, according to the beliefs, as in the Dijkstra searches.
+        With the "probability" risk model, the potential dangers get the step costs of the AgentManager
+        of their game cycle.
+
+        :return: The cost of each cell, UNREACHED if it can not be entered, of the shape (B, G, G).
+        """
+        flags = self._beliefs
+        risky_cost = RISKY_STEP_COST if self._config.risky else UNREACHED
+        costs = np.where(flags & POTENTIAL_DANGER, risky_cost, SAFE_STEP_COST)
+        costs = np.where(flags & DANGER, UNREACHED, costs).astype(np.int32)
+
+        for slot in np.flatnonzero(self._active).tolist():
+            risk_costs = self._managers[slot].get_risk_costs()
+            if risk_costs:
+                costs[slot].ravel()[list(risk_costs)] = list(risk_costs.values())
+        return costs
+
+    def _create_spread(self, games: np.ndarray, agents: np.ndarray) -> np.ndarray:
+        """Creates the distance of each cell to the nearest other living agent, as in SpreadDistances.
+        Only the nearest and second nearest agent of each cell are kept, and the distances are measured for blocks
+        of game cycles of at most BLOCK_SIZE distances, so no field per agent is held for the whole batch.
+
+        :param games: The slot of each living agent, in ascending order.
+        :param agents: The index of each living agent.
+        :return: The distances for each living agent, which are 0 if it is the only one, of the shape (M, G, G).
+        """
+        size = self._config.grid_size
+        metric = self._config.spread_metric
+        spread = np.zeros((len(games), size, size), dtype=np.int32)
+        if self._num_agents < 2:
+            return spread
+
+        # the nearest other agent is the second nearest, if the agent itself is the nearest
+        slots, firsts, counts = np.unique(games, return_index=True, return_counts=True)
+        block_slots = BLOCK_SIZE // (self._num_agents * size * size)
+        if metric == "path" or not block_slots:
+            # the game cycles are measured one after another, each of them in blocks of rows
+            for slot, first, count in zip(slots.tolist(), firsts.tolist(), counts.tolist()):
+                if count < 2:
+                    continue
+                living = agents[first:first + count]
+                positions = {agent: tuple(self._positions[slot, agent].tolist()) for agent in living.tolist()}
+                nearest_ids, nearest, second_nearest = nearest_distances(
+                    positions, self._managers[slot].shared_beliefs, metric
+                )
+                own = nearest_ids[None, :, :] == living[:, None, None]
+                spread[first:first + count] = np.where(own, second_nearest[None, :, :], nearest[None, :, :])
+            return spread
+
+        alive = self._active[:, None] & ~self._dead
+        cells = np.arange(size, dtype=np.int32)
+        for start in range(0, self._batch_size, block_slots):
+            stop = min(self._batch_size, start + block_slots)
+            dx = np.abs(cells[None, None, :] - self._positions[start:stop, :, 0, None]).astype(np.int32)
+            dy = np.abs(cells[None, None, :] - self._positions[start:stop, :, 1, None]).astype(np.int32)
+            if metric == "chebyshev":
+                fields = np.maximum(dx[:, :, :, None], dy[:, :, None, :])
+            else:
+                fields = dx[:, :, :, None] + dy[:, :, None, :]
+            fields[~alive[start:stop]] = UNREACHED
+
+            nearest_index = fields.argmin(axis=1)
+            nearest, second_nearest = np.partition(fields, 1, axis=1)[:, :2].transpose(1, 0, 2, 3)
+            block = (games >= start) & (games < stop)
+            own = nearest_index[games[block] - start] == agents[block, None, None]
+            spread[block] = np.where(own, second_nearest[games[block] - start], nearest[games[block] - start])
+
+        spread[np.repeat(counts < 2, counts)] = 0
+        return spread
+
+    def _create_bids(self, games: np.ndarray, agents: np.ndarray, distances: np.ndarray) \
+            -> tuple[np.ndarray, tuple[np.ndarray, np.ndarray]]:
+        """Lets each living agent bid for the move task of every unvisited safe cell
+        and the shoot task of every known wumpus.
+
+        :param games: The slot of each living agent.
+        :param agents: The index of each living agent.
+        :param distances: The cost of getting to each cell for each living agent.
+        :return: The bids of each living agent, with the move tasks followed by the shoot tasks per cell,
+            -inf where it does not bid, of the shape (M, 2 * G * G), and the x and y of the cell to reach
+            for each shoot task, of the shape (M, G, G).
+        """
+        size = self._config.grid_size
+        flags = self._beliefs[games]
+        if self._config.manhatten_bonus:
+            spread = self._create_spread(games, agents) / 100
+        else:
+            spread = np.zeros(distances.shape)
+
+        cells = size * size
+        bids = np.full((len(games), 2 * cells), -np.inf)
+        open_cells = (flags & (VISITED | DANGER)) == 0
+        reached = distances < UNREACHED
+        bids[:, :cells] = np.where(open_cells & reached, MOVE_REWARD - distances + spread, -np.inf).reshape(-1, cells)
+
+        # only the agents with an arrow, that know of a wumpus, bid for shoot tasks
+        goal_x = np.zeros(distances.shape, dtype=np.intp)
+        goal_y = np.zeros(distances.shape, dtype=np.intp)
+        shooting = np.flatnonzero((flags & WUMPUS).any(axis=(1, 2)) & self._arrows[games, agents])
+        if not self._config.shoot or not len(shooting):
+            return bids, (goal_x, goal_y)
+
+        # the cheapest cell of each column and row, of which the cheaper one is the goal of a shoot task,
+        # with the ties going to the lower position as in AlignedCellIndex
+        shooting_distances = distances[shooting]
+        column_costs = shooting_distances.min(axis=2)[:, :, None]
+        column_y = shooting_distances.argmin(axis=2)[:, :, None]
+        row_costs = shooting_distances.min(axis=1)[:, None, :]
+        row_x = shooting_distances.argmin(axis=1)[:, None, :]
+        target_x, target_y = np.arange(size)[None, :, None], np.arange(size)[None, None, :]
+        use_column = (column_costs < row_costs) | (
+            (column_costs == row_costs) & ((target_x < row_x) | ((target_x == row_x) & (column_y < target_y)))
+        )
+        costs = np.where(use_column, column_costs, row_costs)
+        goal_x[shooting] = np.where(use_column, target_x, row_x)
+        goal_y[shooting] = np.where(use_column, column_y, target_y)
+
+        goal_spread = spread[shooting[:, None, None], goal_x[shooting], goal_y[shooting]]
+        can_shoot = (flags[shooting] & WUMPUS != 0) & (costs < UNREACHED)
+        bids[shooting, cells:] = np.where(can_shoot, SHOOT_REWARD - costs + goal_spread, -np.inf).reshape(-1, cells)
+        return bids, (goal_x, goal_y)
+
+    def _award_tasks(self, games: np.ndarray, agents: np.ndarray, bids: np.ndarray) -> np.ndarray:
+        """Gives out one task to each agent greedily, by awarding the highest bid of each game cycle
+        and removing the bids of that agent and task, until no bid is left.
+
+        :param games: The slot of each living agent.
+        :param agents: The index of each living agent.
+        :param bids: The bids of each living agent.
+        :return: The index of the task that was awarded to each agent, -1 if it got none, of the shape (B, A).
+        """
+        tasks = bids.shape[1]
+        table = np.full((self._batch_size, self._num_agents, tasks), -np.inf)
+        table[games, agents] = bids
+        awarded = np.full((self._batch_size, self._num_agents), -1, dtype=np.intp)
+
+        for _ in range(self._num_agents):
+            flat = table.reshape(self._batch_size, -1)
+            best = flat.argmax(axis=1)
+            slots = np.flatnonzero(flat[np.arange(self._batch_size), best] > -np.inf)
+            if not len(slots):
+                break
+
+            agent, task = np.divmod(best[slots], tasks)
+            awarded[slots, agent] = task
+            table[slots, agent, :] = -np.inf
+            table[slots, :, task] = -np.inf
+
+        return awarded
+
+    def _shoot(self, slots: np.ndarray, agent: int, target_x: np.ndarray, target_y: np.ndarray) \
+            -> tuple[np.ndarray, np.ndarray]:
+        """Lets an agent shoot towards its target, where the arrow kills the first wumpus in its way.
+
+        :param slots: The game cycles, in which the agent shoots.
+        :param agent: The index of the agent.
+        :param target_x: The x of the target in each game cycle.
+        :param target_y: The y of the target in each game cycle.
+        :return: The x and y of the killed wumpus in each game cycle, -1 if none was hit.
+        """
+        size = self._config.grid_size
+        self._arrows[slots, agent] = False
+
+        x, y = self._positions[slots, agent].T
+        distance = np.arange(1, size + 1)[None, :]
+        path_x = x[:, None] + np.sign(target_x - x)[:, None] * distance
+        path_y = y[:, None] + np.sign(target_y - y)[:, None] * distance
+        on_board = (path_x >= 0) & (path_x < size) & (path_y >= 0) & (path_y < size)
+
+        cell_bits = self._planes[slots[:, None], path_x.clip(0, size - 1), path_y.clip(0, size - 1)]
+        hits = on_board & (cell_bits & bits.WUMPUS != 0)
+        hit = hits.any(axis=1)
+        first_hit = hits.argmax(axis=1)
+
+        rows = np.arange(len(slots))
+        killed_x = np.where(hit, path_x[rows, first_hit], -1)
+        killed_y = np.where(hit, path_y[rows, first_hit], -1)
+        self._planes[slots[hit], killed_x[hit], killed_y[hit]] ^= bits.WUMPUS | bits.DEAD_WUMPUS
+        return killed_x, killed_y
+
+    def _update_beliefs(self, slots: np.ndarray, agent: int, cell_bits: np.ndarray, pit: np.ndarray,
+                        wumpus: np.ndarray, killed_x: np.ndarray, killed_y: np.ndarray) -> None:
+        """Updates the beliefs with the result of the task of one agent per game cycle,
+        with AgentManager.update_beliefs.
+
+        :param slots: The game cycles, in which the agent did a task.
+        :param agent: The index of the agent.
+        :param cell_bits: The bits of the cell of the agent after the task.
+        :param pit: Whether the agent is on a pit.
+        :param wumpus: Whether the agent is on a wumpus.
+        :param killed_x: The x of a wumpus that died as a result of the task, -1 if none died.
+        :param killed_y: The y of a wumpus that died as a result of the task, -1 if none died.
+        """
+        carrier = self._setup_agents[agent]
+        for index, slot in enumerate(slots.tolist()):
+            carrier.x, carrier.y = self._positions[slot, agent].tolist()
+            result = TaskResult(
+                breeze=bool(cell_bits[index] & bits.BREEZE),
+                stench=bool(cell_bits[index] & bits.STENCH),
+                pit=bool(pit[index]),
+                wumpus=bool(wumpus[index]),
+                wumpus_died=(int(killed_x[index]), int(killed_y[index])) if killed_x[index] >= 0 else None,
+            )
+            self._managers[slot].update_beliefs(carrier, result)
+
+    def _copy_beliefs(self, slot: int) -> None:
+        """Helper method to copy the shared beliefs of a game cycle into the arrays.
+
+        :param slot: The index of the game cycle in the arrays.
+        """
+        size = self._config.grid_size
+        flags = self._managers[slot].shared_beliefs.flags
+        self._beliefs[slot] = np.frombuffer(flags, dtype=np.uint8).reshape(size, size)
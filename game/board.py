@@ -1,7 +1,8 @@
 from agent.core import Agent
 from agent.task import Task, TaskResult, TaskType
+from game.agent_index import AgentIndex
 from game.cell import Cell
-from util.config import GRID_SIZE, NUM_WUMPUS, NUM_PITS, NUM_GOLD
+from util.config import Config
 from util.helperFunc import is_in_bounds, get_neighbours
 
 import random
@@ -11,15 +12,73 @@ from typing import Callable
 class Board:
     """The gameboard that contains all the cells.
 
+    :ivar _config (Config): The configuration of the simulation.
     :ivar _grid (list[list[Cell]]): A grid layout of the gameboard.
     :ivar cells (list[Cell]): A list of all the cells in the grid.
+    :ivar agent_index (AgentIndex): The positions of the living agents on the board.
     """
-    def __init__(self):
+    def __init__(self, config: Config | None = None):
+        self._config: Config = config or Config()
+        self.agent_index: AgentIndex = AgentIndex()
         self._grid: list[list[Cell]] = []
         self.cells: list[Cell] = []
 
+    def get_positions(self) -> list[tuple[int, int]]:
+        """Gets the positions of all the cells in the grid.
+
+        :return: The positions of the cells.
+        """
+        return [(cell.x, cell.y) for cell in self.cells]
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """Gets the part of the board that is loaded, which is always the whole grid.
+
+        :return: The lowest x and y and the exclusive highest x and y.
+        """
+        return 0, 0, self._config.grid_size, self._config.grid_size
+
+    def get_planes(self) -> bytes:
+        """Gets the content of the board, as one byte per cell at the index `x * grid_size + y`.
+
+        :return: The bits of the elements and perceptions of each cell.
+        """
+        return bytes(cell.get_bits() for cell in self.cells)
+
+    def get_region(self, bounds: tuple[int, int, int, int]) -> bytes:
+        """Gets the content of a part of the board, as one byte per cell at the index
+        `(x - x_min) * (y_max - y_min) + y - y_min`.
+
+        :param bounds: The lowest x and y and the exclusive highest x and y of the part.
+        :return: The bits of the elements and perceptions of each cell in the part.
+        """
+        x_min, y_min, x_max, y_max = bounds
+        return bytes(self._grid[x][y].get_bits() for x in range(x_min, x_max) for y in range(y_min, y_max))
+
+    def get_cell_bits(self, pos: tuple[int, int]) -> int:
+        """Gets the content of a cell as one byte.
+
+        :param pos: The position of the cell.
+        :return: The bits of the elements and perceptions in the cell.
+        """
+        return self._grid[pos[0]][pos[1]].get_bits()
+
+    def load_planes(self, planes: bytes) -> None:
+        """Sets the content of the board, from one byte per cell at the index `x * grid_size + y`.
+
+        :param planes: The bits of the elements and perceptions of each cell.
+        """
+        self._grid = [
+            [Cell(i, j) for j in range(self._config.grid_size)]
+            for i in range(self._config.grid_size)
+        ]
+        self.cells = self._get_flattened_grid()
+
+        for cell, bits in zip(self.cells, planes):
+            cell.set_bits(bits)
+
     def reset(self) -> None:
         """Resets the board back to its initial state."""
+        self.agent_index.clear()
         self._grid = []
         self.cells = []
 
@@ -29,24 +88,25 @@ class Board:
         :param agents: The agents that need to be placed on the board.
         """
         self._grid = [
-            [Cell(i, j) for j in range(GRID_SIZE)]
-            for i in range(GRID_SIZE)
+            [Cell(i, j) for j in range(self._config.grid_size)]
+            for i in range(self._config.grid_size)
         ]
         self.cells = self._get_flattened_grid()
 
         self._populate_cells(agents)
+        self.agent_index.rebuild(agents)
 
     def _populate_cells(self, agents: list[Agent]) -> None:
         """Populates the cells on the board with wumpus, pits, gold and the agents.
 
         :param agents: The agents that need to be placed on the board.
         """
-        self._place_element(NUM_WUMPUS, self._place_wumpus)
-        self._place_element(NUM_PITS, self._place_pit)
-        self._place_element(NUM_GOLD, self._place_gold)
+        self._place_element(self._config.num_wumpus, self._place_wumpus)
+        self._place_element(self._config.num_pits, self._place_pit)
+        self._place_element(self._config.num_gold, self._place_gold)
 
         for cell in self.cells:
-            neighbours = get_neighbours(cell.x, cell.y)
+            neighbours = get_neighbours(cell.x, cell.y, self._config.grid_size)
             cell.hasStench = any(self._grid[nx][ny].hasWumpus for nx, ny in neighbours)
             cell.hasBreeze = any(self._grid[nx][ny].hasPit for nx, ny in neighbours)
 
@@ -110,18 +170,20 @@ class Board:
         """
         return [cell for row in self._grid for cell in row]
 
-    def execute_task(self, agent: Agent, task: Task) -> TaskResult:
+    def execute_task(self, agent: Agent, task: Task, path: list[tuple[int, int]]) -> TaskResult:
         """Executes a task an agent was awarded with.
 
         :param agent: The agent that was gives the task.
         :param task: The task that needs to execute.
+        :param path: The path to complete the task, from the position of the agent.
         :return: The result of the agent trying to complete that task.
         """
-        if task.task_type == TaskType.MOVE or (task.task_type == TaskType.SHOOT and len(task.path) > 1):
-            next_target = task.path[1]
+        if task.task_type == TaskType.MOVE or (task.task_type == TaskType.SHOOT and len(path) > 1):
+            next_target = path[1]
 
-            if not is_in_bounds(next_target):
+            if not is_in_bounds(next_target, self._config.grid_size):
                 agent.dead = True
+                self.agent_index.update(agent)
                 return TaskResult()
 
             agent.x, agent.y = next_target
@@ -130,6 +192,7 @@ class Board:
             if cell.hasPit or cell.hasWumpus:
                 agent.dead = True
 
+            self.agent_index.update(agent)
             return TaskResult(
                 gold=cell.hasGold,
                 breeze=cell.hasBreeze,
@@ -138,7 +201,7 @@ class Board:
                 wumpus=cell.hasWumpus,
             )
 
-        elif task.task_type == TaskType.SHOOT and len(task.path) == 1:
+        elif task.task_type == TaskType.SHOOT and len(path) == 1:
             agent.has_arrow = False
 
             tx, ty = task.target
@@ -151,7 +214,7 @@ class Board:
                 cur_x += dx
                 cur_y += dy
 
-                if not is_in_bounds((cur_x, cur_y)):
+                if not is_in_bounds((cur_x, cur_y), self._config.grid_size):
                     break
 
                 cur_cell = self._grid[cur_x][cur_y]
@@ -1,3 +1,12 @@
+# bits of a cell, when the cell is stored as one byte
+PIT = 1
+WUMPUS = 2
+DEAD_WUMPUS = 4
+GOLD = 8
+BREEZE = 16
+STENCH = 32
+
+
 class Cell:
     """Represents a cell in the gameboard grid and contains the information of what is inside.
 
@@ -22,3 +31,29 @@ class Cell:
         self.hasBreeze: bool = False
 
         self.hasGold: bool = False
+
+    def get_bits(self) -> int:
+        """Gets the content of the cell as one byte.
+
+        :return: The bits of the elements and perceptions in the cell.
+        """
+        return (
+            PIT * self.hasPit
+            | WUMPUS * self.hasWumpus
+            | DEAD_WUMPUS * self.hasDeadWumpus
+            | GOLD * self.hasGold
+            | BREEZE * self.hasBreeze
+            | STENCH * self.hasStench
+        )
+
+    def set_bits(self, bits: int) -> None:
+        """Sets the content of the cell from one byte.
+
+        :param bits: The bits of the elements and perceptions in the cell.
+        """
+        self.hasPit = bool(bits & PIT)
+        self.hasWumpus = bool(bits & WUMPUS)
+        self.hasDeadWumpus = bool(bits & DEAD_WUMPUS)
+        self.hasGold = bool(bits & GOLD)
+        self.hasBreeze = bool(bits & BREEZE)
+        self.hasStench = bool(bits & STENCH)
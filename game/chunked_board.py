@@ -0,0 +1,357 @@
+from agent.core import Agent
+from agent.task import Task, TaskResult, TaskType
+from game.agent_index import AgentIndex
+from game.cell import PIT, WUMPUS, DEAD_WUMPUS, GOLD, BREEZE, STENCH
+from util.config import Config
+from util.helperFunc import is_in_bounds
+
+import numpy as np
+import random
+
+
+class ChunkedBoard:
+    """The gameboard for very large grids, which is split into square chunks that are only created,
+    once the agents come near them. It is used like the Board, but the part of the board that is loaded
+    is a rectangle of chunks around the agents, which grows as they move.
+
+    The elements of a chunk are drawn from its own seeded random generator, with as many pits and wumpus
+    per cell as the configuration has on the whole grid, so a chunk is the same no matter when it is created.
+    The perceptions of a chunk are added when it is loaded, from the elements of the chunk and its neighbours.
+
+    :ivar _config (Config): The configuration of the simulation.
+    :ivar _chunk_size (int): The amount of cells on the x- and y-axis of a chunk.
+    :ivar _num_chunks (int): The amount of chunks on the x- and y-axis of the grid.
+    :ivar _seed (int): The seed of the current game cycle, that the chunks are created from.
+    :ivar _gold (set[tuple[int, int]]): The positions of the gold.
+    :ivar _elements (dict[tuple[int, int], np.ndarray]): The bits of the elements of each created chunk.
+    :ivar _chunks (dict[tuple[int, int], np.ndarray]): The bits of the elements and perceptions of each loaded chunk.
+    :ivar _region (tuple[int, int, int, int] | None): The loaded chunks, as the lowest chunk x and y
+        and the exclusive highest chunk x and y.
+    :ivar agent_index (AgentIndex): The positions of the living agents on the board.
+    """
+    # the amount of chunks that are loaded around the chunk of an agent
+    MARGIN = 1
+
+    def __init__(self, config: Config | None = None):
+        self._config: Config = config or Config()
+        self._chunk_size: int = self._config.chunk_size
+        self._num_chunks: int = -(-self._config.grid_size // self._chunk_size)
+        self._seed: int = 0
+        self._gold: set[tuple[int, int]] = set()
+        self._elements: dict[tuple[int, int], np.ndarray] = {}
+        self._chunks: dict[tuple[int, int], np.ndarray] = {}
+        self._region: tuple[int, int, int, int] | None = None
+        self.agent_index: AgentIndex = AgentIndex()
+
+    def get_positions(self) -> list[tuple[int, int]]:
+        """Gets the positions of all the cells in the loaded part of the grid.
+
+        :return: The positions of the cells.
+        """
+        x_min, y_min, x_max, y_max = self.get_bounds()
+        return [(x, y) for x in range(x_min, x_max) for y in range(y_min, y_max)]
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """Gets the part of the board that is loaded.
+
+        :return: The lowest x and y and the exclusive highest x and y.
+        """
+        if self._region is None:
+            return 0, 0, 0, 0
+
+        size = self._config.grid_size
+        cx_min, cy_min, cx_max, cy_max = self._region
+        return (
+            cx_min * self._chunk_size,
+            cy_min * self._chunk_size,
+            min(cx_max * self._chunk_size, size),
+            min(cy_max * self._chunk_size, size),
+        )
+
+    def get_planes(self) -> bytes:
+        """Gets the content of the board, as one byte per cell at the index `x * grid_size + y`,
+        which is 0 for the cells that are not loaded.
+
+        :return: The bits of the elements and perceptions of each cell.
+        """
+        size = self._config.grid_size
+        return self.get_region((0, 0, size, size))
+
+    def get_region(self, bounds: tuple[int, int, int, int]) -> bytes:
+        """Gets the content of a part of the board, as one byte per cell at the index
+        `(x - x_min) * (y_max - y_min) + y - y_min`, which is 0 for the cells that are not loaded.
+
+        :param bounds: The lowest x and y and the exclusive highest x and y of the part.
+        :return: The bits of the elements and perceptions of each cell in the part.
+        """
+        x_min, y_min, x_max, y_max = bounds
+        region = np.zeros((x_max - x_min, y_max - y_min), dtype=np.uint8)
+        chunk_size = self._chunk_size
+
+        for (cx, cy), chunk in self._chunks.items():
+            x0, y0 = cx * chunk_size, cy * chunk_size
+            x1, y1 = x0 + chunk.shape[0], y0 + chunk.shape[1]
+            if x1 <= x_min or x0 >= x_max or y1 <= y_min or y0 >= y_max:
+                continue
+
+            ox, oy = max(x0, x_min), max(y0, y_min)
+            ex, ey = min(x1, x_max), min(y1, y_max)
+            region[ox - x_min:ex - x_min, oy - y_min:ey - y_min] = chunk[ox - x0:ex - x0, oy - y0:ey - y0]
+        return region.tobytes()
+
+    def get_cell_bits(self, pos: tuple[int, int]) -> int:
+        """Gets the content of a cell as one byte.
+
+        :param pos: The position of the cell.
+        :return: The bits of the elements and perceptions in the cell, or 0 if it is not loaded.
+        """
+        chunk = self._chunks.get((pos[0] // self._chunk_size, pos[1] // self._chunk_size))
+        if chunk is None:
+            return 0
+        return int(chunk[pos[0] % self._chunk_size, pos[1] % self._chunk_size])
+
+    def load_planes(self, planes: bytes) -> None:
+        """Sets the content of the board, from one byte per cell at the index `x * grid_size + y`,
+        where every chunk is loaded.
+
+        :param planes: The bits of the elements and perceptions of each cell.
+        """
+        size = self._config.grid_size
+        chunk_size = self._chunk_size
+        grid = np.frombuffer(planes, dtype=np.uint8).reshape(size, size)
+
+        self._elements = {}
+        self._chunks = {}
+        for cx in range(self._num_chunks):
+            for cy in range(self._num_chunks):
+                chunk = grid[cx * chunk_size:(cx + 1) * chunk_size, cy * chunk_size:(cy + 1) * chunk_size].copy()
+                self._chunks[cx, cy] = chunk
+                self._elements[cx, cy] = chunk & (PIT | WUMPUS | DEAD_WUMPUS | GOLD)
+        self._region = (0, 0, self._num_chunks, self._num_chunks)
+
+    def reset(self) -> None:
+        """Resets the board back to its initial state."""
+        self._gold = set()
+        self._elements = {}
+        self._chunks = {}
+        self._region = None
+        self.agent_index.clear()
+
+    def setup_board(self, agents: list[Agent]) -> None:
+        """Sets up the board, of which only the chunks around the agents are loaded.
+        The agents start together in a random part of the grid, so that they do not load the whole grid at once.
+
+        :param agents: The agents that need to be placed on the board.
+        """
+        self.reset()
+        size = self._config.grid_size
+        self._seed = random.getrandbits(64)
+
+        while len(self._gold) < min(self._config.num_gold, size * size):
+            self._gold.add((random.randrange(size), random.randrange(size)))
+
+        # the agents are placed on free cells of the chunks around a random chunk,
+        # which are widened until there are enough of them
+        center_x, center_y = random.randrange(self._num_chunks), random.randrange(self._num_chunks)
+        margin = self.MARGIN
+        while True:
+            x_min = max(0, (center_x - margin) * self._chunk_size)
+            y_min = max(0, (center_y - margin) * self._chunk_size)
+            x_max = min(size, (center_x + margin + 1) * self._chunk_size)
+            y_max = min(size, (center_y + margin + 1) * self._chunk_size)
+            free_cells = [
+                (x, y) for x in range(x_min, x_max) for y in range(y_min, y_max) if self._get_free((x, y))
+            ]
+
+            if len(free_cells) >= len(agents):
+                break
+            if x_max - x_min == size and y_max - y_min == size:
+                raise ValueError(f'There are only {len(free_cells)} free cells for {len(agents)} agents')
+            margin *= 2
+
+        for agent, pos in zip(agents, random.sample(free_cells, len(agents))):
+            agent.x, agent.y = pos
+
+        for agent in agents:
+            self._load_around(agent.x, agent.y)
+        self.agent_index.rebuild(agents)
+
+    def _get_free(self, pos: tuple[int, int]) -> bool:
+        """Helper method to check whether a cell has no elements and no perceptions, without loading it.
+
+        :param pos: The position of the cell.
+        :return: Whether the cell is free.
+        """
+        x, y = pos
+        if self._get_element(x, y):
+            return False
+        return not any(
+            self._get_element(nx, ny) & (PIT | WUMPUS)
+            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+            if is_in_bounds((nx, ny), self._config.grid_size)
+        )
+
+    def _get_element(self, x: int, y: int) -> int:
+        """Helper method to get the elements of a cell, which creates its chunk if needed.
+
+        :param x: The x position of the cell.
+        :param y: The y position of the cell.
+        :return: The bits of the elements in the cell.
+        """
+        elements = self._get_elements((x // self._chunk_size, y // self._chunk_size))
+        return int(elements[x % self._chunk_size, y % self._chunk_size])
+
+    def _get_elements(self, chunk: tuple[int, int]) -> np.ndarray:
+        """Helper method to get the elements of a chunk, which are created the first time they are needed.
+
+        :param chunk: The chunk x and y.
+        :return: The bits of the elements of the cells in the chunk.
+        """
+        elements = self._elements.get(chunk)
+        if elements is not None:
+            return elements
+
+        size = self._config.grid_size
+        cx, cy = chunk
+        x0, y0 = cx * self._chunk_size, cy * self._chunk_size
+        width, height = min(self._chunk_size, size - x0), min(self._chunk_size, size - y0)
+
+        wumpus_density = self._config.num_wumpus / (size * size)
+        pit_density = self._config.num_pits / (size * size)
+        draws = np.random.default_rng((self._seed, cx, cy)).random((width, height))
+
+        elements = np.zeros((width, height), dtype=np.uint8)
+        elements[draws < wumpus_density] = WUMPUS
+        elements[(draws >= wumpus_density) & (draws < wumpus_density + pit_density)] = PIT
+
+        for x, y in self._gold:
+            if x0 <= x < x0 + width and y0 <= y < y0 + height:
+                elements[x - x0, y - y0] = GOLD
+
+        self._elements[chunk] = elements
+        return elements
+
+    def _load_around(self, x: int, y: int) -> None:
+        """Helper method to grow the loaded rectangle of chunks, so that it contains the chunks around a cell.
+
+        :param x: The x position of the cell.
+        :param y: The y position of the cell.
+        """
+        cx, cy = x // self._chunk_size, y // self._chunk_size
+        cx_min, cy_min = max(0, cx - self.MARGIN), max(0, cy - self.MARGIN)
+        cx_max, cy_max = min(self._num_chunks, cx + self.MARGIN + 1), min(self._num_chunks, cy + self.MARGIN + 1)
+
+        if self._region is not None:
+            if (self._region[0] <= cx_min and self._region[1] <= cy_min
+                    and self._region[2] >= cx_max and self._region[3] >= cy_max):
+                return
+            cx_min, cy_min = min(cx_min, self._region[0]), min(cy_min, self._region[1])
+            cx_max, cy_max = max(cx_max, self._region[2]), max(cy_max, self._region[3])
+
+        self._region = (cx_min, cy_min, cx_max, cy_max)
+        for chunk_x in range(cx_min, cx_max):
+            for chunk_y in range(cy_min, cy_max):
+                if (chunk_x, chunk_y) not in self._chunks:
+                    self._load_chunk((chunk_x, chunk_y))
+
+    def _load_chunk(self, chunk: tuple[int, int]) -> None:
+        """Helper method to load a chunk, by adding the perceptions to its elements.
+        The perceptions at the edges come from the elements of the neighbouring chunks.
+
+        :param chunk: The chunk x and y.
+        """
+        cx, cy = chunk
+        elements = self._get_elements(chunk)
+        width, height = elements.shape
+
+        # the elements of the chunk with a border of one cell from the neighbouring chunks
+        padded = np.zeros((width + 2, height + 2), dtype=np.uint8)
+        padded[1:-1, 1:-1] = elements
+        if cx > 0:
+            padded[0, 1:-1] = self._get_elements((cx - 1, cy))[-1, :]
+        if cx + 1 < self._num_chunks:
+            padded[-1, 1:-1] = self._get_elements((cx + 1, cy))[0, :]
+        if cy > 0:
+            padded[1:-1, 0] = self._get_elements((cx, cy - 1))[:, -1]
+        if cy + 1 < self._num_chunks:
+            padded[1:-1, -1] = self._get_elements((cx, cy + 1))[:, 0]
+
+        neighbours = padded[:-2, 1:-1] | padded[2:, 1:-1] | padded[1:-1, :-2] | padded[1:-1, 2:]
+        bits = elements.copy()
+        bits[(neighbours & PIT) != 0] |= BREEZE
+        # a dead wumpus still smells, as on the other boards
+        bits[(neighbours & (WUMPUS | DEAD_WUMPUS)) != 0] |= STENCH
+        self._chunks[chunk] = bits
+
+    def _set_cell_bits(self, pos: tuple[int, int], bits: int) -> None:
+        """Helper method to change the elements of a cell, in its loaded chunk as well.
+
+        :param pos: The position of the cell.
+        :param bits: The bits that are toggled.
+        """
+        chunk = (pos[0] // self._chunk_size, pos[1] // self._chunk_size)
+        local = (pos[0] % self._chunk_size, pos[1] % self._chunk_size)
+        self._get_elements(chunk)[local] ^= bits
+        if chunk in self._chunks:
+            self._chunks[chunk][local] ^= bits
+
+    def execute_task(self, agent: Agent, task: Task, path: list[tuple[int, int]]) -> TaskResult:
+        """Executes a task an agent was awarded with.
+
+        :param agent: The agent that was gives the task.
+        :param task: The task that needs to execute.
+        :param path: The path to complete the task, from the position of the agent.
+        :return: The result of the agent trying to complete that task.
+        """
+        if task.task_type == TaskType.MOVE or (task.task_type == TaskType.SHOOT and len(path) > 1):
+            next_target = path[1]
+
+            if not is_in_bounds(next_target, self._config.grid_size):
+                agent.dead = True
+                self.agent_index.update(agent)
+                return TaskResult()
+
+            agent.x, agent.y = next_target
+            self._load_around(agent.x, agent.y)
+            bits = self.get_cell_bits(next_target)
+
+            if bits & (PIT | WUMPUS):
+                agent.dead = True
+
+            self.agent_index.update(agent)
+            return TaskResult(
+                gold=bool(bits & GOLD),
+                breeze=bool(bits & BREEZE),
+                stench=bool(bits & STENCH),
+                pit=bool(bits & PIT),
+                wumpus=bool(bits & WUMPUS),
+            )
+
+        elif task.task_type == TaskType.SHOOT and len(path) == 1:
+            agent.has_arrow = False
+
+            tx, ty = task.target
+            dx, dy = (tx > agent.x) - (tx < agent.x), (ty > agent.y) - (ty < agent.y)
+            cur_x, cur_y = agent.x, agent.y
+
+            wumpus_dead: tuple[int, int] | None = None
+
+            # the arrow flies until it hits a wumpus or the end of the grid, creating the chunks it passes
+            while True:
+                cur_x += dx
+                cur_y += dy
+
+                if not is_in_bounds((cur_x, cur_y), self._config.grid_size):
+                    break
+
+                if self._get_element(cur_x, cur_y) & WUMPUS:
+                    wumpus_dead = (cur_x, cur_y)
+                    self._set_cell_bits(wumpus_dead, WUMPUS | DEAD_WUMPUS)
+                    break
+
+            bits = self.get_cell_bits((agent.x, agent.y))
+            return TaskResult(
+                breeze=bool(bits & BREEZE),
+                stench=bool(bits & STENCH),
+                wumpus_died=wumpus_dead,
+            )
@@ -1,13 +1,14 @@
-from agent.core import Agent
-from agent.manager import AgentManager
-from agent.task import TaskResult
-from game.board import Board
-from statistic.core import Statistics
+from game.engine import Engine
+from game.renderer import BoardRenderer
+from game.viewport import Viewport
 from util.config import *
 from util.theme import *
 
 import pygame
 from enum import Enum
+import time
+
+FPS = 60
 
 
 class GameMode(Enum):
@@ -16,98 +17,60 @@ class GameMode(Enum):
     CONTINUOUS = 2
 
 
-class Game:
-    """Handles user input, game cycles and drawing of the game board.
+class Game(Engine):
+    """Handles user input and drawing of the game board, on top of the game cycles of the engine.
 
     :ivar _clock (pygame.time.Clock): The game clock.
     :ivar _screen: The game screen.
     :ivar _font (pygame.font.Font): The game font.
-    :ivar _running (bool): Whether the game is running.
-    :ivar _restart (bool): Whether the game should be restarted, after it stops running.
     :ivar _mode (GameMode): The current game mode.
     :ivar _step_requested (bool): Whether a game step was requested by the user.
     :ivar _step_interval (float): The intervall of time that needs to pass in continuous game mode
         for a game step to happen.
     :ivar _time_since_last_step (float): The amount of time that passed since the last game step.
-    :ivar _board (Board): The game board.
-    :ivar _agents (list[Agent]): The list of agents that play the game.
-    :ivar _agent_manager (AgentManager): The AgentManger for the agents.
+    :ivar _max_speed (bool): Whether continuous game mode makes as many game steps as fit into the frame budget.
+    :ivar _frame_budget (float): The time in seconds that the game steps of one frame can take,
+        so that the window stays responsive.
+    :ivar _counted_steps (int): The game steps made in continuous game mode, since the counter was last updated.
+    :ivar _counted_time (float): The time that passed, since the counter was last updated.
+    :ivar _steps_per_second (float): The game steps per second in continuous game mode.
+    :ivar _counter_rect (pygame.Rect | None): The part of the screen the counter was last drawn on.
     :ivar _clear_vision (bool): Whether the user sees the entire board or only what the agents see.
+    :ivar _viewport (Viewport): The part of the game board that is shown in the window.
+    :ivar _renderer (BoardRenderer): Draws the game board and keeps it between the frames.
     """
-    def __init__(self):
+    def __init__(self, config: Config | None = None):
+        super().__init__(config)
+
         pygame.init()
         self._clock: pygame.time.Clock = pygame.time.Clock()
-        self._screen = pygame.display.set_mode((WINDOW_SIZE, WINDOW_SIZE))
+        # boards that do not fit into the window are shown in a part, that can be moved and zoomed
+        window_size = min(self._config.grid_size * TILE_SIZE, WINDOW_SIZE)
+        self._screen = pygame.display.set_mode((window_size, window_size))
         self._font: pygame.font.Font = pygame.font.SysFont(None, 24)
 
-        self._running: bool = True
-        self._restart: bool = False
-
         self._mode: GameMode = GameMode.STEP
 
         self._step_requested: bool = False
         self._step_interval: float = 0.1
         self._time_since_last_step: float = 0
 
-        self._board: Board = Board()
-        self._agents: list[Agent] = [
-            Agent(1),
-            Agent(2),
-            Agent(3),
-            Agent(4),
-        ]
-        self._agent_manager: AgentManager = AgentManager(self._agents)
-
-        self._clear_vision: bool = False
-
-        self._statistic: Statistics = Statistics()
-        self._game_steps: int = 0
-
-    def start_game(self) -> None:
-        while True:
-            self._setup_game()
-            self._run()
+        self._max_speed: bool = False
+        self._frame_budget: float = 0.75 / FPS
 
-            self._statistic.update(
-                self._game_steps,
-                sum(agent.dead for agent in self._agents),
-                len(self._agent_manager.shared_visited)
-            )
-
-            if self._statistic.get_cycles() % 50 == 0 and STATISTICS_ENABLED:
-                print(self._statistic.get_cycles())
-
-            if not self._restart or self._statistic.get_cycles() >= MAX_CYCLES:
-                break
-
-            self._restart_game()
-
-        if STATISTICS_ENABLED:
-            self._statistic.create_file()
-
-    def _setup_game(self) -> None:
-        """Sets up the game."""
-        self._running = True
-        self._board.setup_board(self._agents)
+        self._counted_steps: int = 0
+        self._counted_time: float = 0
+        self._steps_per_second: float = 0
+        self._counter_rect: pygame.Rect | None = None
 
-        for agent in self._agents:
-            self._agent_manager.update_beliefs(agent, TaskResult())
-
-    def _restart_game(self) -> None:
-        """Reset the game state and start a new game."""
-        self._restart = False
-
-        self._game_steps = 0
-
-        self._board.reset()
-        self._agent_manager.reset()
-        for agent in self._agents:
-            agent.reset()
+        self._clear_vision: bool = False
+        self._viewport: Viewport = Viewport(self._config.grid_size, window_size, window_size, TILE_SIZE)
+        self._renderer: BoardRenderer = BoardRenderer(self._font)
 
     def _run(self) -> None:
         """Runs the game-loop."""
         while self._running:
-            dt = self._clock.tick(60) / 1000
+            dt = self._clock.tick(FPS) / 1000
             self._handle_events()
             self._update(dt)
             self._draw()
@@ -118,23 +81,61 @@ class Game:
             if event.type == pygame.QUIT:
                 self._running = False
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and self._mode == GameMode.STEP:
-                    self._step_requested = True
-                elif event.key == pygame.K_PLUS and self._mode == GameMode.CONTINUOUS:
-                    self._step_interval /= 2
-                elif event.key == pygame.K_MINUS and self._mode == GameMode.CONTINUOUS:
-                    self._step_interval *= 2
-                elif event.key == pygame.K_RETURN:
-                    if self._mode == GameMode.STEP:
-                        self._mode = GameMode.CONTINUOUS
-                    else:
-                        self._mode = GameMode.STEP
-                        self._time_since_last_step = 0
-                elif event.key == pygame.K_c:
-                    self._clear_vision = not self._clear_vision
-                elif event.key == pygame.K_r:
-                    self._running = False
-                    self._restart = True
+                self._handle_key(event.key)
+            elif event.type == pygame.MOUSEWHEEL:
+                self._viewport.zoom(event.y, pygame.mouse.get_pos())
+            elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+                self._viewport.drag(*event.rel)
+
+    def _handle_key(self, key: int) -> None:
+        """Handles a key the user pressed.
+
+        :param key: The pygame key code of the pressed key.
+        """
+        if key == pygame.K_SPACE and self._mode == GameMode.STEP:
+            self._step_requested = True
+        elif key == pygame.K_PLUS and self._mode == GameMode.CONTINUOUS:
+            self._step_interval /= 2
+        elif key == pygame.K_MINUS and self._mode == GameMode.CONTINUOUS:
+            self._step_interval *= 2
+        elif key == pygame.K_RETURN:
+            if self._mode == GameMode.STEP:
+                self._mode = GameMode.CONTINUOUS
+            else:
+                self._mode = GameMode.STEP
+                self._time_since_last_step = 0
+        elif key == pygame.K_m:
+            self._max_speed = not self._max_speed
+        elif key == pygame.K_c:
+            self._clear_vision = not self._clear_vision
+        elif key == pygame.K_p:
+            self._statistic.profiler.enabled = not self._statistic.profiler.enabled
+        elif key == pygame.K_r:
+            self._running = False
+            self._restart = True
+        elif key in (pygame.K_w, pygame.K_a, pygame.K_s, pygame.K_d):
+            # moves the view by a quarter of the window
+            distance = max(1, self._viewport.width // self._viewport.tile_size // 4)
+            dx = (key == pygame.K_d) - (key == pygame.K_a)
+            dy = (key == pygame.K_s) - (key == pygame.K_w)
+            self._viewport.move(dx * distance, dy * distance)
+        elif key == pygame.K_e:
+            self._viewport.zoom(1)
+        elif key == pygame.K_q:
+            self._viewport.zoom(-1)
+        elif key == pygame.K_f:
+            self._viewport.fit()
+
+    def _setup_game(self) -> None:
+        """Sets up the game and moves the view to the agents, in case the board does not fit into the window."""
+        super()._setup_game()
+
+        living_agents = [agent for agent in self._agents if not agent.dead]
+        if living_agents:
+            self._viewport.center_on((
+                sum(agent.x for agent in living_agents) // len(living_agents),
+                sum(agent.y for agent in living_agents) // len(living_agents),
+            ))
 
     def _update(self, dt: float) -> None:
         """Updates the game state.
@@ -146,119 +147,48 @@ class Game:
             self._game_step()
         elif self._mode == GameMode.CONTINUOUS:
             self._time_since_last_step += dt
-            if self._time_since_last_step >= self._step_interval:
-                self._game_step()
-                self._time_since_last_step = 0
-
-    def _game_step(self) -> None:
-        """One-step cycle of the game, following this Order:
-
-        - Agent-Manager creates tasks.
-        - All agents bid on the created tasks.
-        - Agent-Manager awards a task to each agent.
-        - Each agent executes the awarded task.
-        - Result of the executed task is handled.
-        - Agent perceives information of its cell and updates the shared beliefs.
-        """
-        self._game_steps += 1
-
-        tasks = self._agent_manager.create_tasks(self._board)
-
-        bids = self._agent_manager.create_bids(tasks)
-
-        awarded_tasks = self._agent_manager.award_tasks(bids)
-
-        # if all agents have no task they are stuck
-        if not awarded_tasks:
-            self._statistic.increase_stuck_amount()
-            self._running = False
-            self._restart = True
-            return
-
-        for agent in self._agents:
-            # if an agent doesn't have a task, they are skipped
-            if agent.agent_id not in awarded_tasks:
-                continue
+            deadline = time.perf_counter() + self._frame_budget
 
-            result = self._board.execute_task(agent, awarded_tasks[agent.agent_id])
+            # as many game steps as are due, or as fit into the frame budget at max speed
+            while self._running and self._mode == GameMode.CONTINUOUS and (
+                    self._max_speed or self._time_since_last_step >= self._step_interval):
+                self._game_step()
+                self._counted_steps += 1
+                if not self._max_speed:
+                    self._time_since_last_step -= self._step_interval
+                if time.perf_counter() >= deadline:
+                    break
 
-            if result.gold:
-                self._running = False
-                self._restart = True
-                return
+            # the game steps that did not fit into the frame budget are dropped, instead of piling up
+            self._time_since_last_step = min(self._time_since_last_step, self._step_interval)
 
-            self._agent_manager.update_beliefs(agent, result)
+            self._counted_time += dt
+            if self._counted_time >= 1:
+                self._steps_per_second = self._counted_steps / self._counted_time
+                self._counted_steps = 0
+                self._counted_time = 0
 
     def _draw(self) -> None:
-        """Draws the game window."""
-        self._screen.fill((255, 255, 255))
-
-        self._draw_board()
-
-        pygame.display.flip()
-
-    def _draw_board(self) -> None:
-        """Draws the game board."""
-        for cell in self._board.cells:
-            rect = pygame.Rect(
-                cell.x * TILE_SIZE,
-                cell.y * TILE_SIZE,
-                TILE_SIZE,
-                TILE_SIZE
-            )
-
-            agent = next(
-                (agent for agent in self._agents if agent.x == cell.x and agent.y == cell.y and not agent.dead),
-                None
-            )
-
-            if self._clear_vision:
-                if agent:
-                    color = AGENT_COLOR
-                elif cell.hasWumpus:
-                    color = WUMPUS_COLOR
-                elif cell.hasDeadWumpus:
-                    color = DEAD_WUMPUS_COLOR
-                elif cell.hasPit:
-                    color = PIT_COLOR
-                elif cell.hasGold:
-                    color = GOLD_COLOR
-                elif cell.hasBreeze and cell.hasStench:
-                    color = BRENCH_COLOR
-                elif cell.hasBreeze:
-                    color = BREEZE_COLOR
-                elif cell.hasStench:
-                    color = STENCH_COLOR
-                else:
-                    color = GRAY
-            else:
-                if agent:
-                    color = AGENT_COLOR
-                elif (self._agent_manager.shared_beliefs.get((cell.x, cell.y), {}).get("potential_wumpus") or
-                      self._agent_manager.shared_beliefs.get((cell.x, cell.y), {}).get("potential_pit")):
-                    color = DANGER_COLOR
-                elif self._agent_manager.shared_beliefs.get((cell.x, cell.y), {}).get("wumpus"):
-                    color = WUMPUS_COLOR
-                elif self._agent_manager.shared_beliefs.get((cell.x, cell.y), {}).get("dead_wumpus"):
-                    color = DEAD_WUMPUS_COLOR
-                elif self._agent_manager.shared_beliefs.get((cell.x, cell.y), {}).get("pit"):
-                    color = PIT_COLOR
-                elif (cell.x, cell.y) in self._agent_manager.shared_visited:
-                    if cell.hasBreeze and cell.hasStench:
-                        color = BRENCH_COLOR
-                    elif cell.hasBreeze:
-                        color = BREEZE_COLOR
-                    elif cell.hasStench:
-                        color = STENCH_COLOR
-                    else:
-                        color = GRAY
-                else:
-                    color = DARK_GRAY
-
-            pygame.draw.rect(self._screen, color, rect)
-            pygame.draw.rect(self._screen, (50, 50, 50), rect, 1)
-
-            if agent:
-                label = self._font.render(f"{agent.agent_id}", True, BLACK)
-                rect = label.get_rect(center=rect.center)
-                self._screen.blit(label, rect)
+        """Draws the parts of the game window that changed."""
+        rects = self._renderer.draw(
+            self._screen,
+            self._board,
+            self._agent_manager.shared_beliefs,
+            self._board.agent_index,
+            self._clear_vision,
+            self._viewport
+        )
+
+        # the counter is drawn on top of the board, so the board is restored where it was drawn before
+        if self._counter_rect:
+            self._renderer.restore(self._screen, self._counter_rect)
+            rects.append(self._counter_rect)
+            self._counter_rect = None
+
+        if self._mode == GameMode.CONTINUOUS:
+            speed = "max" if self._max_speed else f"{1 / self._step_interval:g}"
+            label = self._font.render(f"{self._steps_per_second:.0f} steps/s (target {speed})", True, BLACK, GRAY)
+            self._counter_rect = self._screen.blit(label, (4, 4))
+            rects.append(self._counter_rect)
+
+        pygame.display.update(rects)
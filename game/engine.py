@@ -0,0 +1,237 @@
+from agent.core import Agent
+from agent.manager import AgentManager
+from agent.task import TaskResult
+from game.board import Board
+from game.recorder import EpisodeRecorder
+from statistic.core import Statistics
+from statistic.stream import CycleStream
+from util.config import Config
+
+from datetime import datetime
+import os
+import random
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from game.array_board import ArrayBoard
+    from game.chunked_board import ChunkedBoard
+
+# the time the process started, so that the engines of a worker process append to the same file
+STARTED = datetime.now().strftime("%Y-%m-%d-%H-%M-%S")
+
+
+class Engine:
+    """Handles the game cycles of the simulation without drawing anything, so that it can run as fast as possible.
+
+    :ivar _config (Config): The configuration of the simulation.
+    :ivar _running (bool): Whether the game is running.
+    :ivar _restart (bool): Whether the game should be restarted, after it stops running.
+    :ivar _board (Board | ArrayBoard | ChunkedBoard): The game board, depending on the board backend of the configuration.
+    :ivar _agents (list[Agent]): The list of agents that play the game.
+    :ivar _agent_manager (AgentManager): The AgentManger for the agents.
+    :ivar _statistic (Statistics): The statistics of the played game cycles.
+    :ivar _game_steps (int): The amount of game steps in the current game cycle.
+    :ivar _gold_found (bool): Whether the gold was found in the current game cycle.
+    :ivar _seed (int | None): The seed the current game cycle was set up with, if it was seeded.
+    :ivar _first_cycle (int): The number of the first game cycle of this engine in its process, from which the
+        game cycles are counted for the profiler.
+    :ivar _recorder (EpisodeRecorder | None): The recorder of the game cycles, if they are recorded.
+    :ivar _stream (CycleStream | None): The file the record of each game cycle is appended to, if they are saved.
+    """
+    def __init__(self, config: Config | None = None):
+        self._config: Config = config or Config()
+        self._running: bool = True
+        self._restart: bool = False
+
+        # the other boards are only imported, if they are used
+        self._board: "Board | ArrayBoard | ChunkedBoard"
+        if self._config.board_backend == "numpy":
+            from game.array_board import ArrayBoard
+            self._board = ArrayBoard(self._config)
+        elif self._config.board_backend == "chunked":
+            from game.chunked_board import ChunkedBoard
+            self._board = ChunkedBoard(self._config)
+        else:
+            self._board = Board(self._config)
+        self._agents: list[Agent] = [Agent(agent_id, self._config) for agent_id in range(1, self._config.num_agents + 1)]
+        self._statistic: Statistics = Statistics(self._config)
+        self._agent_manager: AgentManager = AgentManager(self._agents, self._config, self._statistic.profiler)
+        self._game_steps: int = 0
+        self._gold_found: bool = False
+
+        self._seed: int | None = None
+        self._first_cycle: int = 0
+        self._recorder: EpisodeRecorder | None = None
+        if self._config.record_episodes:
+            self._recorder = EpisodeRecorder(
+                f'statistic/episodes/{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}-{os.getpid()}.episodes'
+            )
+        self._stream: CycleStream | None = None
+        if self._config.stream_format:
+            self._stream = CycleStream(
+                f'statistic/statistics/{STARTED}-{os.getpid()}-cycles.{self._config.stream_format}'
+            )
+
+    def start_game(self) -> None:
+        """Plays game cycles until the game is closed, the maximum amount of cycles is reached
+        or the statistics are precise enough to stop early."""
+        while True:
+            # a recorded game cycle is seeded, so that it can also be played again
+            if self._recorder:
+                self._seed = random.randrange(2 ** 32)
+                random.seed(self._seed)
+
+            self._setup_game()
+            self._run()
+            self._update_statistic()
+            self._finish_episode()
+
+            if self._statistic.get_cycles() % 50 == 0 and self._config.statistics_enabled:
+                print(self._statistic.get_cycles())
+
+            if (not self._restart or self._statistic.get_cycles() >= self._config.max_cycles
+                    or self._statistic.is_precise()):
+                break
+
+            self._restart_game()
+
+        if self._stream:
+            self._stream.flush()
+        if self._config.statistics_enabled:
+            self._statistic.create_file()
+
+    def play_cycles(self, seeds: list[int], stop_early: bool = False, first_cycle: int = 0) -> Statistics:
+        """Plays one game cycle per seed, seeding the random generator before each cycle is set up,
+        so that each cycle can be reproduced on its own.
+
+        :param seeds: The seeds of the game cycles that should be played.
+        :param stop_early: Whether the remaining seeds are skipped, once the statistics are precise enough.
+        :param first_cycle: The amount of game cycles the process played before with other engines,
+            so that the captured game cycles are counted per process.
+        :return: The statistics of the played game cycles.
+        """
+        self._first_cycle = first_cycle
+        for seed in seeds:
+            self._seed = seed
+            random.seed(seed)
+            self._setup_game()
+            self._run()
+            self._update_statistic()
+            self._finish_episode()
+            self._restart_game()
+
+            if stop_early and self._statistic.is_precise():
+                break
+
+        if self._stream:
+            self._stream.flush()
+        return self._statistic
+
+    def _update_statistic(self) -> None:
+        """Adds the data of the current game cycle to the statistics and appends its record to the file,
+        if the records are saved."""
+        self._statistic.profiler.finish_cycle(self._first_cycle + self._statistic.get_cycles(), self._game_steps)
+        record = self._statistic.update(
+            self._game_steps,
+            sum(agent.dead for agent in self._agents),
+            len(self._agent_manager.shared_visited),
+            self._gold_found
+        )
+
+        if self._stream:
+            self._stream.write({"seed": self._seed, **record})
+
+    def _finish_episode(self) -> None:
+        """Saves the recording of the current game cycle, if the game cycles are recorded."""
+        if self._recorder:
+            self._recorder.finish_episode()
+
+    def _setup_game(self) -> None:
+        """Sets up the game."""
+        self._running = True
+        self._statistic.profiler.start_cycle(self._first_cycle + self._statistic.get_cycles())
+        self._board.setup_board(self._agents)
+
+        if self._recorder:
+            self._recorder.start_episode(
+                self._seed,
+                self._statistic.get_cycles(),
+                self._config,
+                self._board.get_planes(),
+                self._agents
+            )
+
+        for agent in self._agents:
+            self._agent_manager.update_beliefs(agent, TaskResult())
+
+    def _restart_game(self) -> None:
+        """Reset the game state and start a new game."""
+        self._restart = False
+
+        self._game_steps = 0
+        self._gold_found = False
+
+        self._board.reset()
+        self._agent_manager.reset()
+        for agent in self._agents:
+            agent.reset()
+
+    def _run(self) -> None:
+        """Runs the game-loop, making game steps until the game cycle is over."""
+        while self._running:
+            self._game_step()
+
+    def _game_step(self) -> None:
+        """One-step cycle of the game, following this Order:
+
+        - Agent-Manager creates tasks.
+        - All agents bid on the created tasks.
+        - Agent-Manager awards a task to each agent.
+        - Each agent executes the awarded task.
+        - Result of the executed task is handled.
+        - Agent perceives information of its cell and updates the shared beliefs.
+        """
+        self._game_steps += 1
+        profiler = self._statistic.profiler
+
+        start = profiler.clock()
+        tasks = self._agent_manager.create_tasks(self._board)
+        profiler.lap("create_tasks", start)
+        profiler.count("tasks", len(tasks))
+
+        bids = self._agent_manager.create_bids(tasks)
+        profiler.count("bids", len(bids))
+
+        start = profiler.clock()
+        awarded_tasks = self._agent_manager.award_tasks(bids)
+        profiler.lap("award", start)
+
+        # if all agents have no task they are stuck
+        if not awarded_tasks:
+            self._statistic.increase_stuck_amount()
+            self._running = False
+            self._restart = True
+            return
+
+        for agent in self._agents:
+            # if an agent doesn't have a task, they are skipped
+            if agent.agent_id not in awarded_tasks:
+                continue
+
+            task = awarded_tasks[agent.agent_id]
+            start = profiler.clock()
+            result = self._board.execute_task(agent, task, self._agent_manager.awarded_paths[agent.agent_id])
+            profiler.lap("execute_task", start)
+
+            if self._recorder:
+                self._recorder.record_task(self._game_steps, agent, task, result)
+
+            if result.gold:
+                self._gold_found = True
+                self._running = False
+                self._restart = True
+                return
+
+            start = profiler.clock()
+            self._agent_manager.update_beliefs(agent, result)
+            profiler.lap("update_beliefs", start)
@@ -0,0 +1,263 @@
+from agent.core import Agent
+from agent.task import Task, TaskResult, TaskType
+from util.config import Config
+
+from collections.abc import Iterator
+from dataclasses import replace
+import os
+import struct
+import zlib
+
+# the file starts with the magic and the version of the format, followed by the compressed episodes,
+# each of them prefixed with its length
+MAGIC = b"WUMP"
+VERSION = 3
+FILE_HEADER = struct.Struct("<4sH")
+EPISODE_LENGTH = struct.Struct("<I")
+
+# an episode contains the header, the planes of the board, the start of each agent and then the deltas
+EPISODE_HEADER = struct.Struct("<qIHHIIBBB")
+AGENT_START = struct.Struct("<Hhh")
+DELTA = struct.Struct("<IHBhhhhBhh")
+
+# the layouts of the episodes of each version, the first version only had room for 255 agents
+# and the versions before the third did not record the settings
+LAYOUTS: dict[int, tuple[struct.Struct, struct.Struct, struct.Struct]] = {
+    1: (struct.Struct("<qIHB"), struct.Struct("<Bhh"), struct.Struct("<IBBhhhhBhh")),
+    2: (struct.Struct("<qIHH"), AGENT_START, DELTA),
+    VERSION: (EPISODE_HEADER, AGENT_START, DELTA),
+}
+
+# the settings the beliefs of the agents depend on, which are recorded in the header of an episode,
+# the risk model and board backend by their index
+RISK_MODELS = ["flat", "probability"]
+BOARD_BACKENDS = ["cells", "numpy", "chunked"]
+
+# bits of the outcome of a task
+BREEZE = 1
+STENCH = 2
+GOLD = 4
+PIT = 8
+WUMPUS = 16
+DEAD = 32
+NO_ARROW = 64
+
+
+class StepDelta:
+    """The change of one agent in a game step, which is everything needed to apply the task again.
+
+    :ivar step (int): The game step in which the task was executed.
+    :ivar agent_id (int): The id of the agent that executed the task.
+    :ivar task_type (TaskType): The type of the task.
+    :ivar target (tuple[int, int]): The target of the task.
+    :ivar position (tuple[int, int]): The position of the agent after the task.
+    :ivar outcome (int): The bits of the result of the task and the state of the agent after it.
+    :ivar wumpus_died (tuple[int, int] | None): The position of a wumpus that died as a result of the task.
+    """
+    def __init__(self, step: int, agent_id: int, task_type: TaskType, target: tuple[int, int],
+                 position: tuple[int, int], outcome: int, wumpus_died: tuple[int, int] | None):
+        self.step: int = step
+        self.agent_id: int = agent_id
+        self.task_type: TaskType = task_type
+        self.target: tuple[int, int] = target
+        self.position: tuple[int, int] = position
+        self.outcome: int = outcome
+        self.wumpus_died: tuple[int, int] | None = wumpus_died
+
+    def get_result(self) -> TaskResult:
+        """Creates the result the task had.
+
+        :return: The result of the task.
+        """
+        return TaskResult(
+            breeze=bool(self.outcome & BREEZE),
+            stench=bool(self.outcome & STENCH),
+            gold=bool(self.outcome & GOLD),
+            pit=bool(self.outcome & PIT),
+            wumpus=bool(self.outcome & WUMPUS),
+            wumpus_died=self.wumpus_died,
+        )
+
+
+class Episode:
+    """A recorded game cycle.
+
+    :ivar seed (int | None): The seed the game cycle was set up with, if it was seeded.
+    :ivar cycle (int): The number of the game cycle in the process that played it.
+    :ivar grid_size (int): The amount of cells on the x- and y-axis.
+    :ivar planes (bytes): The bits of each cell of the board when the game cycle started, as in game.cell.
+    :ivar agent_starts (list[tuple[int, int, int]]): The id and start position of each agent.
+    :ivar settings (dict[str, int | bool | str] | None): The amount of pits and wumpus, whether the agents were
+        risky, the risk model and the board backend the game cycle was played with,
+        or None if the version of the recording did not record them.
+    :ivar deltas (list[StepDelta]): The executed tasks, in the order of execution.
+    """
+    def __init__(self, seed: int | None, cycle: int, grid_size: int, planes: bytes,
+                 agent_starts: list[tuple[int, int, int]], settings: dict[str, int | bool | str] | None = None):
+        self.seed: int | None = seed
+        self.cycle: int = cycle
+        self.grid_size: int = grid_size
+        self.planes: bytes = planes
+        self.agent_starts: list[tuple[int, int, int]] = agent_starts
+        self.settings: dict[str, int | bool | str] | None = settings
+        self.deltas: list[StepDelta] = []
+
+    def get_config(self, config: Config) -> Config:
+        """Creates the configuration the beliefs of the game cycle can be rebuilt with.
+
+        :param config: The configuration the settings that were not recorded are taken from.
+        :return: The configuration with the grid size and the recorded settings of the game cycle.
+        """
+        return replace(config, grid_size=self.grid_size, **(self.settings or {}))
+
+    def get_steps(self) -> int:
+        """Gets the amount of game steps in which a task was executed."""
+        return self.deltas[-1].step if self.deltas else 0
+
+    def to_bytes(self) -> bytes:
+        """Packs the episode into its compressed binary form.
+
+        :return: The compressed episode.
+        """
+        seed = -1 if self.seed is None else self.seed
+        settings = self.settings
+        parts = [EPISODE_HEADER.pack(
+            seed, self.cycle, self.grid_size, len(self.agent_starts), settings["num_pits"], settings["num_wumpus"],
+            settings["risky"], RISK_MODELS.index(settings["risk_model"]),
+            BOARD_BACKENDS.index(settings["board_backend"]),
+        ), self.planes]
+        parts += [AGENT_START.pack(*start) for start in self.agent_starts]
+        for delta in self.deltas:
+            died_x, died_y = delta.wumpus_died or (-1, -1)
+            parts.append(DELTA.pack(
+                delta.step, delta.agent_id, delta.task_type.value, *delta.target, *delta.position,
+                delta.outcome, died_x, died_y,
+            ))
+        return zlib.compress(b"".join(parts))
+
+    @classmethod
+    def from_bytes(cls, data: bytes, version: int = VERSION) -> "Episode":
+        """Unpacks an episode from its compressed binary form.
+
+        :param data: The compressed episode.
+        :param version: The version of the format the episode was packed with.
+        :return: The episode.
+        """
+        episode_header, agent_start, delta_struct = LAYOUTS[version]
+        data = zlib.decompress(data)
+        seed, cycle, grid_size, num_agents, *recorded = episode_header.unpack_from(data)
+        offset = episode_header.size
+
+        settings = None
+        if recorded:
+            num_pits, num_wumpus, risky, risk_model, board_backend = recorded
+            settings = {
+                "num_pits": num_pits,
+                "num_wumpus": num_wumpus,
+                "risky": bool(risky),
+                "risk_model": RISK_MODELS[risk_model],
+                "board_backend": BOARD_BACKENDS[board_backend],
+            }
+
+        planes = data[offset:offset + grid_size * grid_size]
+        offset += grid_size * grid_size
+
+        agent_starts = []
+        for _ in range(num_agents):
+            agent_starts.append(agent_start.unpack_from(data, offset))
+            offset += agent_start.size
+
+        episode = cls(None if seed < 0 else seed, cycle, grid_size, planes, agent_starts, settings)
+        for step, agent_id, task_type, tx, ty, x, y, outcome, died_x, died_y in delta_struct.iter_unpack(data[offset:]):
+            episode.deltas.append(StepDelta(
+                step, agent_id, TaskType(task_type), (tx, ty), (x, y), outcome,
+                None if died_x < 0 else (died_x, died_y),
+            ))
+        return episode
+
+
+class EpisodeRecorder:
+    """Records the game cycles of an engine and appends each of them to a log file, once it is over.
+
+    :ivar path (str): The path of the log file.
+    :ivar _episode (Episode | None): The episode of the game cycle that is currently played.
+    """
+    def __init__(self, path: str):
+        self.path: str = path
+        self._episode: Episode | None = None
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def start_episode(self, seed: int | None, cycle: int, config: Config, planes: bytes, agents: list[Agent]) \
+            -> None:
+        """Starts the recording of a game cycle, after the board is set up.
+
+        :param seed: The seed the game cycle was set up with, if it was seeded.
+        :param cycle: The number of the game cycle.
+        :param config: The configuration the game cycle is played with, whose grid size and settings are recorded.
+        :param planes: The bits of each cell of the board.
+        :param agents: The agents on their start positions.
+        """
+        starts = [(agent.agent_id, agent.x, agent.y) for agent in agents]
+        settings = {
+            "num_pits": config.num_pits,
+            "num_wumpus": config.num_wumpus,
+            "risky": config.risky,
+            "risk_model": config.risk_model,
+            "board_backend": config.board_backend,
+        }
+        self._episode = Episode(seed, cycle, config.grid_size, planes, starts, settings)
+
+    def record_task(self, step: int, agent: Agent, task: Task, result: TaskResult) -> None:
+        """Records a task an agent executed.
+
+        :param step: The game step in which the task was executed.
+        :param agent: The agent after it executed the task.
+        :param task: The executed task.
+        :param result: The result of the task.
+        """
+        outcome = (
+            BREEZE * result.breeze
+            | STENCH * result.stench
+            | GOLD * result.gold
+            | PIT * result.pit
+            | WUMPUS * result.wumpus
+            | DEAD * agent.dead
+            | NO_ARROW * (not agent.has_arrow)
+        )
+        self._episode.deltas.append(StepDelta(
+            step, agent.agent_id, task.task_type, task.target, (agent.x, agent.y), outcome, result.wumpus_died
+        ))
+
+    def finish_episode(self) -> None:
+        """Appends the recorded game cycle to the log file."""
+        if self._episode is None:
+            return
+
+        data = self._episode.to_bytes()
+        self._episode = None
+
+        new_file = not os.path.exists(self.path)
+        with open(self.path, 'ab') as f:
+            if new_file:
+                f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            f.write(EPISODE_LENGTH.pack(len(data)))
+            f.write(data)
+
+
+def read_episodes(path: str) -> Iterator[Episode]:
+    """Reads the episodes of a log file one after another.
+
+    :param path: The path of the log file.
+    :return: An iterator over the episodes.
+    """
+    with open(path, 'rb') as f:
+        magic, version = FILE_HEADER.unpack(f.read(FILE_HEADER.size))
+        if magic != MAGIC or version not in LAYOUTS:
+            raise ValueError(f'{path} is not an episode log of a version up to {VERSION}')
+
+        while length := f.read(EPISODE_LENGTH.size):
+            (size,) = EPISODE_LENGTH.unpack(length)
+            yield Episode.from_bytes(f.read(size), version)
@@ -0,0 +1,237 @@
+from agent.beliefs import BeliefStore, POTENTIAL_DANGER, WUMPUS, DEAD_WUMPUS, PIT, VISITED
+from game import cell as bits
+from game.agent_index import AgentIndex
+from game.board import Board
+from game.viewport import Viewport
+from util.theme import *
+
+import numpy as np
+import pygame
+
+BORDER_COLOR = (50, 50, 50)
+
+
+def get_cell_color(cell_bits: int, beliefs: int, clear_vision: bool) -> tuple[int, int, int]:
+    """Gets the color of a cell without an agent.
+
+    :param cell_bits: The bits of the elements and perceptions in the cell, as in game.cell.
+    :param beliefs: The flags of the beliefs on the cell.
+    :param clear_vision: Whether the entire board is shown or only what the agents see.
+    :return: The color of the cell.
+    """
+    has_breeze = cell_bits & bits.BREEZE
+    has_stench = cell_bits & bits.STENCH
+
+    if clear_vision:
+        if cell_bits & bits.WUMPUS:
+            return WUMPUS_COLOR
+        if cell_bits & bits.DEAD_WUMPUS:
+            return DEAD_WUMPUS_COLOR
+        if cell_bits & bits.PIT:
+            return PIT_COLOR
+        if cell_bits & bits.GOLD:
+            return GOLD_COLOR
+    else:
+        if beliefs & POTENTIAL_DANGER:
+            return DANGER_COLOR
+        if beliefs & WUMPUS:
+            return WUMPUS_COLOR
+        if beliefs & DEAD_WUMPUS:
+            return DEAD_WUMPUS_COLOR
+        if beliefs & PIT:
+            return PIT_COLOR
+        if not beliefs & VISITED:
+            return DARK_GRAY
+
+    if has_breeze and has_stench:
+        return BRENCH_COLOR
+    if has_breeze:
+        return BREEZE_COLOR
+    if has_stench:
+        return STENCH_COLOR
+    return GRAY
+
+
+def _create_color_table(clear_vision: bool) -> np.ndarray:
+    """Helper function to create the color of every combination of cell bits and belief flags.
+
+    :param clear_vision: Whether the entire board is shown or only what the agents see.
+    :return: The colors, indexed with `cell_bits << 8 | beliefs`.
+    """
+    return np.array(
+        [get_cell_color(index >> 8, index & 0xFF, clear_vision) for index in range(64 << 8)], dtype=np.uint8
+    )
+
+
+class BoardRenderer:
+    """Draws the part of the game board that is in the viewport onto a cached surface and only redraws the cells
+    whose color changed, which are found with the log of changes of the beliefs and the positions of the agents.
+    The whole viewport is only redrawn, if the beliefs were reset, the vision was toggled or the viewport moved.
+
+    :ivar _font (pygame.font.Font): The font of the agent labels.
+    :ivar _surface (pygame.Surface | None): The drawn board, with the size of the window.
+    :ivar _color_tables (dict[bool, np.ndarray]): The colors of the cells per vision.
+    :ivar _labels (dict[int, pygame.Surface]): The rendered label of each agent id.
+    :ivar _beliefs (BeliefStore | None): The beliefs the board was drawn from.
+    :ivar _version (int): The version of the beliefs the board was drawn from.
+    :ivar _clear_vision (bool): The vision the board was drawn with.
+    :ivar _view (tuple[int, int, int] | None): The state of the viewport the board was drawn with.
+    :ivar _agent_cells (dict[tuple[int, int], int]): The id of the agent that is drawn on a cell.
+    """
+    # the smallest amount of pixels per cell, with which the borders and labels of the cells are drawn
+    MIN_BORDER_SIZE = 4
+    MIN_LABEL_SIZE = 16
+
+    def __init__(self, font: pygame.font.Font):
+        self._font: pygame.font.Font = font
+        self._surface: pygame.Surface | None = None
+        self._color_tables: dict[bool, np.ndarray] = {
+            False: _create_color_table(False),
+            True: _create_color_table(True),
+        }
+        self._labels: dict[int, pygame.Surface] = {}
+
+        self._beliefs: BeliefStore | None = None
+        self._version: int = -1
+        self._clear_vision: bool = False
+        self._view: tuple[int, int, int] | None = None
+        self._agent_cells: dict[tuple[int, int], int] = {}
+
+    def draw(self, screen: pygame.Surface, board: Board, beliefs: BeliefStore, agent_index: AgentIndex,
+             clear_vision: bool, viewport: Viewport) -> list[pygame.Rect]:
+        """Brings the drawn board up to date and copies the changed parts onto the screen.
+
+        :param screen: The surface of the game window.
+        :param board: The game board.
+        :param beliefs: The shared beliefs of the agents.
+        :param agent_index: The positions of the living agents, which are drawn.
+        :param clear_vision: Whether the entire board is shown or only what the agents see.
+        :param viewport: The part of the board that is shown.
+        :return: The parts of the screen that changed.
+        """
+        agent_cells = agent_index.get_cells()
+
+        changes = beliefs.changes_since(self._version) if beliefs is self._beliefs else None
+        size = beliefs.grid_size
+
+        if (changes is None or clear_vision != self._clear_vision or viewport.get_state() != self._view
+                or self._surface is None or self._surface.get_size() != screen.get_size()):
+            self._draw_all(screen.get_size(), board, beliefs, agent_cells, clear_vision, viewport)
+            rects = [self._surface.get_rect()]
+        else:
+            dirty = {divmod(index, size) for index in changes}
+            dirty.update(pos for pos, agent_id in agent_cells.items() if self._agent_cells.get(pos) != agent_id)
+            dirty.update(pos for pos in self._agent_cells if pos not in agent_cells)
+
+            x_min, y_min, x_max, y_max = viewport.get_bounds()
+            rects = [
+                self._draw_cell(pos, board, beliefs, agent_cells, clear_vision, viewport)
+                for pos in dirty if x_min <= pos[0] < x_max and y_min <= pos[1] < y_max
+            ]
+
+        self._beliefs = beliefs
+        self._version = beliefs.version
+        self._clear_vision = clear_vision
+        self._view = viewport.get_state()
+        self._agent_cells = agent_cells
+
+        for rect in rects:
+            screen.blit(self._surface, rect, rect)
+        return rects
+
+    def restore(self, screen: pygame.Surface, rect: pygame.Rect) -> None:
+        """Copies a part of the drawn board onto the screen, for example where something was drawn on top of it.
+
+        :param screen: The surface of the game window.
+        :param rect: The part of the screen.
+        """
+        if self._surface is not None:
+            screen.blit(self._surface, rect, rect)
+
+    def _draw_all(self, screen_size: tuple[int, int], board: Board, beliefs: BeliefStore,
+                  agent_cells: dict[tuple[int, int], int], clear_vision: bool, viewport: Viewport) -> None:
+        """Helper method to draw the whole viewport at once, by pushing the colors of all the pixels onto the surface.
+
+        :param screen_size: The width and height of the game window.
+        :param board: The game board.
+        :param beliefs: The shared beliefs of the agents.
+        :param agent_cells: The id of the agent that is drawn on a cell.
+        :param clear_vision: Whether the entire board is shown or only what the agents see.
+        :param viewport: The part of the board that is shown.
+        """
+        if self._surface is None or self._surface.get_size() != screen_size:
+            self._surface = pygame.Surface(screen_size)
+
+        size = beliefs.grid_size
+        tile = viewport.tile_size
+        x_min, y_min, x_max, y_max = bounds = viewport.get_bounds()
+        width, height = x_max - x_min, y_max - y_min
+
+        cell_bits = np.frombuffer(board.get_region(bounds), dtype=np.uint8).astype(np.intp)
+        flags = np.frombuffer(beliefs.flags, dtype=np.uint8).reshape(size, size)[x_min:x_max, y_min:y_max]
+        colors = self._color_tables[clear_vision][cell_bits << 8 | flags.ravel()].reshape(width, height, 3)
+        for x, y in agent_cells:
+            if x_min <= x < x_max and y_min <= y < y_max:
+                colors[x - x_min, y - y_min] = AGENT_COLOR
+
+        pixels = colors.repeat(tile, axis=0).repeat(tile, axis=1)
+        if tile >= self.MIN_BORDER_SIZE:
+            edge = np.arange(max(width, height) * tile) % tile
+            edge = (edge == 0) | (edge == tile - 1)
+            pixels[edge[:width * tile], :] = BORDER_COLOR
+            pixels[:, edge[:height * tile]] = BORDER_COLOR
+
+        # the cells at the right and bottom can be cut off, and the window is black where the board ends
+        screen = np.zeros((screen_size[0], screen_size[1], 3), dtype=np.uint8)
+        visible_width, visible_height = min(screen_size[0], width * tile), min(screen_size[1], height * tile)
+        screen[:visible_width, :visible_height] = pixels[:visible_width, :visible_height]
+        pygame.surfarray.blit_array(self._surface, screen)
+
+        if tile >= self.MIN_LABEL_SIZE:
+            for pos, agent_id in agent_cells.items():
+                if x_min <= pos[0] < x_max and y_min <= pos[1] < y_max:
+                    self._draw_label(pos, agent_id, viewport)
+
+    def _draw_cell(self, pos: tuple[int, int], board: Board, beliefs: BeliefStore,
+                   agent_cells: dict[tuple[int, int], int], clear_vision: bool, viewport: Viewport) -> pygame.Rect:
+        """Helper method to draw one cell of the board.
+
+        :param pos: The position of the cell, which is in the viewport.
+        :param board: The game board.
+        :param beliefs: The shared beliefs of the agents.
+        :param agent_cells: The id of the agent that is drawn on a cell.
+        :param clear_vision: Whether the entire board is shown or only what the agents see.
+        :param viewport: The part of the board that is shown.
+        :return: The part of the surface that was drawn.
+        """
+        tile = viewport.tile_size
+        rect = pygame.Rect(viewport.to_screen(pos), (tile, tile))
+
+        if pos in agent_cells:
+            color = AGENT_COLOR
+        else:
+            index = board.get_cell_bits(pos) << 8 | beliefs.get_flags(pos)
+            color = tuple(self._color_tables[clear_vision][index].tolist())
+
+        pygame.draw.rect(self._surface, color, rect)
+        if tile >= self.MIN_BORDER_SIZE:
+            pygame.draw.rect(self._surface, BORDER_COLOR, rect, 1)
+
+        if pos in agent_cells and tile >= self.MIN_LABEL_SIZE:
+            self._draw_label(pos, agent_cells[pos], viewport)
+        return rect.clip(self._surface.get_rect())
+
+    def _draw_label(self, pos: tuple[int, int], agent_id: int, viewport: Viewport) -> None:
+        """Helper method to draw the id of an agent onto its cell, with the label rendered only once per id.
+
+        :param pos: The position of the cell.
+        :param agent_id: The id of the agent.
+        :param viewport: The part of the board that is shown.
+        """
+        label = self._labels.get(agent_id)
+        if label is None:
+            label = self._labels[agent_id] = self._font.render(f"{agent_id}", True, BLACK)
+
+        x, y = viewport.to_screen(pos)
+        center = (x + viewport.tile_size // 2, y + viewport.tile_size // 2)
+        self._surface.blit(label, label.get_rect(center=center))
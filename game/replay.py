@@ -0,0 +1,165 @@
+from agent.core import Agent
+from agent.manager import AgentManager
+from agent.task import TaskResult
+from game.cell import WUMPUS, DEAD_WUMPUS
+from game.core import Game, GameMode
+from game.recorder import Episode, StepDelta, DEAD, GOLD, NO_ARROW
+from util.config import Config
+
+import pygame
+from dataclasses import replace
+
+
+class Replay:
+    """Rebuilds the state of a recorded game cycle at any game step, by applying the recorded deltas
+    to the start of the episode, without any auctions or pathfinding.
+
+    :ivar episode (Episode): The recorded game cycle.
+    :ivar agents (list[Agent]): The agents of the game cycle.
+    :ivar agent_manager (AgentManager): The AgentManager, whose shared beliefs are rebuilt from the deltas.
+    :ivar planes (bytearray): The bits of each cell of the board at the current game step.
+    :ivar step (int): The current game step.
+    :ivar _agents_by_id (dict[int, Agent]): The agents by their id.
+    :ivar _applied (int): The amount of deltas that are applied.
+    """
+    def __init__(self, episode: Episode, config: Config):
+        self.episode: Episode = episode
+        self.agents: list[Agent] = [Agent(agent_id, config) for agent_id, _, _ in episode.agent_starts]
+        self.agent_manager: AgentManager = AgentManager(self.agents, config)
+        self.planes: bytearray = bytearray(episode.planes)
+        self.step: int = 0
+
+        self._agents_by_id: dict[int, Agent] = {agent.agent_id: agent for agent in self.agents}
+        self._applied: int = 0
+
+        self._rewind()
+
+    def _rewind(self) -> None:
+        """Helper method to bring the game cycle back to its start."""
+        self.agent_manager.reset()
+        self.planes[:] = self.episode.planes
+
+        for agent, (_, x, y) in zip(self.agents, self.episode.agent_starts):
+            agent.reset()
+            agent.x, agent.y = x, y
+
+        for agent in self.agents:
+            self.agent_manager.update_beliefs(agent, TaskResult())
+
+        self.step = 0
+        self._applied = 0
+
+    def seek(self, step: int) -> None:
+        """Brings the game cycle to the state after a game step.
+        Going back rewinds to the start and applies the deltas again, as the beliefs can not be undone.
+
+        :param step: The game step, which is clamped to the recorded game steps.
+        """
+        step = max(0, min(step, self.episode.get_steps()))
+        if step < self.step:
+            self._rewind()
+
+        deltas = self.episode.deltas
+        while self._applied < len(deltas) and deltas[self._applied].step <= step:
+            self._apply(deltas[self._applied])
+            self._applied += 1
+
+        self.step = step
+
+    def _apply(self, delta: StepDelta) -> None:
+        """Helper method to apply the change of an agent in a game step.
+
+        :param delta: The recorded change.
+        """
+        agent = self._agents_by_id[delta.agent_id]
+        agent.x, agent.y = delta.position
+        agent.dead = bool(delta.outcome & DEAD)
+        agent.has_arrow = not delta.outcome & NO_ARROW
+
+        if delta.wumpus_died:
+            x, y = delta.wumpus_died
+            self.planes[x * self.episode.grid_size + y] ^= WUMPUS | DEAD_WUMPUS
+
+        # the game cycle ends as soon as the gold is found, before the beliefs are updated
+        if not delta.outcome & GOLD:
+            self.agent_manager.update_beliefs(agent, delta.get_result())
+
+
+class ReplayViewer(Game):
+    """Shows recorded game cycles, which can be scrubbed forwards and backwards.
+
+    :ivar _episodes (list[Episode]): The recorded game cycles.
+    :ivar _episode_index (int): The index of the shown game cycle.
+    :ivar _replay (Replay): The replay of the shown game cycle, whose beliefs are rebuilt with the settings
+        recorded in its episode.
+    """
+    def __init__(self, episodes: list[Episode]):
+        super().__init__(replace(
+            Config(), grid_size=episodes[0].grid_size, statistics_enabled=False, record_episodes=False
+        ))
+
+        self._episodes: list[Episode] = episodes
+        self._episode_index: int = 0
+        self._replay: Replay
+        self._load_episode(0)
+
+    def start_replay(self) -> None:
+        """Shows the replay until the window is closed."""
+        self._run()
+
+    def _load_episode(self, index: int) -> None:
+        """Helper method to show another game cycle from its start.
+
+        :param index: The index of the game cycle, which wraps around.
+        """
+        self._episode_index = index % len(self._episodes)
+        episode = self._episodes[self._episode_index]
+        self._replay = Replay(episode, episode.get_config(self._config))
+        self._agents = self._replay.agents
+        self._agent_manager = self._replay.agent_manager
+        self._seek(0)
+
+    def _seek(self, step: int) -> None:
+        """Helper method to show a game step of the current game cycle.
+
+        :param step: The game step.
+        """
+        self._replay.seek(step)
+        self._board.load_planes(bytes(self._replay.planes))
+        self._board.agent_index.rebuild(self._agents)
+        self._game_steps = self._replay.step
+
+        episode = self._replay.episode
+        pygame.display.set_caption(
+            f"Episode {self._episode_index + 1}/{len(self._episodes)} "
+            f"(seed {episode.seed}, cycle {episode.cycle}) - step {self._replay.step}/{episode.get_steps()}"
+        )
+
+    def _handle_key(self, key: int) -> None:
+        """Handles a key the user pressed, with the keys to scrub through the game cycles.
+
+        :param key: The pygame key code of the pressed key.
+        """
+        if key == pygame.K_RIGHT:
+            self._seek(self._replay.step + 1)
+        elif key == pygame.K_LEFT:
+            self._seek(self._replay.step - 1)
+        elif key == pygame.K_HOME:
+            self._seek(0)
+        elif key == pygame.K_END:
+            self._seek(self._replay.episode.get_steps())
+        elif key == pygame.K_PAGEDOWN:
+            self._load_episode(self._episode_index + 1)
+        elif key == pygame.K_PAGEUP:
+            self._load_episode(self._episode_index - 1)
+        elif key == pygame.K_r:
+            self._seek(0)
+        else:
+            super()._handle_key(key)
+
+    def _game_step(self) -> None:
+        """Shows the next game step, and stops the continuous game mode at the end of the game cycle."""
+        if self._replay.step >= self._replay.episode.get_steps():
+            self._mode = GameMode.STEP
+            return
+        self._seek(self._replay.step + 1)
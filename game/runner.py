@@ -0,0 +1,108 @@
+from game.engine import Engine
+from statistic.core import Statistics
+from util.config import Config, MAX_CYCLES
+
+from concurrent.futures import ProcessPoolExecutor
+import math
+import os
+import random
+
+# with a stop tolerance, the statistics are checked after every chunk of this many game cycles,
+# so the game cycle at which the experiment stops does not depend on the amount of workers
+STOP_CHUNK_CYCLES = 25
+
+# the amount of game cycles this process played in earlier chunks,
+# so that the captured game cycles are counted per worker and not per chunk
+_played_cycles = 0
+
+
+def create_cycle_seeds(master_seed: int, cycles: int) -> list[int]:
+    """Derives the seed of every game cycle from the master seed.
+    Each cycle has its own seed, so the results do not depend on how the cycles are split between the workers.
+
+    :param master_seed: The seed of the whole experiment.
+    :param cycles: The amount of game cycles.
+    :return: A seed for each game cycle.
+    """
+    rng = random.Random(master_seed)
+    return [rng.getrandbits(32) for _ in range(cycles)]
+
+
+def _play_chunk(config: Config, seeds: list[int]) -> Statistics:
+    """Plays a chunk of game cycles in a worker process on its own board, agents and agent manager.
+
+    :param config: The configuration the game cycles are played with.
+    :param seeds: The seeds of the game cycles in the chunk.
+    :return: The statistics of the chunk.
+    """
+    global _played_cycles
+    if config.batch_size:
+        from game.batch import BatchEngine
+        return BatchEngine(config).play_cycles(seeds)
+
+    statistic = Engine(config).play_cycles(seeds, first_cycle=_played_cycles)
+    _played_cycles += statistic.get_cycles()
+    return statistic
+
+
+def split_seeds(seeds: list[int], workers: int) -> list[list[int]]:
+    """Splits the seeds into several chunks per worker,
+    so that workers that finish early can take over the remaining cycles.
+
+    :param seeds: The seeds of all the game cycles.
+    :param workers: The amount of worker processes.
+    :return: The seeds of each chunk.
+    """
+    chunk_size = max(1, math.ceil(len(seeds) / (workers * 4)))
+    return [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+
+def run_experiment(cycles: int = MAX_CYCLES, master_seed: int = 0, workers: int | None = None,
+                   config: Config | None = None) -> Statistics:
+    """Plays the game cycles spread across a pool of worker processes and merges their statistics.
+    With a stop tolerance, the game cycles are played in chunks of a fixed size, that are merged in order,
+    and once the merged statistics are precise enough, the remaining chunks are cancelled.
+    So the same game cycles are played with any amount of workers.
+
+    :param cycles: The amount of game cycles that should be played.
+    :param master_seed: The seed from which the seeds of the game cycles are derived.
+    :param workers: The amount of worker processes, defaults to the amount of cpu cores.
+    :param config: The configuration the game cycles are played with.
+    :return: The merged statistics of all game cycles.
+    """
+    config = config or Config()
+    workers = workers or os.cpu_count() or 1
+    seeds = create_cycle_seeds(master_seed, cycles)
+    statistic = Statistics(config)
+
+    if config.stop_tolerance is not None:
+        # a batched worker plays at least a whole batch at once, so that its batch stays filled
+        chunk_size = max(STOP_CHUNK_CYCLES, config.batch_size or 0)
+        chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+    elif workers == 1:
+        chunks = [seeds]
+    elif config.batch_size:
+        # a batched worker plays its whole share at once, so that its batch stays filled
+        chunks = [seeds[i::workers] for i in range(workers)]
+    else:
+        chunks = split_seeds(seeds, workers)
+
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        # a single worker plays the chunks one after another, with the same checks as the pool
+        play = executor.map if executor else map
+        for partial in play(_play_chunk, [config] * len(chunks), chunks):
+            statistic.merge(partial)
+
+            if config.statistics_enabled and executor:
+                print(statistic.get_cycles())
+
+            # the chunks are merged in order and their sizes do not depend on the amount of workers,
+            # so the experiment stops after the same game cycles with any amount of workers
+            if statistic.is_precise():
+                break
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+    return statistic
@@ -0,0 +1,84 @@
+from game.runner import create_cycle_seeds, split_seeds, _play_chunk
+from statistic.core import Statistics
+from util.config import Config
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, replace
+from datetime import datetime
+import csv
+import itertools
+import os
+
+
+def create_configs(settings: dict[str, list], base: Config | None = None) -> list[Config]:
+    """Creates a configuration for every combination of the settings.
+
+    :param settings: The values of each setting, by the name of the setting in the Config.
+    :param base: The configuration the settings are applied to.
+    :return: The configurations in the order of the cartesian product of the settings.
+    """
+    base = base or Config()
+    names = list(settings)
+    return [replace(base, **dict(zip(names, values))) for values in itertools.product(*settings.values())]
+
+
+def run_sweep(settings: dict[str, list], cycles: int, master_seed: int = 0, workers: int | None = None,
+              base: Config | None = None) -> list[tuple[Config, Statistics]]:
+    """Plays the game cycles for every combination of the settings in one pool of worker processes.
+    Every configuration is played with the same seeds, so configurations with the same board settings
+    are compared on the same boards.
+
+    :param settings: The values of each setting, by the name of the setting in the Config.
+    :param cycles: The amount of game cycles per configuration.
+    :param master_seed: The seed from which the seeds of the game cycles are derived.
+    :param workers: The amount of worker processes, defaults to the amount of cpu cores.
+    :param base: The configuration the settings are applied to.
+    :return: Each configuration with the merged statistics of its game cycles.
+    """
+    configs = create_configs(settings, base)
+    workers = workers or os.cpu_count() or 1
+    chunks = split_seeds(create_cycle_seeds(master_seed, cycles), workers)
+    results = [(config, Statistics(config)) for config in configs]
+
+    # the chunks of all configurations share the pool, so the workers stay busy until the whole sweep is done
+    jobs = [(index, chunk) for index in range(len(configs)) for chunk in chunks]
+
+    if workers == 1:
+        for index, chunk in jobs:
+            results[index][1].merge(_play_chunk(configs[index], chunk))
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        partials = executor.map(_play_chunk, [configs[index] for index, _ in jobs], [chunk for _, chunk in jobs])
+        for (index, _), partial in zip(jobs, partials):
+            results[index][1].merge(partial)
+
+    return results
+
+
+def create_results_file(results: list[tuple[Config, Statistics]], seed: int | None = None) -> str:
+    """Creates one csv file, with a row of settings and statistics per configuration,
+    and saves it into the statistics folder.
+
+    :param results: Each configuration with the statistics of its game cycles.
+    :param seed: The seed the game cycles were played with.
+    :return: The path of the created file.
+    """
+    folder = f'statistic/statistics'
+    if not os.path.exists(folder):
+        os.makedirs(folder)
+
+    path = f'{folder}/{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}-sweep-{len(results)}.csv'
+    with open(path, 'x', newline='') as f:
+        writer = csv.writer(f)
+        header_written = False
+
+        for config, statistic in results:
+            settings = asdict(config)
+            statistics = statistic.get_results()
+            if not header_written:
+                writer.writerow(["seed", *settings, *statistics])
+                header_written = True
+            writer.writerow([seed, *settings.values(), *statistics.values()])
+
+    return path
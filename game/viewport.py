@@ -0,0 +1,122 @@
+import math
+
+
+class Viewport:
+    """The part of the board that is shown in the window, which can be moved and zoomed,
+    so that the size of the window does not depend on the size of the board.
+    The part is given by the cell in the top left corner of the window and the amount of pixels per cell.
+
+    :ivar grid_size (int): The amount of cells on the x- and y-axis of the board.
+    :ivar width (int): The width of the window in pixels.
+    :ivar height (int): The height of the window in pixels.
+    :ivar tile_size (int): The amount of pixels per cell.
+    :ivar x (int): The x position of the cell in the top left corner of the window.
+    :ivar y (int): The y position of the cell in the top left corner of the window.
+    :ivar _drag (tuple[int, int]): The pixels the view was dragged, that did not add up to a whole cell yet.
+    """
+    MIN_TILE_SIZE = 1
+    MAX_TILE_SIZE = 64
+
+    def __init__(self, grid_size: int, width: int, height: int, tile_size: int):
+        self.grid_size: int = grid_size
+        self.width: int = width
+        self.height: int = height
+        self.tile_size: int = tile_size
+        self.x: int = 0
+        self.y: int = 0
+        self._drag: tuple[int, int] = (0, 0)
+
+    def get_state(self) -> tuple[int, int, int]:
+        """Gets everything that decides which cell is drawn where, to find out if the view changed.
+
+        :return: The x and y position of the top left cell and the amount of pixels per cell.
+        """
+        return self.x, self.y, self.tile_size
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """Gets the cells that are at least partly in the window.
+
+        :return: The lowest x and y and the exclusive highest x and y.
+        """
+        return (
+            self.x,
+            self.y,
+            min(self.grid_size, self.x + math.ceil(self.width / self.tile_size)),
+            min(self.grid_size, self.y + math.ceil(self.height / self.tile_size)),
+        )
+
+    def to_screen(self, pos: tuple[int, int]) -> tuple[int, int]:
+        """Gets the pixel of the top left corner of a cell.
+
+        :param pos: The position of the cell.
+        :return: The x and y of the pixel in the window.
+        """
+        return (pos[0] - self.x) * self.tile_size, (pos[1] - self.y) * self.tile_size
+
+    def to_cell(self, pixel: tuple[int, int]) -> tuple[int, int]:
+        """Gets the cell at a pixel of the window.
+
+        :param pixel: The x and y of the pixel in the window.
+        :return: The position of the cell.
+        """
+        return self.x + pixel[0] // self.tile_size, self.y + pixel[1] // self.tile_size
+
+    def move(self, dx: int, dy: int) -> None:
+        """Moves the view by a number of cells, as far as the board goes.
+
+        :param dx: The amount of cells on the x-axis.
+        :param dy: The amount of cells on the y-axis.
+        """
+        self.x += dx
+        self.y += dy
+        self._clamp()
+
+    def drag(self, dx: int, dy: int) -> None:
+        """Moves the view along with the mouse, so that the board follows the pointer.
+
+        :param dx: The amount of pixels the mouse moved on the x-axis.
+        :param dy: The amount of pixels the mouse moved on the y-axis.
+        """
+        rest_x, rest_y = self._drag[0] - dx, self._drag[1] - dy
+        cells_x, cells_y = int(rest_x / self.tile_size), int(rest_y / self.tile_size)
+        self._drag = (rest_x - cells_x * self.tile_size, rest_y - cells_y * self.tile_size)
+        self.move(cells_x, cells_y)
+
+    def zoom(self, steps: int, anchor: tuple[int, int] | None = None) -> None:
+        """Doubles or halves the amount of pixels per cell for each step,
+        while the cell at the anchor stays under it.
+
+        :param steps: The amount of steps, which zoom in if they are positive and out if they are negative.
+        :param anchor: The pixel of the window that stays on the same cell, which defaults to the center.
+        """
+        anchor = anchor or (self.width // 2, self.height // 2)
+        cell_x, cell_y = self.to_cell(anchor)
+
+        tile_size = self.tile_size * 2 ** steps if steps > 0 else self.tile_size // 2 ** -steps
+        self.tile_size = max(self.MIN_TILE_SIZE, min(self.MAX_TILE_SIZE, tile_size))
+
+        self.x = cell_x - anchor[0] // self.tile_size
+        self.y = cell_y - anchor[1] // self.tile_size
+        self._clamp()
+
+    def fit(self) -> None:
+        """Zooms out, until the whole board fits into the window, or as far as possible."""
+        tile_size = min(self.width, self.height) // self.grid_size
+        self.tile_size = max(self.MIN_TILE_SIZE, min(self.MAX_TILE_SIZE, tile_size))
+        self.x = 0
+        self.y = 0
+        self._clamp()
+
+    def center_on(self, pos: tuple[int, int]) -> None:
+        """Moves the view, so that a cell is in the center of the window, as far as the board goes.
+
+        :param pos: The position of the cell.
+        """
+        self.x = pos[0] - self.width // self.tile_size // 2
+        self.y = pos[1] - self.height // self.tile_size // 2
+        self._clamp()
+
+    def _clamp(self) -> None:
+        """Helper method to keep the view on the board, where the window is filled if the board is large enough."""
+        self.x = max(0, min(self.x, self.grid_size - self.width // self.tile_size))
+        self.y = max(0, min(self.y, self.grid_size - self.height // self.tile_size))
@@ -0,0 +1,42 @@
+from game.runner import run_experiment
+from util.config import Config, MAX_CYCLES
+
+import argparse
+from dataclasses import replace
+import random
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays the game cycles without a window.")
+    parser.add_argument("--cycles", type=int, default=MAX_CYCLES, help="The amount of game cycles.")
+    parser.add_argument("--workers", type=int, default=None, help="The amount of worker processes.")
+    parser.add_argument("--seed", type=int, default=None, help="The master seed of the game cycles.")
+    parser.add_argument("--profile", action="store_true", help="Measures the phases of the game steps.")
+    parser.add_argument("--capture", type=int, nargs=2, default=None, metavar=("FIRST", "LAST"),
+                        help="The first and last game cycle of each worker, that are captured with cProfile.")
+    parser.add_argument("--capture-memory", action="store_true",
+                        help="Also captures the game cycles with tracemalloc.")
+    parser.add_argument("--stream", choices=["jsonl", "csv"], default=None,
+                        help="Appends a record of every game cycle to a file in this format.")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help="Stops early, once the confidence interval of every metric is narrower than this.")
+    parser.add_argument("--batch", type=int, default=None,
+                        help="The amount of game cycles each worker plays at once in lock-step.")
+    args = parser.parse_args()
+
+    config = Config()
+    config = replace(
+        config,
+        profiling=args.profile or config.profiling,
+        capture_cycles=tuple(args.capture) if args.capture else config.capture_cycles,
+        capture_memory=args.capture_memory or config.capture_memory,
+        stream_format=args.stream or config.stream_format,
+        stop_tolerance=args.tolerance if args.tolerance is not None else config.stop_tolerance,
+        batch_size=args.batch or config.batch_size,
+    )
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    statistic = run_experiment(args.cycles, seed, args.workers, config)
+
+    if config.statistics_enabled:
+        statistic.create_file(seed)
@@ -0,0 +1,21 @@
+from game.recorder import read_episodes
+from game.replay import ReplayViewer
+
+import argparse
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Shows the recorded game cycles of an episode log.")
+    parser.add_argument("path", help="The path of the episode log.")
+    parser.add_argument("--seed", type=int, default=None, help="Only shows the game cycle with this seed.")
+    parser.add_argument("--cycle", type=int, default=None, help="Only shows the game cycle with this number.")
+    args = parser.parse_args()
+
+    episodes = [
+        episode for episode in read_episodes(args.path)
+        if (args.seed is None or episode.seed == args.seed) and (args.cycle is None or episode.cycle == args.cycle)
+    ]
+    if not episodes:
+        parser.error("no recorded game cycle matches")
+
+    ReplayViewer(episodes).start_replay()
@@ -0,0 +1,60 @@
+from benchmark.core import (
+    AGENT_COUNTS, BENCHMARKS, GRID_SIZES, SCALING_AGENT_COUNTS, SCALING_BENCHMARKS, SCALING_GRID_SIZES,
+    compare_results, load_results, run_benchmarks, save_results
+)
+
+import argparse
+from datetime import datetime
+import os
+import sys
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Times the hot paths of the simulation.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Runs the benchmarks and saves the results as json.")
+    run.add_argument("--sizes", type=int, nargs="+", default=GRID_SIZES, help="The grid sizes.")
+    run.add_argument("--agents", type=int, nargs="+", default=AGENT_COUNTS, help="The amounts of agents.")
+    run.add_argument("--benchmarks", nargs="+", choices=list(BENCHMARKS), default=None, help="The benchmarks.")
+    run.add_argument("--repeat", type=int, default=7, help="How often each benchmark is timed.")
+    run.add_argument("--warmup", type=int, default=10, help="The game steps played before timing.")
+    run.add_argument("--seed", type=int, default=0, help="The seed of the boards.")
+    run.add_argument("--output", default=None, help="The path of the json file.")
+
+    scaling = commands.add_parser("scaling", help="Times a game step for more and more agents on a large board.")
+    scaling.add_argument("--sizes", type=int, nargs="+", default=SCALING_GRID_SIZES, help="The grid sizes.")
+    scaling.add_argument("--agents", type=int, nargs="+", default=SCALING_AGENT_COUNTS, help="The amounts of agents.")
+    scaling.add_argument("--repeat", type=int, default=3, help="How often each benchmark is timed.")
+    scaling.add_argument("--warmup", type=int, default=3, help="The game steps played before timing.")
+    scaling.add_argument("--seed", type=int, default=0, help="The seed of the boards.")
+    scaling.add_argument("--output", default=None, help="The path of the json file.")
+
+    compare = commands.add_parser("compare", help="Compares results against a baseline.")
+    compare.add_argument("baseline", help="The json file of the baseline.")
+    compare.add_argument("current", help="The json file of the current results.")
+    compare.add_argument("--threshold", type=float, default=0.1,
+                         help="The share a benchmark can be slower, before it is a regression.")
+    args = parser.parse_args()
+
+    if args.command in ("run", "scaling"):
+        names = args.benchmarks if args.command == "run" else SCALING_BENCHMARKS
+        results = run_benchmarks(args.sizes, args.agents, names, args.repeat, args.warmup, args.seed)
+
+        output = args.output
+        if output is None:
+            folder = 'benchmark/results'
+            if not os.path.exists(folder):
+                os.makedirs(folder)
+            output = f'{folder}/{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}.json'
+        save_results(results, output)
+        print(output)
+    else:
+        comparison = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+        for row in comparison:
+            flag = "REGRESSION" if row["regression"] else ""
+            print(f'{row["benchmark"]:<24}{row["grid_size"]:>6}{row["agents"]:>6}'
+                  f'{row["baseline"] * 1000:>12.3f} ms{row["current"] * 1000:>12.3f} ms{row["ratio"]:>8.2f}x  {flag}')
+
+        if any(row["regression"] for row in comparison):
+            sys.exit(1)
@@ -1,24 +1,38 @@
-from util.config import *
+from statistic.profiler import StepProfiler
+from statistic.stream import RunningMetric
+from util.config import Config
 
 from datetime import datetime
+from statistics import NormalDist
 import os
 
+# the metrics of a game cycle, of which the mean and variance are tracked
+METRICS = ["game_steps", "deaths", "cells_explored", "stuck", "gold"]
+
 
 class Statistics:
     """Handles the statistics of the games played.
 
+    :ivar _config (Config): The configuration the game cycles were played with
     :ivar _cycles (int): The amount of game cycles
     :ivar _game_steps (int): The total number of game_steps over all played game cycles
     :ivar _deaths (int): The total number of deaths over all played game cycles
     :ivar _cells_explored (int): The total amount of explored cells over all played game cycles
     :ivar _stuck_amount (int): The total rotations where the agents got stuck and had no more moves according to their strategy
+    :ivar _stuck (bool): Whether the agents got stuck in the current game cycle
+    :ivar _metrics (dict[str, RunningMetric]): The mean and variance of each metric per game cycle
+    :ivar profiler (StepProfiler): The measurements of the phases of the game steps
     """
-    def __init__(self):
+    def __init__(self, config: Config | None = None):
+        self._config: Config = config or Config()
         self._cycles: int = 0
         self._game_steps: int = 0
         self._deaths: int = 0
         self._cells_explored: int = 0
         self._stuck_amount: int = 0
+        self._stuck: bool = False
+        self._metrics: dict[str, RunningMetric] = {metric: RunningMetric() for metric in METRICS}
+        self.profiler: StepProfiler = StepProfiler(self._config)
 
     def get_cycles(self) -> int:
         """Returns the amount of cycles."""
@@ -27,22 +41,98 @@ class Statistics:
     def increase_stuck_amount(self) -> None:
         """Increases the stuck counter by 1."""
         self._stuck_amount += 1
+        self._stuck = True
 
-    def update(self, game_steps: int, deaths: int, cells_explored: int) -> None:
+    def update(self, game_steps: int, deaths: int, cells_explored: int, gold: bool = False) -> dict[str, int]:
         """
         Adds the new Data from the current cycle to the already saved Data and increases cycle amount by 1.
 
         :param game_steps: The amount of gamesteps in the current played cycle
         :param deaths: The amount of deaths in the current played cycle
         :param cells_explored: The amount of explored cells in the current played cycle
+        :param gold: Whether the gold was found in the current played cycle
+        :return: The record of the current played cycle, with its number and the value of each metric
         """
         self._cycles += 1
         self._game_steps += game_steps
         self._deaths += deaths
         self._cells_explored += cells_explored
 
-    def create_file(self) -> None:
-        """Creates the txt file with all the gathered statistics and saves it into the statistics folder."""
+        record = {
+            "cycle": self._cycles,
+            "game_steps": game_steps,
+            "deaths": deaths,
+            "cells_explored": cells_explored,
+            "stuck": int(self._stuck),
+            "gold": int(gold),
+        }
+        for metric in METRICS:
+            self._metrics[metric].add(record[metric])
+        self._stuck = False
+        return record
+
+    def is_precise(self) -> bool:
+        """Checks whether the game cycles can stop early, because the confidence interval of the mean of every
+        metric is narrower than the stop tolerance, relative to the mean but at least to 1.
+
+        :return: Whether the cycles can stop, which is never the case without a stop tolerance.
+        """
+        if self._config.stop_tolerance is None or self._cycles < self._config.min_cycles:
+            return False
+
+        z = NormalDist().inv_cdf((1 + self._config.confidence) / 2)
+        return all(
+            metric.get_half_width(z) <= self._config.stop_tolerance * max(abs(metric.mean), 1)
+            for metric in self._metrics.values()
+        )
+
+    def merge(self, other: "Statistics") -> None:
+        """Adds the data of other statistics, that were gathered separately, to the already saved Data.
+
+        :param other: The statistics that should be added.
+        """
+        self._cycles += other._cycles
+        self._game_steps += other._game_steps
+        self._deaths += other._deaths
+        self._cells_explored += other._cells_explored
+        self._stuck_amount += other._stuck_amount
+        for metric in METRICS:
+            self._metrics[metric].merge(other._metrics[metric])
+        self.profiler.merge(other.profiler)
+
+    def get_results(self) -> dict[str, float]:
+        """Gathers the total and average amounts per cycle of all the gathered statistics.
+
+        :return: The amounts by their names, the averages are 0 if no cycle was played,
+            followed by the standard deviation and the half width of the confidence interval of each metric.
+        """
+        cycles = self._cycles or 1
+        z = NormalDist().inv_cdf((1 + self._config.confidence) / 2)
+        deviations = {
+            f'{name}_std': round(metric.get_variance() ** 0.5, 2) for name, metric in self._metrics.items()
+        }
+        half_widths = {
+            f'{name}_ci': round(metric.get_half_width(z), 2) for name, metric in self._metrics.items()
+        }
+        return {
+            "cycles": self._cycles,
+            "stuck_cycles": self._stuck_amount,
+            "game_steps": self._game_steps,
+            "deaths": self._deaths,
+            "cells_explored": self._cells_explored,
+            "average_game_steps": round(self._game_steps / cycles, 2),
+            "average_deaths": round(self._deaths / cycles, 2),
+            "average_cells_explored": round(self._cells_explored / cycles, 2),
+            **deviations,
+            **half_widths,
+        }
+
+    def create_file(self, seed: int | None = None) -> None:
+        """Creates the txt file with all the gathered statistics and saves it into the statistics folder.
+        If game steps were profiled, their summary is added and the measurements of each cycle are saved next to it.
+
+        :param seed: The seed the game cycles were played with, if they were seeded.
+        """
         if self._cycles == 0:
             return
 
@@ -50,11 +140,15 @@ class Statistics:
         if not os.path.exists(folder):
             os.makedirs(folder)
 
-        with open(f'{folder}/{datetime.now().strftime('%Y-%m-%d-%H-%M-%S')}-cycles-{self._cycles}', 'x') as f:
-            f.write(f'Strategy: \n'
-                    f'   Shoot: {SHOOT} \n'
-                    f'   Risky: {RISKY} \n'
-                    f'   Manhatten_Bonus: {MANHATTEN_BONUS} \n'
+        path = f'{folder}/{datetime.now().strftime("%Y-%m-%d-%H-%M-%S")}-cycles-{self._cycles}'
+        with open(path, 'x') as f:
+            if seed is not None:
+                f.write(f'Seed: {seed} \n')
+            f.write(f'Grid size: {self._config.grid_size} \n'
+                    f'Strategy: \n'
+                    f'   Shoot: {self._config.shoot} \n'
+                    f'   Risky: {self._config.risky} \n'
+                    f'   Manhatten_Bonus: {self._config.manhatten_bonus} \n'
                     f'Total amounts: \n'
                     f'   amount of cycles: {self._cycles} \n'
                     f'   amount of stuck cycles: {self._stuck_amount} \n'
@@ -65,4 +159,16 @@ class Statistics:
                     f'   average number of game steps: {round(self._game_steps/self._cycles, 2)} \n'
                     f'   average number of deaths: {round(self._deaths/self._cycles, 2)} \n'
                     f'   average amount of explored cells: {round(self._cells_explored/self._cycles, 2)} \n'
+                    f'Spread per cycle ({self._config.confidence:.0%} confidence): \n'
                     )
+            z = NormalDist().inv_cdf((1 + self._config.confidence) / 2)
+            for name, metric in self._metrics.items():
+                f.write(f'   {name}: mean {round(metric.mean, 2)}, '
+                        f'standard deviation {round(metric.get_variance() ** 0.5, 2)}, '
+                        f'confidence interval +- {round(metric.get_half_width(z), 2)} \n')
+
+            if self.profiler.cycles:
+                self.profiler.write_summary(f)
+
+        if self.profiler.cycles:
+            self.profiler.create_file(f'{path}-profile.csv')
@@ -0,0 +1,194 @@
+from util.config import Config
+
+import cProfile
+import csv
+import itertools
+import os
+import pstats
+import time
+import tracemalloc
+
+# the phases of a game step, in the order they happen
+PHASES = ["create_tasks", "spread", "risk", "dijkstra", "bidding", "award", "execute_task", "update_beliefs"]
+COUNTERS = ["node_expansions", "path_cache_hits", "path_cache_misses", "tasks", "bids"]
+
+# numbers the captures of a process, so that two captures within the same second get different files
+CAPTURE_NUMBERS = itertools.count()
+
+
+class StepProfiler:
+    """Measures the wall time and calls of each phase of the game steps, as well as the amount of
+    node expansions of the searches, the hits and misses of the path cache, tasks and bids,
+    and sums them up per game cycle.
+    While it is disabled, the measuring methods return right away, so the instrumentation can stay in place.
+
+    A phase is measured by taking the time with `clock` before it and passing it to `lap` after it,
+    which returns the time for the next phase.
+
+    :ivar enabled (bool): Whether the game steps are measured, which can be switched at runtime.
+    :ivar cycles (list[dict[str, float]]): The measurements of each finished game cycle, that was measured.
+    :ivar _times (dict[str, float]): The wall time of each phase in the current game cycle.
+    :ivar _calls (dict[str, int]): The calls of each phase in the current game cycle.
+    :ivar _counts (dict[str, int]): The counters of the current game cycle.
+    :ivar _capture_cycles (tuple[int, int] | None): The first and last game cycle, which are captured with
+        cProfile and, if enabled, tracemalloc.
+    :ivar _capture_memory (bool): Whether tracemalloc is captured.
+    :ivar _cprofile (cProfile.Profile | None): The cProfile of the captured game cycles, while it is running.
+    """
+    def __init__(self, config: Config | None = None):
+        config = config or Config()
+        self.enabled: bool = config.profiling
+        self.cycles: list[dict[str, float]] = []
+        self._times: dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self._calls: dict[str, int] = dict.fromkeys(PHASES, 0)
+        self._counts: dict[str, int] = dict.fromkeys(COUNTERS, 0)
+
+        self._capture_cycles: tuple[int, int] | None = config.capture_cycles
+        self._capture_memory: bool = config.capture_memory
+        self._cprofile: cProfile.Profile | None = None
+
+    def clock(self) -> float:
+        """Takes the time before a phase.
+
+        :return: The current time, or 0 if the profiler is disabled.
+        """
+        if not self.enabled:
+            return 0.0
+        return time.perf_counter()
+
+    def lap(self, phase: str, start: float) -> float:
+        """Adds the time since the start to a phase.
+
+        :param phase: The name of the phase.
+        :param start: The time taken before the phase.
+        :return: The current time, to be used as the start of the next phase, or 0 if the profiler is disabled.
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self._times[phase] += now - start
+        self._calls[phase] += 1
+        return now
+
+    def count(self, counter: str, amount: int) -> None:
+        """Adds an amount to a counter.
+
+        :param counter: The name of the counter.
+        :param amount: The amount that is added.
+        """
+        if self.enabled:
+            self._counts[counter] += amount
+
+    def start_cycle(self, cycle: int) -> None:
+        """Starts the capture with cProfile and tracemalloc, if it is the first captured game cycle.
+
+        :param cycle: The number of the game cycle that starts.
+        """
+        if self._capture_cycles is None or cycle != self._capture_cycles[0]:
+            return
+
+        if self._capture_memory:
+            tracemalloc.start()
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def finish_cycle(self, cycle: int, game_steps: int) -> None:
+        """Adds the measurements of a game cycle to the cycles and stops the capture,
+        if it is the last captured game cycle.
+
+        :param cycle: The number of the game cycle that finished.
+        :param game_steps: The amount of game steps in the game cycle.
+        """
+        if self._cprofile is not None and cycle >= self._capture_cycles[1]:
+            self._cprofile.disable()
+            self._save_capture()
+
+        if not any(self._calls.values()):
+            return
+
+        measurement: dict[str, float] = {"cycle": cycle, "game_steps": game_steps}
+        for phase in PHASES:
+            measurement[f'{phase}_time'] = self._times[phase]
+            measurement[f'{phase}_calls'] = self._calls[phase]
+        measurement.update(self._counts)
+        self.cycles.append(measurement)
+
+        self._times = dict.fromkeys(PHASES, 0.0)
+        self._calls = dict.fromkeys(PHASES, 0)
+        self._counts = dict.fromkeys(COUNTERS, 0)
+
+    def _save_capture(self) -> None:
+        """Helper method to save the cProfile and tracemalloc capture into the statistics folder."""
+        folder = f'statistic/statistics'
+        if not os.path.exists(folder):
+            os.makedirs(folder)
+
+        first, last = self._capture_cycles
+        path = f'{folder}/{time.strftime("%Y-%m-%d-%H-%M-%S")}-capture-{first}-{last}-{os.getpid()}-{next(CAPTURE_NUMBERS)}'
+
+        self._cprofile.dump_stats(f'{path}.prof')
+        with open(f'{path}.txt', 'x') as f:
+            pstats.Stats(self._cprofile, stream=f).sort_stats(pstats.SortKey.CUMULATIVE).print_stats(40)
+
+            if tracemalloc.is_tracing():
+                current, peak = tracemalloc.get_traced_memory()
+                f.write(f'Memory: \n'
+                        f'   current: {current} B \n'
+                        f'   peak: {peak} B \n'
+                        f'Largest allocations: \n')
+                for stat in tracemalloc.take_snapshot().statistics("lineno")[:20]:
+                    f.write(f'   {stat} \n')
+                tracemalloc.stop()
+
+        self._cprofile = None
+
+    def merge(self, other: "StepProfiler") -> None:
+        """Adds the measured game cycles of another profiler, that measured separately.
+
+        :param other: The profiler whose game cycles should be added.
+        """
+        self.cycles.extend(other.cycles)
+
+    def get_summary(self) -> dict[str, dict[str, float]]:
+        """Sums up the measurements of all game cycles.
+
+        :return: The total time, calls and average time per game step of each phase,
+            and the total and average amount per game step of each counter.
+        """
+        game_steps = sum(cycle["game_steps"] for cycle in self.cycles) or 1
+        summary = {}
+        for phase in PHASES:
+            total = sum(cycle[f'{phase}_time'] for cycle in self.cycles)
+            summary[phase] = {
+                "time": total,
+                "calls": sum(cycle[f'{phase}_calls'] for cycle in self.cycles),
+                "time_per_step": total / game_steps,
+            }
+        for counter in COUNTERS:
+            total = sum(cycle[counter] for cycle in self.cycles)
+            summary[counter] = {"total": total, "per_step": total / game_steps}
+        return summary
+
+    def write_summary(self, f) -> None:
+        """Writes the summed up measurements into an opened text file.
+
+        :param f: The opened text file.
+        """
+        summary = self.get_summary()
+        f.write(f'Profile of {len(self.cycles)} cycles: \n')
+        for phase in PHASES:
+            f.write(f'   {phase}: {round(summary[phase]["time"], 4)} s in {summary[phase]["calls"]} calls, '
+                    f'{round(summary[phase]["time_per_step"] * 1000, 4)} ms per game step \n')
+        for counter in COUNTERS:
+            f.write(f'   {counter}: {summary[counter]["total"]}, '
+                    f'{round(summary[counter]["per_step"], 2)} per game step \n')
+
+    def create_file(self, path: str) -> None:
+        """Creates a csv file with the measurements of each game cycle.
+
+        :param path: The path of the csv file.
+        """
+        with open(path, 'x', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(self.cycles[0]))
+            writer.writeheader()
+            writer.writerows(self.cycles)
@@ -0,0 +1,105 @@
+import csv
+import json
+import math
+import os
+
+
+class RunningMetric:
+    """The mean and variance of a metric, that are updated with every value using Welford's algorithm,
+    so that the values do not need to be kept.
+
+    :ivar count (int): The amount of values.
+    :ivar mean (float): The mean of the values.
+    :ivar _m2 (float): The sum of the squared differences of the values to the mean.
+    """
+    def __init__(self):
+        self.count: int = 0
+        self.mean: float = 0.0
+        self._m2: float = 0.0
+
+    def add(self, value: float) -> None:
+        """Adds a value to the mean and variance.
+
+        :param value: The value that should be added.
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def merge(self, other: "RunningMetric") -> None:
+        """Adds the values of another metric, that was gathered separately, by combining the means and variances.
+
+        :param other: The metric that should be added.
+        """
+        if other.count == 0:
+            return
+
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+
+    def get_variance(self) -> float:
+        """Gets the sample variance of the values.
+
+        :return: The variance, or 0 if there are less than two values.
+        """
+        if self.count < 2:
+            return 0.0
+        return self._m2 / (self.count - 1)
+
+    def get_half_width(self, z: float) -> float:
+        """Gets the half width of the confidence interval of the mean.
+
+        :param z: The quantile of the normal distribution for the confidence.
+        :return: The half width, or infinity if there are less than two values.
+        """
+        if self.count < 2:
+            return float('inf')
+        return z * math.sqrt(self.get_variance() / self.count)
+
+
+class CycleStream:
+    """Appends a record per game cycle to a csv or jsonl file, depending on the ending of its path.
+    The records are kept in a buffer and written together, once the buffer is full or it is flushed.
+
+    :ivar path (str): The path of the file.
+    :ivar _buffer_size (int): The amount of records that are written together.
+    :ivar _buffer (list[dict[str, float]]): The records that were not written yet.
+    """
+    def __init__(self, path: str, buffer_size: int = 100):
+        self.path: str = path
+        self._buffer_size: int = buffer_size
+        self._buffer: list[dict[str, float]] = []
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+
+    def write(self, record: dict[str, float]) -> None:
+        """Adds the record of a game cycle, which is written once the buffer is full.
+
+        :param record: The values of the game cycle by their names.
+        """
+        self._buffer.append(record)
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the records in the buffer to the file."""
+        if not self._buffer:
+            return
+
+        new_file = not os.path.exists(self.path)
+        with open(self.path, 'a', newline='') as f:
+            if self.path.endswith('.csv'):
+                writer = csv.DictWriter(f, fieldnames=list(self._buffer[0]))
+                if new_file:
+                    writer.writeheader()
+                writer.writerows(self._buffer)
+            else:
+                f.writelines(json.dumps(record) + '\n' for record in self._buffer)
+
+        self._buffer = []
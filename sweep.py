@@ -0,0 +1,41 @@
+from game.sweep import run_sweep, create_results_file
+from util.config import MAX_CYCLES
+
+import argparse
+import random
+
+
+def _bool(value: str) -> bool:
+    """Helper function to parse a boolean setting from the command line."""
+    if value.lower() in ("true", "1", "yes"):
+        return True
+    if value.lower() in ("false", "0", "no"):
+        return False
+    raise argparse.ArgumentTypeError(f'{value} is not a boolean')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Plays the game cycles for every combination of the settings.")
+    parser.add_argument("--cycles", type=int, default=MAX_CYCLES, help="The amount of game cycles per combination.")
+    parser.add_argument("--workers", type=int, default=None, help="The amount of worker processes.")
+    parser.add_argument("--seed", type=int, default=None, help="The master seed of the game cycles.")
+    parser.add_argument("--grid-size", type=int, nargs="+", help="The amounts of cells on the x- and y-axis.")
+    parser.add_argument("--num-pits", type=int, nargs="+", help="The amounts of pits.")
+    parser.add_argument("--num-wumpus", type=int, nargs="+", help="The amounts of wumpus.")
+    parser.add_argument("--shoot", type=_bool, nargs="+", help="Whether the agents can shoot the wumpus.")
+    parser.add_argument("--risky", type=_bool, nargs="+", help="Whether the agents can enter potential dangers.")
+    parser.add_argument("--risk-model", nargs="+", help="How the steps onto potential dangers are priced.")
+    parser.add_argument("--manhatten-bonus", type=_bool, nargs="+", help="Whether the agents move away from each other.")
+    parser.add_argument("--spread-metric", nargs="+", help="The distances to the other agents.")
+    parser.add_argument("--awarding", nargs="+", help="How the tasks are given out.")
+    args = parser.parse_args()
+
+    names = [
+        "grid_size", "num_pits", "num_wumpus", "shoot", "risky", "risk_model", "manhatten_bonus", "spread_metric",
+        "awarding"
+    ]
+    settings = {name: getattr(args, name) for name in names if getattr(args, name) is not None}
+
+    seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+    results = run_sweep(settings, args.cycles, seed, args.workers)
+    print(create_results_file(results, seed))
@@ -0,0 +1,48 @@
+from agent.assignment import hungarian
+
+from itertools import permutations
+import random
+import unittest
+
+
+def brute_force(costs: list[list[float]]) -> float:
+    """Finds the lowest sum of costs of any assignment, by trying all of them."""
+    columns = range(len(costs[0]))
+    return min(
+        sum(row[column] for row, column in zip(costs, assigned))
+        for assigned in permutations(columns, len(costs))
+    )
+
+
+class HungarianTest(unittest.TestCase):
+    """Compares the Hungarian algorithm with trying every assignment on small seeded matrices."""
+
+    def test_matches_brute_force(self):
+        rng = random.Random(8)
+        for _ in range(300):
+            rows = rng.randint(1, 5)
+            columns = rng.randint(rows, 6)
+            # few distinct costs, so that there are many ties
+            costs = [[rng.choice([0, 1, 2, 5, 10, 1000]) for _ in range(columns)] for _ in range(rows)]
+
+            assignment = hungarian(costs)
+            self.assertEqual(len(set(assignment)), rows)
+            self.assertTrue(all(0 <= column < columns for column in assignment))
+            self.assertEqual(sum(costs[row][column] for row, column in enumerate(assignment)), brute_force(costs))
+
+    def test_negative_and_fractional_costs(self):
+        rng = random.Random(9)
+        for _ in range(100):
+            rows = rng.randint(1, 4)
+            costs = [[rng.uniform(-10, 10) for _ in range(rows + 1)] for _ in range(rows)]
+
+            assignment = hungarian(costs)
+            self.assertAlmostEqual(sum(costs[row][column] for row, column in enumerate(assignment)),
+                                   brute_force(costs))
+
+    def test_empty(self):
+        self.assertEqual(hungarian([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+from game.batch import BatchEngine
+from game.engine import Engine
+from game.runner import create_cycle_seeds
+from util.config import Config
+
+from dataclasses import replace
+import unittest
+
+
+class RecordList:
+    """Takes the place of the CycleStream of an engine, to keep the record of every game cycle."""
+
+    def __init__(self):
+        self.records: list[dict[str, int]] = []
+
+    def write(self, record: dict[str, int]) -> None:
+        self.records.append(record)
+
+    def flush(self) -> None:
+        pass
+
+
+def play(engine: Engine | BatchEngine, seeds: list[int]) -> dict[int, tuple[int, int, int]]:
+    """Plays the seeds and gets the game steps, whether the gold was found and the deaths of each game cycle."""
+    stream = RecordList()
+    engine._stream = stream
+    engine.play_cycles(seeds)
+    return {record["seed"]: (record["game_steps"], record["gold"], record["deaths"]) for record in stream.records}
+
+
+class BatchEngineTest(unittest.TestCase):
+    """Plays the same seeds with the BatchEngine and the Engine, which have to play every game cycle the same."""
+
+    def _check(self, **settings) -> None:
+        config = replace(Config(), statistics_enabled=False, batch_size=8, **settings)
+        seeds = create_cycle_seeds(20, 16)
+        expected = play(Engine(config), seeds)
+        results = play(BatchEngine(config), seeds)
+        for seed in seeds:
+            self.assertEqual(results[seed], expected[seed], f'the game cycle of seed {seed} was played differently')
+
+    def test_default(self):
+        self._check()
+
+    def test_flat_risk(self):
+        self._check(risk_model="flat", spread_metric="path")
+
+    def test_many_agents(self):
+        self._check(num_agents=8, spread_metric="chebyshev", shoot=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
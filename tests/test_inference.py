@@ -0,0 +1,58 @@
+from agent.beliefs import POTENTIAL_PIT, POTENTIAL_WUMPUS, PIT, WUMPUS, VISITED
+from game import cell
+from game.engine import Engine
+from game.runner import create_cycle_seeds
+from util.config import Config
+
+from dataclasses import replace
+import random
+import unittest
+
+
+class DangerInferenceTest(unittest.TestCase):
+    """Plays seeded game cycles and checks the deduced dangers against the board after every game step."""
+
+    def _check_beliefs(self, engine: Engine) -> None:
+        beliefs = engine._agent_manager.shared_beliefs
+        board = engine._board
+        size = beliefs.grid_size
+
+        for index, flags in enumerate(beliefs.flags):
+            pos = divmod(index, size)
+            bits = board.get_cell_bits(pos)
+
+            # a confirmed danger is always a real one
+            if flags & PIT:
+                self.assertTrue(bits & cell.PIT, f'{pos} is confirmed as a pit, but has none')
+            if flags & WUMPUS:
+                self.assertTrue(bits & cell.WUMPUS, f'{pos} is confirmed as a wumpus, but has none')
+
+            # a real danger next to a visited cell is never ruled out
+            if flags & VISITED:
+                continue
+            x, y = pos
+            next_to_visited = any(
+                0 <= nx < size and 0 <= ny < size and beliefs.flags[nx * size + ny] & VISITED
+                for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+            )
+            if not next_to_visited:
+                continue
+            if bits & cell.PIT:
+                self.assertTrue(flags & (POTENTIAL_PIT | PIT), f'the pit at {pos} was ruled out')
+            if bits & cell.WUMPUS:
+                self.assertTrue(flags & (POTENTIAL_WUMPUS | WUMPUS), f'the wumpus at {pos} was ruled out')
+
+    def test_dangers_match_the_board(self):
+        engine = Engine(replace(Config(), board_backend="numpy", statistics_enabled=False))
+        for seed in create_cycle_seeds(21, 20):
+            random.seed(seed)
+            engine._setup_game()
+            self._check_beliefs(engine)
+            while engine._running:
+                engine._game_step()
+                self._check_beliefs(engine)
+            engine._restart_game()
+
+
+if __name__ == "__main__":
+    unittest.main()
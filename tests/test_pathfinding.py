@@ -0,0 +1,105 @@
+from agent.beliefs import BeliefStore, POTENTIAL_PIT, POTENTIAL_WUMPUS, PIT, WUMPUS, VISITED, POTENTIAL_DANGER
+from agent.pathfinding import RISKY_STEP_COST, IncrementalSearch, PathCache, bucket_dijkstra
+
+import random
+import unittest
+
+# the flags a cell can get in the random belief changes, with the safe ones more likely
+FLAGS = [0, 0, VISITED, VISITED, POTENTIAL_PIT, POTENTIAL_WUMPUS, POTENTIAL_PIT | POTENTIAL_WUMPUS, PIT, WUMPUS]
+
+
+def change_beliefs(rng: random.Random, beliefs: BeliefStore, changes: int) -> None:
+    """Replaces the flags of some random cells."""
+    size = beliefs.grid_size
+    for _ in range(changes):
+        pos = (rng.randrange(size), rng.randrange(size))
+        beliefs.set(pos, 0xFF, False)
+        beliefs.set(pos, rng.choice(FLAGS))
+
+
+def visit(beliefs: BeliefStore, cells: list[tuple[int, int]]) -> None:
+    """Marks some cells as only visited, as the cells the agent stands on in the game."""
+    for pos in cells:
+        beliefs.set(pos, 0xFF, False)
+        beliefs.set(pos, VISITED)
+
+
+def create_risk_costs(rng: random.Random, beliefs: BeliefStore) -> dict[int, int]:
+    """Gives each potential danger a random cost, as the RiskMap would."""
+    return {
+        index: RISKY_STEP_COST + rng.randrange(0, 10000, 500)
+        for index, flags in enumerate(beliefs.flags) if flags & POTENTIAL_DANGER
+    }
+
+
+class SearchTest(unittest.TestCase):
+    """Compares the searches that are kept between game steps with a fresh bucket_dijkstra,
+    after random changes of the beliefs, the start and the risk costs."""
+
+    def _play(self, seed: int, check) -> None:
+        rng = random.Random(seed)
+        size = rng.choice([5, 8, 12])
+        beliefs = BeliefStore(size)
+        change_beliefs(rng, beliefs, size * size // 2)
+        start = (rng.randrange(size), rng.randrange(size))
+        risky = rng.random() < 0.7
+        probability = rng.random() < 0.5
+
+        for _ in range(40):
+            # mostly few changes, as between two game steps, sometimes the agent moves
+            change_beliefs(rng, beliefs, rng.choice([0, 1, 1, 2, 5]))
+            if rng.random() < 0.2:
+                start = (rng.randrange(size), rng.randrange(size))
+            risk_costs = create_risk_costs(rng, beliefs) if risky and probability else None
+
+            expected = bucket_dijkstra(start, beliefs, risky, risk_costs)
+            check(start, beliefs, risky, risk_costs, expected)
+
+    def test_incremental_search(self):
+        for seed in range(60):
+            search = IncrementalSearch()
+
+            def check(start, beliefs, risky, risk_costs, expected):
+                came_from, cost_so_far = search.search(start, beliefs, risky, risk_costs)
+                self.assertEqual(cost_so_far, expected[1])
+                self.assertEqual(came_from, expected[0])
+
+            self._play(seed, check)
+
+    def test_incremental_move(self):
+        # a step of the agent with a few belief changes only repairs the cells in front of it
+        for seed in range(20):
+            rng = random.Random(seed)
+            beliefs = BeliefStore(20)
+            change_beliefs(rng, beliefs, 80)
+            visit(beliefs, [(10, 10), (11, 10)])
+            search = IncrementalSearch()
+            search.search((10, 10), beliefs, True)
+
+            change_beliefs(rng, beliefs, 3)
+            visit(beliefs, [(10, 10), (11, 10)])
+            came_from, cost_so_far = search.search((11, 10), beliefs, True)
+            expected = bucket_dijkstra((11, 10), beliefs, True)
+            self.assertEqual(cost_so_far, expected[1])
+            self.assertEqual(came_from, expected[0])
+            self.assertLess(search.expansions, len(cost_so_far))
+
+    def test_path_cache(self):
+        hits = 0
+        for seed in range(60):
+            # a small cache, so that searches are also dropped
+            cache = PathCache(100)
+
+            def check(start, beliefs, risky, risk_costs, expected):
+                came_from, cost_so_far, _ = cache.search(start, beliefs, risky, risk_costs, bucket_dijkstra)
+                self.assertEqual(cost_so_far, expected[1])
+                self.assertEqual(came_from, expected[0])
+
+            self._play(seed, check)
+            hits += cache.hits
+
+        self.assertGreater(hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
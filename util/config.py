@@ -1,18 +1,112 @@
+from dataclasses import dataclass
+
 # Board
 GRID_SIZE = 20
 TILE_SIZE = 32
-WINDOW_SIZE = GRID_SIZE * TILE_SIZE
+# the largest width and height of the window, larger boards are shown in a part that can be moved and zoomed
+WINDOW_SIZE = 640
+BOARD_BACKEND = "cells"
+CHUNK_SIZE = 16
 
 # Elements
 NUM_PITS = 20
 NUM_WUMPUS = 3
 NUM_GOLD = 1
+NUM_AGENTS = 4
 
 # Strategy
 SHOOT = True
 RISKY = True
+# how the risky steps onto potential dangers are priced, either "flat" or by the "probability" of a danger
+RISK_MODEL = "probability"
 MANHATTEN_BONUS = True
+SPREAD_METRIC = "manhattan"
+PATHFINDER = "buckets"
+# the largest amount of cells in the searches, that are cached between the game steps, or None to not cache them
+PATH_CACHE_CELLS = 250_000
+AWARDING = "greedy"
 
 # Statistic
 STATISTICS_ENABLED = True
 MAX_CYCLES = 1000
+RECORD_EPISODES = False
+PROFILING = False
+CAPTURE_CYCLES = None
+CAPTURE_MEMORY = False
+# "jsonl" or "csv" to append a record of every game cycle to a file while the simulation runs, or None
+STREAM_FORMAT = None
+# the simulation stops early, once the confidence interval of every metric is narrower than this, or never if None
+STOP_TOLERANCE = None
+CONFIDENCE = 0.95
+MIN_CYCLES = 30
+# the amount of game cycles each process plays at once in lock-step with NumPy, or None to play them one by one
+BATCH_SIZE = None
+
+
+@dataclass(frozen=True)
+class Config:
+    """The configuration of a simulation, that is passed to the board, agents, agent manager and statistics.
+    It defaults to the settings above, so different settings can be compared in the same process.
+
+    :ivar grid_size (int): The amount of cells on the x- and y-axis.
+    :ivar board_backend (str): How the board is stored, either "cells", "numpy" or "chunked",
+        which only loads the chunks of the board around the agents.
+    :ivar chunk_size (int): The amount of cells on the x- and y-axis of a chunk of the "chunked" board.
+    :ivar num_pits (int): The amount of pits per game cycle.
+    :ivar num_wumpus (int): The amount of wumpus per game cycle.
+    :ivar num_gold (int): The amount of gold per game cycle.
+    :ivar num_agents (int): The amount of agents.
+    :ivar shoot (bool): Whether the agents can shoot the wumpus.
+    :ivar risky (bool): Whether the agents can enter a potential dangerous cell.
+    :ivar risk_model (str): How the steps onto potential dangers are priced, either "flat" for the same cost
+        for all of them or "probability" for a cost that grows with the probability of a danger.
+    :ivar manhatten_bonus (bool): Whether the agents try to move away from each other.
+    :ivar spread_metric (str): The distance to the other agents, either "manhattan", "chebyshev" or "path".
+    :ivar pathfinder (str): How the agents search their paths, either "heap", "buckets" or "incremental".
+    :ivar path_cache_cells (int | None): The largest amount of cells in the searches of the "heap" and "buckets"
+        pathfinders, that are cached between the game steps, or None if they are not cached.
+    :ivar awarding (str): How the tasks are given out, either "greedy" or "optimal".
+    :ivar statistics_enabled (bool): Whether the statistics are evaluated and saved.
+    :ivar max_cycles (int): The amount of cycles, after which the simulation will end.
+    :ivar record_episodes (bool): Whether every game cycle is recorded, so that it can be replayed.
+    :ivar profiling (bool): Whether the phases of the game steps are measured.
+    :ivar capture_cycles (tuple[int, int] | None): The first and last game cycle, that are captured with cProfile.
+    :ivar capture_memory (bool): Whether the captured game cycles are also captured with tracemalloc.
+    :ivar stream_format (str | None): The file format, either "jsonl" or "csv", in which a record of every
+        game cycle is appended to a file while the simulation runs, or None if the records are not saved.
+    :ivar stop_tolerance (float | None): The largest half width of the confidence interval of every metric,
+        relative to its mean but at least to 1, at which the simulation stops early, or None to never stop early.
+    :ivar confidence (float): The confidence level of the confidence intervals.
+    :ivar min_cycles (int): The amount of game cycles, before the simulation can stop early.
+    :ivar batch_size (int | None): The amount of game cycles the headless runs play at once in lock-step,
+        or None if they are played one by one.
+    """
+    grid_size: int = GRID_SIZE
+    board_backend: str = BOARD_BACKEND
+    chunk_size: int = CHUNK_SIZE
+
+    num_pits: int = NUM_PITS
+    num_wumpus: int = NUM_WUMPUS
+    num_gold: int = NUM_GOLD
+    num_agents: int = NUM_AGENTS
+
+    shoot: bool = SHOOT
+    risky: bool = RISKY
+    risk_model: str = RISK_MODEL
+    manhatten_bonus: bool = MANHATTEN_BONUS
+    spread_metric: str = SPREAD_METRIC
+    pathfinder: str = PATHFINDER
+    path_cache_cells: int | None = PATH_CACHE_CELLS
+    awarding: str = AWARDING
+
+    statistics_enabled: bool = STATISTICS_ENABLED
+    max_cycles: int = MAX_CYCLES
+    record_episodes: bool = RECORD_EPISODES
+    profiling: bool = PROFILING
+    capture_cycles: tuple[int, int] | None = CAPTURE_CYCLES
+    capture_memory: bool = CAPTURE_MEMORY
+    stream_format: str | None = STREAM_FORMAT
+    stop_tolerance: float | None = STOP_TOLERANCE
+    confidence: float = CONFIDENCE
+    min_cycles: int = MIN_CYCLES
+    batch_size: int | None = BATCH_SIZE
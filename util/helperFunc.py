@@ -1,20 +1,22 @@
 from util.config import GRID_SIZE
 
 
-def is_in_bounds(pos: tuple[int, int]) -> bool:
+def is_in_bounds(pos: tuple[int, int], grid_size: int = GRID_SIZE) -> bool:
     """Helper function to determine if a postion is in bounds.
 
     :param pos: The position that needs to be checked.
+    :param grid_size: The amount of cells on the x- and y-axis.
     :return: Whether the position is in bounds.
     """
-    return 0 <= pos[0] < GRID_SIZE and 0 <= pos[1] < GRID_SIZE
+    return 0 <= pos[0] < grid_size and 0 <= pos[1] < grid_size
 
 
-def get_neighbours(x: int, y: int) -> list[tuple[int, int]]:
+def get_neighbours(x: int, y: int, grid_size: int = GRID_SIZE) -> list[tuple[int, int]]:
     """Gets all the neighbours of a position.
 
     :param x: The x postion of which the neighbours should be got.
     :param y: The y postion of which the neighbours should be got.
+    :param grid_size: The amount of cells on the x- and y-axis.
     :return: A list of the positions neighbours.
     """
     return [
@@ -25,5 +27,5 @@ def get_neighbours(x: int, y: int) -> list[tuple[int, int]]:
             (x, y + 1),
             (x, y - 1),
         ]
-        if is_in_bounds((nx, ny))
-    ]
\ No newline at end of file
+        if is_in_bounds((nx, ny), grid_size)
+    ]